@@ -9,6 +9,10 @@ Classes:
     Task: Represents a single task with name and status attributes
     ToDoList: Manages a collection of Task objects with CRUD operations
 
+Internally, ToDoList keeps its tasks in an indexed engine (a name index,
+per-status counters and list-order sequence numbers), so name lookups,
+counts and finding a task's position do not scan the list.
+
 Functions:
     example_usage(): Demonstrates various ways to use the classes
     main(): Primary demonstration function with comprehensive examples
@@ -45,6 +49,9 @@ Author: AI Assistant
 Version: 1.0
 """
 
+from bisect import bisect_left
+from functools import wraps
+
 
 class Task:
     """
@@ -87,8 +94,45 @@ class Task:
             >>> print(task1.status, task2.status)
             pending completed
         """
-        self.name = name
-        self.status = status
+        # The engines of the lists holding the task (once per occurrence)
+        self._owners = ()
+        self._name = name
+        self._status = status
+    
+    @property
+    def name(self):
+        """
+        The name/description of the task.
+        
+        Assigning a new name keeps the owning list's name index up to date.
+        """
+        return self._name
+    
+    @name.setter
+    def name(self, value):
+        old_name = self._name
+        self._name = value
+        if old_name != value:
+            for owner in self._owners:
+                owner.renamed(self)
+    
+    @property
+    def status(self):
+        """
+        The current status of the task ("pending" or "completed").
+        
+        Assigning a new status keeps the owning list's status counters
+        up to date.
+        """
+        return self._status
+    
+    @status.setter
+    def status(self, value):
+        old_status = self._status
+        self._status = value
+        if old_status != value:
+            for owner in self._owners:
+                owner.status_changed(old_status, value)
     
     def __str__(self):
         """
@@ -147,6 +191,202 @@ class Task:
         self.status = "pending"
 
 
+def _name_key(name):
+    """Return the case-insensitive lookup key for a task name."""
+    return name.lower() if isinstance(name, str) else None
+
+
+def _without(owners, index):
+    """Return an owners tuple with one occurrence of an engine taken out."""
+    position = next(i for i, owner in enumerate(owners) if owner is index)
+    return owners[:position] + owners[position + 1:]
+
+
+class _TaskIndex:
+    """
+    Indexed storage engine behind ToDoList.
+    
+    The engine mirrors the tasks list with a case-insensitive name index and
+    a counter per status. Each name bucket holds its tasks in list order, so
+    the first entry is the task a linear scan would have found first. Tasks
+    report status and name changes back to every engine holding them, so a
+    task may be shared between lists (or appear in one list twice).
+    
+    Every indexed task also gets a sequence number that increases in list
+    order, so a task's position can be found by binary search instead of
+    comparing it with every task before it. The numbers are kept by the
+    engine, not on the task, so each list numbers its tasks independently.
+    
+    Attributes:
+        by_name (dict): Maps lowercased names to the tasks with that name
+        status_counts (dict): Maps each status string to its number of tasks
+        size (int): Number of indexed tasks, or -1 when a rebuild is needed
+        seq (dict): Maps id(task) to the task's sequence number
+        next_seq (int): Sequence number for the next appended task
+        repeated (bool): True if a task appears in the list more than
+            once; positions are then found by a linear scan
+    """
+    
+    def __init__(self):
+        """Create an empty engine."""
+        self.by_name = {}
+        self.status_counts = {}
+        self.size = 0
+        self.seq = {}
+        self.next_seq = 0
+        self.repeated = False
+    
+    def rebuild(self, tasks):
+        """
+        Re-index every task in the list.
+        
+        Args:
+            tasks (list): The ToDoList's tasks, in list order
+        """
+        # Tasks taken out of the list directly must stop reporting here
+        for bucket in self.by_name.values():
+            for task in bucket:
+                task._owners = _without(task._owners, self)
+        self.by_name = {}
+        self.status_counts = {}
+        self.size = 0
+        self.seq = {}
+        self.next_seq = 0
+        self.repeated = False
+        for task in tasks:
+            self.add(task)
+    
+    def add(self, task):
+        """
+        Index a task appended to the end of the list.
+        
+        Args:
+            task (Task): The task that was appended
+        """
+        task._owners += (self,)
+        if id(task) in self.seq:
+            self.repeated = True
+        self.seq[id(task)] = self.next_seq
+        self.next_seq += 1
+        self.by_name.setdefault(_name_key(task.name), []).append(task)
+        self.status_counts[task.status] = self.status_counts.get(task.status, 0) + 1
+        self.size += 1
+    
+    def position(self, tasks, task):
+        """
+        Return a task's (first) position in the list, in O(log n) unless it repeats tasks.
+        
+        Args:
+            tasks (list): The ToDoList's tasks, as indexed
+            task (Task): An indexed task
+        
+        Returns:
+            int: The index of the task in tasks
+        """
+        if self.repeated:
+            return tasks.index(task)
+        seq = self.seq
+        return bisect_left(tasks, seq[id(task)], key=lambda other: seq[id(other)])
+    
+    def discard(self, task):
+        """
+        Remove a task that was taken out of the list.
+        
+        Args:
+            task (Task): The task that was removed
+        """
+        key = _name_key(task.name)
+        bucket = self.by_name[key]
+        bucket.remove(task)
+        if not bucket:
+            del self.by_name[key]
+        self.status_counts[task.status] -= 1
+        self.size -= 1
+        task._owners = _without(task._owners, self)
+        if not self.repeated:
+            del self.seq[id(task)]
+    
+    def find(self, name):
+        """
+        Return the first task with the given name (case-insensitive).
+        
+        Args:
+            name (str): The name to look up
+        
+        Returns:
+            Task or None: The first matching task in list order
+        """
+        bucket = self.by_name.get(_name_key(name))
+        return bucket[0] if bucket else None
+    
+    def count(self, status):
+        """
+        Return the number of tasks with a status.
+        
+        Args:
+            status (str): The status to count
+        
+        Returns:
+            int: The number of tasks currently in that status
+        """
+        return self.status_counts.get(status, 0)
+    
+    def status_changed(self, old_status, new_status):
+        """Move one task's count from its old status to its new one."""
+        self.status_counts[old_status] -= 1
+        self.status_counts[new_status] = self.status_counts.get(new_status, 0) + 1
+    
+    def renamed(self, task):
+        """
+        Handle a renamed task.
+        
+        A renamed task's place among same-named tasks depends on its list
+        position, so the engine simply marks itself for a rebuild.
+        """
+        self.size = -1
+
+
+class _TaskList(list):
+    """
+    The list exposed as ToDoList.tasks.
+    
+    It behaves exactly like a list, but any change made through it (item
+    assignment, deletion, append, sort, reverse, ...) marks the owning
+    engine for a rebuild, so the index never disagrees with the list.
+    ToDoList's own methods update the list and the engine together and
+    bypass the marking.
+    """
+    
+    def __init__(self, tasks=(), index=None):
+        """
+        Create the list.
+        
+        Args:
+            tasks (iterable): The initial tasks
+            index (_TaskIndex): The engine to mark when the list changes
+        """
+        super().__init__(tasks)
+        self._index = index
+
+
+def _marks_index_stale(name):
+    """Wrap a list method so that calling it on a _TaskList marks the engine stale."""
+    method = getattr(list, name)
+    
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        self._index.size = -1
+        return method(self, *args, **kwargs)
+    
+    return wrapper
+
+
+for _method in ('__setitem__', '__delitem__', '__iadd__', '__imul__', 'append', 'extend',
+                'insert', 'pop', 'remove', 'clear', 'reverse', 'sort'):
+    setattr(_TaskList, _method, _marks_index_stale(_method))
+del _method
+
+
 class ToDoList:
     """
     A class to manage a collection of tasks in a todo list.
@@ -187,8 +427,36 @@ class ToDoList:
             >>> print(len(todo_list.tasks))
             0
         """
+        self._index = _TaskIndex()
         self.tasks = []
     
+    @property
+    def tasks(self):
+        """
+        The list of Task objects in the todo list.
+        
+        The list may be modified directly; any change to it makes the
+        engine re-index itself before its next lookup. Assigning a list
+        stores its tasks in a new tracked list.
+        """
+        return self._tasks
+    
+    @tasks.setter
+    def tasks(self, value):
+        self._tasks = _TaskList(value, self._index)
+        self._index.size = -1
+    
+    def _engine(self):
+        """
+        Return the task index, rebuilding it if the tasks list changed behind its back.
+        
+        Returns:
+            _TaskIndex: An index consistent with self.tasks
+        """
+        if self._index.size < 0:
+            self._index.rebuild(self._tasks)
+        return self._index
+    
     def add_task(self, name, status="pending"):
         """
         Add a new task to the todo list.
@@ -216,8 +484,10 @@ class ToDoList:
             >>> todo_list.add_task("Call mom", "completed")
             Task 'Call mom' added successfully!
         """
+        index = self._engine()
         task = Task(name, status)
-        self.tasks.append(task)
+        list.append(self._tasks, task)
+        index.add(task)
         print(f"Task '{name}' added successfully!")
     
     def remove_task(self, name):
@@ -252,11 +522,13 @@ class ToDoList:
             Task 'Non-existent task' not found!
             False
         """
-        for i, task in enumerate(self.tasks):
-            if task.name.lower() == name.lower():
-                removed_task = self.tasks.pop(i)
-                print(f"Task '{removed_task.name}' removed successfully!")
-                return True
+        index = self._engine()
+        removed_task = index.find(name)
+        if removed_task is not None:
+            list.__delitem__(self._tasks, index.position(self._tasks, removed_task))
+            index.discard(removed_task)
+            print(f"Task '{removed_task.name}' removed successfully!")
+            return True
         print(f"Task '{name}' not found!")
         return False
     
@@ -329,11 +601,11 @@ class ToDoList:
             Task 'Non-existent task' not found!
             False
         """
-        for task in self.tasks:
-            if task.name.lower() == name.lower():
-                task.mark_completed()
-                print(f"Task '{task.name}' marked as completed!")
-                return True
+        task = self._engine().find(name)
+        if task is not None:
+            task.mark_completed()
+            print(f"Task '{task.name}' marked as completed!")
+            return True
         print(f"Task '{name}' not found!")
         return False
     
@@ -379,7 +651,7 @@ class ToDoList:
             >>> todo_list.get_completed_count()
             2
         """
-        return sum(1 for task in self.tasks if task.status == "completed")
+        return self._engine().count("completed")
     
     def get_pending_count(self):
         """
@@ -401,7 +673,7 @@ class ToDoList:
             >>> todo_list.get_pending_count()
             2
         """
-        return sum(1 for task in self.tasks if task.status == "pending")
+        return self._engine().count("pending")
 
 
 def example_usage():
@@ -0,0 +1,422 @@
+"""
+Benchmarks for the Refactored ToDo Application
+
+Each benchmark builds its own data, times the operation under test and prints
+a one-line summary.  Run all of them, or only the ones named on the command
+line:
+
+    python bench_todo.py
+    python bench_todo.py import --tasks 200000
+"""
+
+from __future__ import annotations
+import gc
+import logging
+import sys
+import time
+from typing import Callable, Dict, List
+
+from todo_refactored import Task, TaskStatus, ToDoList
+
+
+DEFAULT_TASKS = 1_000_000
+
+
+def _timed(func: Callable[[], object]) -> float:
+    """Return the wall-clock seconds taken by func(), excluding freeing its result."""
+    # Collect earlier runs' garbage (tasks and lists refer to each other) first
+    gc.collect()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    del result
+    return elapsed
+
+
+def _build_list(count: int) -> ToDoList:
+    """Build a todo list with a realistic mix of statuses and priorities."""
+    todo_list = ToDoList("Benchmark")
+    statuses = list(TaskStatus)
+    for i in range(count):
+        todo_list.add_task(f"Task {i}", statuses[i % len(statuses)], priority=i % 5 + 1)
+    return todo_list
+
+
+def _report(name: str, count: int, seconds: float) -> None:
+    """Print a throughput line for a benchmark."""
+    print(f"{name:<32} {count:>10,} rows  {seconds:8.3f}s  {count / seconds:12,.0f} rows/s")
+
+
+def bench_import(count: int = DEFAULT_TASKS) -> Dict[str, float]:
+    """
+    Compare the original per-row import with validated and trusted imports.
+
+    The reference loop is the import_from_list() body before timestamps were
+    restored: one ``Task`` construction (and ``datetime.now()``) per row.
+    """
+    exported = _build_list(count).export_to_list()
+
+    def reference():
+        tasks = []
+        for data in exported:
+            tasks.append(Task(data['name'], TaskStatus(data.get('status', 'pending')),
+                              priority=data.get('priority', 3)))
+        return tasks
+
+    def imported(trusted: bool) -> ToDoList:
+        todo_list = ToDoList()
+        todo_list.import_from_list(exported, trusted=trusted)
+        return todo_list
+
+    results = {
+        'reference': _timed(reference),
+        'validated': _timed(lambda: imported(False)),
+        'trusted': _timed(lambda: imported(True)),
+    }
+    for name, seconds in results.items():
+        _report(f"import ({name})", count, seconds)
+    print(f"trusted speedup over reference: {results['reference'] / results['trusted']:.2f}x")
+    return results
+
+
+def bench_remove(count: int = DEFAULT_TASKS) -> Dict[str, float]:
+    """
+    Remove half of the tasks, by index and with clear_completed_tasks().
+
+    The reference is the old ``list.pop(i)`` removal, which shifts every later
+    task; it is quadratic, so it runs on at most 100,000 tasks.
+    """
+    half = count // 2
+    todo_list = _build_list(count)
+    by_index = _timed(lambda: [todo_list.remove_task_by_index(i) for i in range(half)])
+
+    todo_list = _build_list(count)
+    for task in todo_list:
+        if task.name.endswith(('0', '2', '4', '6', '8')):
+            task.mark_completed()
+        elif task.is_completed():
+            task.mark_pending()
+    cleared = _timed(todo_list.clear_completed_tasks)
+
+    reference_count = min(count, 100_000)
+    tasks = list(_build_list(reference_count))
+    reference = _timed(lambda: [tasks.pop(i) for i in range(reference_count // 2)])
+
+    _report("remove 50% by index (tombstones)", half, by_index)
+    _report("remove 50% clear_completed", half, cleared)
+    _report("remove 50% by index (list.pop)", reference_count // 2, reference)
+    return {'by_index': by_index, 'clear_completed': cleared, 'reference': reference}
+
+
+def bench_next_task(count: int = DEFAULT_TASKS) -> Dict[str, float]:
+    """
+    Claim 1,000 tasks, one at a time, highest priority first.
+
+    The reference filters pending tasks with a list comprehension and sorts
+    them before every pick, as main() does for its high-priority listing.
+    """
+    from todo_scheduler import Scheduler
+
+    picks = min(1_000, count // 4)
+    reference_picks = min(picks, 20)
+
+    def reference():
+        for _ in range(reference_picks):
+            pending = [task for task in todo_list if task.status == TaskStatus.PENDING]
+            pending.sort(key=lambda task: (-task.priority, task.created_at))
+            pending[0].mark_in_progress()
+
+    todo_list = _build_list(count)
+    built = _timed(lambda: Scheduler(todo_list).close())
+    scheduler = Scheduler(todo_list)
+    claimed = _timed(lambda: [scheduler.claim_next() for _ in range(picks)])
+    scheduler.close()
+
+    todo_list = _build_list(min(count, 100_000))
+    filtered = _timed(reference)
+
+    _report("scheduler build", count, built)
+    _report("claim_next (scheduler)", picks, claimed)
+    _report("claim_next (filter + sort)", reference_picks, filtered)
+    return {'build': built, 'scheduler': claimed, 'reference': filtered}
+
+
+def bench_tag_query(count: int = DEFAULT_TASKS) -> Dict[str, float]:
+    """
+    Count pending "backend AND urgent AND NOT blocked" tasks, 100 times.
+
+    The reference scans every task, matching tags encoded in the name as
+    the list did before tags existed.
+    """
+    tag_names = ["backend", "urgent", "blocked", "frontend"]
+    todo_list = ToDoList("Benchmark")
+    statuses = list(TaskStatus)
+    for i in range(count):
+        tags = [tag for bit, tag in enumerate(tag_names) if i >> bit & 1]
+        todo_list.add_task(f"Task {i} " + " ".join(f"#{tag}" for tag in tags),
+                           statuses[i % len(statuses)], tags=tags)
+    queries = 100
+    reference_queries = 5
+
+    def reference():
+        for _ in range(reference_queries):
+            sum(1 for task in todo_list if task.status is TaskStatus.PENDING
+                and "#backend" in task.name and "#urgent" in task.name
+                and "#blocked" not in task.name)
+
+    built = _timed(lambda: todo_list.tag_index())
+    index = todo_list.tag_index()
+    indexed = _timed(lambda: [index.count(tags=["backend", "urgent"], exclude=["blocked"],
+                                          status=TaskStatus.PENDING) for _ in range(queries)])
+    scanned = _timed(reference)
+
+    _report("tag index build", count, built)
+    _report("tag query (bitmaps)", queries, indexed)
+    _report("tag query (name scan)", reference_queries, scanned)
+    return {'build': built, 'index': indexed, 'reference': scanned}
+
+
+def bench_memory(count: int = DEFAULT_TASKS) -> Dict[str, float]:
+    """
+    Report bytes per task, estimated and traced, for lists built by add and by import.
+
+    Compare the printed figures across releases to catch memory regressions.
+    """
+    import tracemalloc
+    from todo_memory import tracing
+
+    count = min(count, 200_000)
+    exported = _build_list(count).export_to_list()
+    results = {}
+    for name, build in (('add_task', lambda: _build_list(count)),
+                        ('trusted import', lambda: _imported(exported))):
+        with tracing(frames=1):
+            before = tracemalloc.get_traced_memory()[0]
+            todo_list = build()
+            traced = tracemalloc.get_traced_memory()[0] - before
+        estimated = todo_list.memory_report().per_task
+        del todo_list
+        results[name] = traced / count
+        print(f"bytes per task ({name:<14}) estimated {estimated:8.1f}  traced {traced / count:8.1f}")
+    return results
+
+
+def _imported(exported: List[dict]) -> ToDoList:
+    """Build a list by trusted import of exported rows."""
+    todo_list = ToDoList()
+    todo_list.import_from_list(exported, trusted=True)
+    return todo_list
+
+
+def bench_parallel_statistics(count: int = DEFAULT_TASKS) -> Dict[str, float]:
+    """
+    Count a snapshot file by status, priority and day with 1 to N worker processes.
+
+    Every result is checked against the list's own get_statistics() and
+    cross_tab('day').
+    """
+    import os
+    import tempfile
+    from todo_parallel import parallel_cross_tab, parallel_statistics
+    from todo_shared import write_snapshot_file
+
+    todo_list = _build_list(count)
+    expected = todo_list.cross_tab('day')
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "tasks.col")
+        write_snapshot_file(todo_list, path)
+        cpus = os.cpu_count() or 1
+        workers = sorted({1, 2, 4, cpus} & set(range(1, cpus + 1)))
+        for n in workers:
+            results[n] = _timed(lambda: parallel_cross_tab(path, 'day', workers=n))
+            if parallel_cross_tab(path, 'day', workers=n) != expected:
+                raise AssertionError(f"cross_tab mismatch with {n} workers")
+            if parallel_statistics(path, workers=n) != todo_list.get_statistics():
+                raise AssertionError(f"statistics mismatch with {n} workers")
+            _report(f"cross_tab('day') ({n} workers)", count, results[n])
+    print(f"speedup at {workers[-1]} workers: {results[1] / results[workers[-1]]:.2f}x")
+    return {f"workers_{n}": seconds for n, seconds in results.items()}
+
+
+def bench_archive(count: int = DEFAULT_TASKS) -> Dict[str, float]:
+    """
+    Archive the finished half of a list and compare a full scan before and after.
+
+    Also reports the archive's size on disk and the memory it keeps per
+    archived task, for each codec.
+    """
+    import os
+    import tempfile
+    from datetime import datetime, timedelta
+    from todo_archive import CODECS, Archive
+    from todo_memory import _Sizer
+
+    exported = _build_list(count).export_to_list()
+    later = datetime.now() + timedelta(days=365)
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for codec in CODECS:
+            todo_list = _imported(exported)
+            scan = lambda: todo_list.find_task("No such task")
+            results['scan_before'] = _timed(scan)
+            archive = Archive(todo_list, os.path.join(directory, f"tasks.{codec}"), codec=codec)
+            results[f'sweep_{codec}'] = seconds = _timed(lambda: archive.sweep(later))
+            _report(f"sweep ({codec})", len(archive), seconds)
+            results['scan_after'] = _timed(scan)
+            if todo_list.get_statistics(include_archived=True)['total_tasks'] != count:
+                raise AssertionError("archived tasks missing from statistics")
+            print(f"  {os.path.getsize(archive.path) / len(archive):6.1f} bytes/task on disk, "
+                  f"{_Sizer().deep_size(archive) / len(archive):5.1f} bytes/task in memory")
+            archive.close()
+    _report("scan (all tasks)", count, results['scan_before'])
+    _report("scan (after archiving)", count, results['scan_after'])
+    return results
+
+
+def bench_disk(count: int = DEFAULT_TASKS) -> Dict[str, float]:
+    """
+    Compare a disk-backed list with an in-memory one: memory, scans and cache hits.
+
+    Lookups pick task IDs with a skew towards recent tasks, so the hit rate
+    shows how much of the workload the bounded cache absorbs.
+    """
+    import os
+    import random
+    import tempfile
+    import tracemalloc
+    from todo_disk import DiskToDoList
+
+    exported = _build_list(count).export_to_list()
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        disk = DiskToDoList(os.path.join(directory, "tasks.db"), cache_size=10_000)
+        results['import'] = _timed(lambda: disk.import_from_list(exported))
+        _report("disk import", count, results['import'])
+        results['scan'] = _timed(lambda: disk.find_task("No such task"))
+        _report("disk find_task (miss)", count, results['scan'])
+        results['iterate'] = _timed(lambda: sum(1 for _ in disk))
+        _report("disk iteration", count, results['iterate'])
+        tracemalloc.start()
+        sum(1 for _ in disk)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        rng = random.Random(48)
+        lookups = [rng.randint(1, count) if rng.random() < 0.2
+                   else max(1, count // 2 - int(rng.expovariate(1 / 2_000)))
+                   for _ in range(100_000)]
+        before = disk.cache_info()
+        results['lookups'] = _timed(lambda: [disk.get_task_by_id(task_id) for task_id in lookups])
+        _report("disk get_task_by_id (skewed)", len(lookups), results['lookups'])
+        info = disk.cache_info()
+        print(f"  lookup hit rate {(info.hits - before.hits) / len(lookups):.1%}, "
+              f"peak {peak / 2**20:.1f} MiB while iterating")
+        disk.close()
+    tracemalloc.start()
+    in_memory = _imported(exported)
+    print(f"  in-memory list holds {tracemalloc.get_traced_memory()[0] / 2**20:.1f} MiB")
+    tracemalloc.stop()
+    del in_memory
+    return results
+
+
+def bench_query_cache(count: int = DEFAULT_TASKS) -> Dict[str, float]:
+    """
+    Time repeated filter queries between changes, without and with the query cache.
+
+    Each round asks find_tasks_by_status() for every status and
+    get_tasks_by_priority() for every priority, then changes one task.
+    """
+    todo_list = _build_list(count)
+    tasks = list(todo_list)
+    results = {}
+
+    def rounds():
+        for i in range(10):
+            for _ in range(5):
+                for status in TaskStatus:
+                    todo_list.find_tasks_by_status(status)
+                for priority in range(1, 6):
+                    todo_list.get_tasks_by_priority(priority)
+            tasks[i].set_priority(tasks[i].priority % 5 + 1)
+
+    results['uncached'] = _timed(rounds)
+    _report("filters (uncached)", count * 450, results['uncached'])
+    cache = todo_list.query_cache()
+    results['cached'] = _timed(rounds)
+    _report("filters (query cache)", count * 450, results['cached'])
+    info = cache.cache_info()
+    print(f"  hit rate {info.hit_rate:.1%}, {info.invalidations} invalidations, "
+          f"{info.evictions} evictions")
+    return results
+
+
+def bench_batch(count: int = DEFAULT_TASKS) -> Dict[str, float]:
+    """
+    Time a multi-step edit on an indexed list, step by step and inside batch().
+
+    The edit imports new rows, reprioritizes and completes half of them,
+    then clears completed tasks; the list keeps a tag index and a Merkle
+    tree up to date throughout.  The batch is timed with and without
+    pause_gc.
+    """
+    count = min(count, 200_000)
+    rows = _build_list(count).export_to_list()
+    for row in rows:
+        row['id'] = None
+    results = {}
+
+    def edit(todo_list):
+        todo_list.import_from_list(rows, trusted=True)
+        for task in todo_list:
+            task.set_priority(task.priority % 5 + 1)
+            if task.task_id % 2:
+                task.mark_completed()
+        todo_list.clear_completed_tasks()
+
+    for name, batched, pause_gc in (('step by step', False, False), ('batch()', True, False),
+                                    ('batch, GC paused', True, True)):
+        todo_list = ToDoList("Indexed")
+        todo_list.tag_index()
+        todo_list.merkle_tree()
+
+        def run():
+            if batched:
+                with todo_list.batch(pause_gc=pause_gc):
+                    edit(todo_list)
+            else:
+                edit(todo_list)
+
+        results[name] = _timed(run)
+        _report(f"multi-step edit ({name})", count, results[name])
+    return results
+
+
+BENCHMARKS: Dict[str, Callable[..., Dict[str, float]]] = {
+    'import': bench_import,
+    'remove': bench_remove,
+    'next': bench_next_task,
+    'tags': bench_tag_query,
+    'memory': bench_memory,
+    'parallel': bench_parallel_statistics,
+    'archive': bench_archive,
+    'disk': bench_disk,
+    'query': bench_query_cache,
+    'batch': bench_batch,
+}
+
+
+def main(argv: List[str]) -> None:
+    """Run the benchmarks named in argv (all of them by default)."""
+    logging.disable(logging.CRITICAL)
+    count = DEFAULT_TASKS
+    if '--tasks' in argv:
+        position = argv.index('--tasks')
+        count = int(argv[position + 1])
+        del argv[position:position + 2]
+    for name in argv or BENCHMARKS:
+        BENCHMARKS[name](count)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,139 @@
+"""
+Unit tests for the cold-storage archive.
+
+This module tests todo_archive: which tasks a sweep moves, lookups and
+statistics that include archived tasks, and reopening an archive file.
+"""
+
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+from todo_archive import Archive
+from todo_events import ChangeKind
+from todo_refactored import TaskStatus, ToDoList
+
+
+NOW = datetime(2024, 6, 1)
+
+
+class TestArchive(unittest.TestCase):
+    """Test cases for the Archive class."""
+
+    def setUp(self):
+        """Set up a list of tasks of every status, last updated 10 to 100 days ago."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "tasks.arc")
+        self.todo_list = ToDoList("Archived")
+        statuses = list(TaskStatus)
+        rows = []
+        for i in range(40):
+            updated = (NOW - timedelta(days=10 + i * 90 // 40)).isoformat()
+            rows.append({'name': f"Task {i}", 'status': statuses[i % 4].value,
+                         'priority': i % 5 + 1, 'created_at': updated, 'updated_at': updated,
+                         'tags': ["old"] if i % 2 else []})
+        self.todo_list.import_from_list(rows)
+        self.before = self.todo_list.export_to_list()
+        self.archive = Archive(self.todo_list, self.path, frame_size=4)
+
+    def tearDown(self):
+        """Detach the archive and remove the temporary directory."""
+        self.archive.close()
+        self.directory.cleanup()
+
+    def test_sweep_moves_old_finished_tasks(self):
+        """Test that only finished tasks older than max_age leave the list."""
+        events = []
+        self.todo_list.add_listener(events.append)
+        cutoff = NOW - self.archive.max_age
+        expected = [row['id'] for row in self.before
+                    if row['status'] in ("completed", "cancelled")
+                    and datetime.fromisoformat(row['updated_at']) <= cutoff]
+        self.assertEqual(self.archive.sweep(NOW), len(expected))
+        self.assertEqual(sorted(task.task_id for task in self.archive), expected)
+        self.assertEqual([event.task.task_id for event in events
+                          if event.kind is ChangeKind.REMOVE], expected)
+        self.assertEqual(len(self.todo_list) + len(self.archive), 40)
+        self.assertEqual(self.archive.sweep(NOW), 0)
+
+    def test_failed_write_changes_nothing(self):
+        """Test that a sweep whose write fails leaves the list, archive and file as they were."""
+        size = os.path.getsize(self.path)
+        with mock.patch("todo_archive.os.fsync", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                self.archive.sweep(NOW)
+        self.assertEqual(self.todo_list.export_to_list(), self.before)
+        self.assertEqual((len(self.archive), self.archive.cells, self.archive._frames), (0, {}, []))
+        self.assertEqual(os.path.getsize(self.path), size)
+        self.assertGreater(self.archive.sweep(NOW), 0)
+        self.assertEqual(len(self.todo_list) + len(self.archive), 40)
+
+    def test_archived_tasks_stay_queryable(self):
+        """Test lookups and statistics that include archived tasks."""
+        statistics = self.todo_list.get_statistics()
+        weeks = self.todo_list.cross_tab('week')
+        self.archive.sweep(NOW)
+        self.assertNotEqual(self.todo_list.get_statistics(), statistics)
+        self.assertEqual(self.todo_list.get_statistics(include_archived=True), statistics)
+        self.assertEqual(self.todo_list.cross_tab('week', include_archived=True), weeks)
+        self.assertEqual(self.todo_list.cross_tab(include_archived=True).total, 40)
+        for row in self.before:
+            task = self.todo_list.get_task_by_id(row['id'], include_archived=True)
+            self.assertEqual((task.name, task.status.value, sorted(task.tags)),
+                             (row['name'], row['status'], row['tags']))
+        archived_id = next(iter(self.archive)).task_id
+        self.assertIn(archived_id, self.archive)
+        self.assertIsNone(self.todo_list.get_task_by_id(archived_id))
+
+    def test_reopen(self):
+        """Test that a reopened archive restores counts, drops a torn frame and reserves IDs."""
+        self.archive.codec = 'lzma'
+        self.archive.sweep(NOW)
+        self.archive.close()
+        with open(self.path, "ab") as handle:
+            handle.write(b"\x01\xff\x00")
+        fresh = ToDoList("Fresh")
+        self.archive = Archive(fresh, self.path)
+        self.assertEqual(fresh.get_statistics(include_archived=True)['total_tasks'],
+                         40 - len(self.todo_list))
+        self.assertGreater(fresh.add_task("New").task_id, max(task.task_id for task in self.archive))
+        self.assertEqual(self.archive.sweep(NOW), 0)
+
+    def test_archived_ids_are_reserved(self):
+        """Test that importing a row with an archived task's ID gets a fresh ID."""
+        self.archive.sweep(NOW)
+        archived_id = next(iter(self.archive)).task_id
+        self.todo_list.import_from_list([{'id': archived_id, 'name': "Returning"}])
+        task = self.todo_list.find_task("Returning")
+        self.assertNotEqual(task.task_id, archived_id)
+        self.assertEqual(self.todo_list.get_task_by_id(archived_id, include_archived=True).name,
+                         self.archive.get(archived_id).name)
+
+    def test_sweep_refused_in_batch(self):
+        """Test that a sweep inside a batch raises and leaves everything as it was."""
+        size = os.path.getsize(self.path)
+        with self.assertRaises(RuntimeError):
+            with self.todo_list.batch():
+                self.todo_list.add_task("Extra")
+                with self.assertRaises(ValueError):
+                    self.archive.sweep(NOW)
+                raise RuntimeError("abort")
+        self.assertEqual(self.todo_list.export_to_list(), self.before)
+        self.assertEqual((len(self.archive), os.path.getsize(self.path)), (0, size))
+
+    def test_invalid_arguments(self):
+        """Test unknown codecs, a second archive and a file that is not an archive."""
+        other = os.path.join(self.directory.name, "other.arc")
+        with self.assertRaises(ValueError):
+            Archive(ToDoList(), other, codec='bz2')
+        with self.assertRaises(ValueError):
+            Archive(self.todo_list, other)
+        with open(other, "w", encoding="utf-8") as handle:
+            handle.write("not an archive")
+        with self.assertRaises(ValueError):
+            Archive(ToDoList(), other)
+
+
+if __name__ == '__main__':
+    unittest.main()
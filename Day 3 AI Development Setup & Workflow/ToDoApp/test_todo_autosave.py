@@ -0,0 +1,129 @@
+"""
+Unit tests for background autosave.
+
+This module tests the AutoSave class and load() in todo_autosave: batching,
+incremental records, compaction, crash tolerance and flushing at exit.
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from todo_autosave import AutoSave, load
+from todo_refactored import ToDoList
+
+
+class TestAutoSave(unittest.TestCase):
+    """Test cases for the AutoSave class."""
+
+    def setUp(self):
+        """Set up a list and a log file in a temporary directory."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "tasks.jsonl")
+        self.todo_list = ToDoList("Saved")
+        for i in range(5):
+            self.todo_list.add_task(f"Task {i}", priority=i + 1)
+        self.autosave = None
+
+    def tearDown(self):
+        """Stop saving and remove the temporary directory."""
+        if self.autosave is not None:
+            self.autosave.close()
+        self.directory.cleanup()
+
+    def assertSaved(self):
+        """Assert that the log restores the list exactly."""
+        restored = load(self.path)
+        self.assertEqual(restored.name, self.todo_list.name)
+        self.assertEqual(restored.export_to_list(), self.todo_list.export_to_list())
+
+    def test_burst_is_one_write(self):
+        """Test that many changes within the debounce window cost one append."""
+        self.autosave = AutoSave(self.todo_list, self.path, debounce=0.2)
+        for task in list(self.todo_list):
+            task.mark_completed()
+            task.set_priority(1)
+        self.todo_list.add_task("Late addition")
+        deadline = time.monotonic() + 5
+        while self.autosave.writes == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.autosave.writes, 1)
+        self.assertFalse(self.autosave.dirty)
+        self.assertSaved()
+
+    def test_only_changes_are_appended(self):
+        """Test that a flush appends one record per changed task."""
+        self.autosave = AutoSave(self.todo_list, self.path, debounce=60)
+        size = os.path.getsize(self.path)
+        next(iter(self.todo_list)).mark_completed()
+        self.assertTrue(self.autosave.flush())
+        self.assertFalse(self.autosave.flush())
+        with open(self.path, encoding="utf-8") as handle:
+            handle.seek(size)
+            self.assertEqual(len(handle.readlines()), 1)
+        self.assertSaved()
+
+    def test_removes_reorders_and_readds(self):
+        """Test that every kind of change replays to the same list."""
+        self.autosave = AutoSave(self.todo_list, self.path, debounce=60)
+        removed = self.todo_list.remove_task_by_index(1)
+        self.todo_list.add_task("New")
+        self.todo_list.sort_tasks_by_priority()
+        self.autosave.flush()
+        self.todo_list.import_from_list([{'id': removed.task_id, 'name': "Back again"}])
+        self.todo_list.remove_task("Task 4")
+        self.autosave.flush()
+        self.assertSaved()
+
+    def test_compaction(self):
+        """Test that a long log is rewritten as a snapshot."""
+        self.autosave = AutoSave(self.todo_list, self.path, debounce=60, compact_ratio=1)
+        task = next(iter(self.todo_list))
+        for i in range(150):
+            task.set_priority(i % 5 + 1)
+            self.autosave.flush()
+        with open(self.path, encoding="utf-8") as handle:
+            self.assertLess(len(handle.readlines()), 110)
+        self.assertSaved()
+
+    def test_sorting_while_writing(self):
+        """Test that reorders and updates racing the background writer still replay exactly."""
+        for i in range(300):
+            self.todo_list.add_task(f"Extra {i % 17}", priority=i % 5 + 1)
+        self.autosave = AutoSave(self.todo_list, self.path, debounce=0, compact_ratio=1)
+        tasks = list(self.todo_list)
+        for i in range(100):
+            self.todo_list.sort_tasks_by_name()
+            tasks[i].set_priority(5 - i % 5)
+            self.todo_list.sort_tasks_by_priority()
+        self.autosave.flush()
+        self.assertSaved()
+
+    def test_truncated_last_line_is_ignored(self):
+        """Test that a record cut short by a crash does not prevent loading."""
+        self.autosave = AutoSave(self.todo_list, self.path, debounce=60)
+        self.autosave.close()
+        self.autosave = None
+        with open(self.path, "a", encoding="utf-8") as handle:
+            handle.write('{"op": "remove", "i')
+        self.assertSaved()
+
+    def test_flush_at_exit(self):
+        """Test that pending changes are written when the interpreter exits."""
+        script = (
+            "import sys\n"
+            "from todo_autosave import AutoSave\n"
+            "from todo_refactored import ToDoList\n"
+            "todo_list = ToDoList('Exit')\n"
+            "AutoSave(todo_list, sys.argv[1], debounce=60)\n"
+            "todo_list.add_task('Written at exit')\n"
+        )
+        subprocess.run([sys.executable, "-c", script, self.path], check=True,
+                       cwd=os.path.dirname(os.path.abspath(__file__)))
+        self.assertEqual([task.name for task in load(self.path)], ["Written at exit"])
+
+
+if __name__ == '__main__':
+    unittest.main()
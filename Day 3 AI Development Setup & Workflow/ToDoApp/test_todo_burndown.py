@@ -0,0 +1,89 @@
+"""
+Unit tests for burn-down time series.
+
+This module tests the circular per-interval counters in todo_burndown.
+"""
+
+import unittest
+from todo_burndown import BurnDown, Interval
+from todo_refactored import ToDoList
+
+
+class FakeClock:
+    """A clock that only moves when told to."""
+
+    def __init__(self, now=0.0):
+        """Start the clock at a given time."""
+        self.now = now
+
+    def __call__(self):
+        """Return the current fake time."""
+        return self.now
+
+
+class TestBurnDown(unittest.TestCase):
+    """Test cases for the BurnDown class."""
+
+    def setUp(self):
+        """Set up a list with two open tasks and a burn-down of 4 intervals."""
+        self.clock = FakeClock(1000.0)
+        self.todo_list = ToDoList("Sprint")
+        self.todo_list.add_task("Task A")
+        self.todo_list.add_task("Task B", "in_progress")
+        self.todo_list.add_task("Task C", "completed")
+        self.burn_down = BurnDown(self.todo_list, interval=100, size=4, clock=self.clock)
+
+    def test_initial_interval(self):
+        """Test that tracking starts with the list's open tasks."""
+        self.assertEqual(self.burn_down.series(), [Interval(1000.0, 0, 0, 0, 2)])
+
+    def test_counts_transitions_per_interval(self):
+        """Test that changes are counted in the interval they happen in."""
+        self.todo_list.add_task("Task D")
+        self.todo_list.find_task("Task A").mark_completed()
+        self.clock.now = 1150
+        self.todo_list.find_task("Task B").mark_cancelled()
+        self.todo_list.find_task("Task A").mark_pending()
+        self.todo_list.remove_task("Task D")
+        self.clock.now = 1350
+
+        self.assertEqual(self.burn_down.series(), [
+            Interval(1000.0, 1, 1, 0, 2),
+            Interval(1100.0, 0, 0, 1, 1),
+            Interval(1200.0, 0, 0, 0, 1),
+            Interval(1300.0, 0, 0, 0, 1),
+        ])
+        self.assertEqual(self.burn_down.open, 1)
+        self.assertEqual(self.burn_down.throughput(), 0.25)
+        self.assertEqual(self.burn_down.throughput(last=2), 0)
+
+    def test_old_intervals_are_overwritten(self):
+        """Test that only the most recent intervals are kept."""
+        self.todo_list.find_task("Task A").mark_completed()
+        self.clock.now = 1400
+        self.todo_list.add_task("Task D")
+        series = self.burn_down.series()
+        self.assertEqual([interval.start for interval in series], [1100.0, 1200.0, 1300.0, 1400.0])
+        self.assertEqual(series[0], Interval(1100.0, 0, 0, 0, 1))
+        self.assertEqual(series[-1].created, 1)
+
+        self.clock.now = 10_000
+        self.assertEqual(self.burn_down.series(last=2),
+                         [Interval(9900.0, 0, 0, 0, 2), Interval(10_000.0, 0, 0, 0, 2)])
+
+    def test_close_stops_counting(self):
+        """Test that a closed burn-down ignores later changes."""
+        self.burn_down.close()
+        self.todo_list.add_task("Task D")
+        self.assertEqual(self.burn_down.series()[-1].created, 0)
+
+    def test_invalid_configuration(self):
+        """Test that a non-positive interval or size is rejected."""
+        with self.assertRaises(ValueError):
+            BurnDown(self.todo_list, interval=0)
+        with self.assertRaises(ValueError):
+            BurnDown(self.todo_list, size=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,201 @@
+"""
+Unit tests for the ToDo command-line tool.
+
+This module tests the todo_cli commands, batch mode and import-time budget.
+"""
+
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+import todo_cli
+
+
+# Cumulative import time allowed for ``import todo_cli``, in microseconds
+IMPORT_BUDGET_US = 20_000
+
+# Modules a bare import of todo_cli must not pull in
+DEFERRED_MODULES = {"todo_refactored", "todo_events", "json", "logging",
+                    "dataclasses", "argparse", "shlex"}
+
+
+class TestImportTime(unittest.TestCase):
+    """Test that importing the CLI does as little work as possible."""
+
+    def test_import_time_budget(self):
+        """Test ``import todo_cli`` with ``python -X importtime``."""
+        here = os.path.dirname(os.path.abspath(todo_cli.__file__))
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import todo_cli"],
+            cwd=here, capture_output=True, text=True, check=True,
+        )
+
+        timings = {}
+        for line in result.stderr.splitlines():
+            if not line.startswith("import time:") or "[us]" in line:
+                continue
+            _, cumulative, module = line[len("import time:"):].split("|")
+            timings[module.strip()] = int(cumulative)
+
+        self.assertIn("todo_cli", timings)
+        self.assertFalse(DEFERRED_MODULES & timings.keys(),
+                         f"imported eagerly: {DEFERRED_MODULES & timings.keys()}")
+        self.assertLess(timings["todo_cli"], IMPORT_BUDGET_US)
+
+
+class TestCommands(unittest.TestCase):
+    """Test the individual CLI commands."""
+
+    def setUp(self):
+        """Set up a temporary task file."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "tasks.json")
+
+    def tearDown(self):
+        """Remove the temporary task file."""
+        self.directory.cleanup()
+
+    def run_cli(self, *args, stdin=None):
+        """Run the CLI in-process and return (status, stdout, stderr)."""
+        out, err = io.StringIO(), io.StringIO()
+        old_stdin = sys.stdin
+        sys.stdin = io.StringIO(stdin or "")
+        try:
+            with redirect_stdout(out), redirect_stderr(err):
+                status = todo_cli.main(["-f", self.path, *args])
+        finally:
+            sys.stdin = old_stdin
+        return status, out.getvalue(), err.getvalue()
+
+    def test_add_and_list(self):
+        """Test that added tasks are saved and listed."""
+        self.assertEqual(self.run_cli("add", "Write docs", "-p", "5")[0], 0)
+        self.run_cli("add", "Fix bug", "--status", "in_progress")
+
+        status, output, _ = self.run_cli("list")
+        self.assertEqual(status, 0)
+        self.assertIn("1. [PENDING] Write docs (Priority: 5)", output)
+        self.assertIn("2. [IN_PROGRESS] Fix bug (Priority: 3)", output)
+
+        _, output, _ = self.run_cli("list", "-s", "in_progress")
+        self.assertNotIn("Write docs", output)
+
+    def test_add_invalid_priority(self):
+        """Test that invalid input is reported without saving."""
+        status, _, error = self.run_cli("add", "Task", "-p", "9")
+        self.assertEqual(status, 1)
+        self.assertIn("Priority must be between 1 and 5", error)
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_done_by_name_and_id(self):
+        """Test completing tasks by name and by ID."""
+        self.run_cli("add", "Task A")
+        self.run_cli("add", "Task B")
+        self.assertEqual(self.run_cli("done", "task a")[0], 0)
+        self.assertEqual(self.run_cli("done", "2")[0], 0)
+        self.assertEqual(self.run_cli("done", "Missing")[0], 1)
+
+        with open(self.path, encoding="utf-8") as handle:
+            statuses = [row['status'] for row in json.load(handle)]
+        self.assertEqual(statuses, ["completed", "completed"])
+
+    def test_done_prefers_names_over_ids(self):
+        """Test that a task named like a number is found by name, and --id by ID."""
+        self.run_cli("add", "Task A")
+        self.run_cli("add", "1")
+        self.assertEqual(self.run_cli("done", "1")[0], 0)
+        with open(self.path, encoding="utf-8") as handle:
+            self.assertEqual([row['status'] for row in json.load(handle)], ["pending", "completed"])
+        self.assertEqual(self.run_cli("done", "--id", "1")[0], 0)
+        self.assertEqual(self.run_cli("done", "--id", "x")[0], 2)
+        self.assertEqual(self.run_cli("done", "Task A", "--id", "1")[0], 2)
+
+    def test_malformed_file_is_reported(self):
+        """Test that a hand-edited file with bad rows gives an error, not a traceback."""
+        rows = [{"name": "No timestamps", "status": "pending", "priority": 2}]
+        with open(self.path, "w", encoding="utf-8") as handle:
+            json.dump(rows, handle)
+        status, output, _ = self.run_cli("list")
+        self.assertEqual(status, 0)
+        self.assertIn("[PENDING] No timestamps (Priority: 2)", output)
+
+        for bad in ({"name": "Shouting", "status": "PENDING"},
+                    {"name": "Too urgent", "priority": 9},
+                    {"status": "pending"}):
+            with open(self.path, "w", encoding="utf-8") as handle:
+                json.dump(rows + [bad], handle)
+            status, _, error = self.run_cli("add", "New task")
+            self.assertEqual(status, 1)
+            self.assertIn("has 1 malformed task(s)", error)
+            with open(self.path, encoding="utf-8") as handle:
+                self.assertEqual(len(json.load(handle)), 2)
+
+        for content in ('{"name": "Not a list"}', "[1]", "not json"):
+            with open(self.path, "w", encoding="utf-8") as handle:
+                handle.write(content)
+            status, _, error = self.run_cli("list")
+            self.assertEqual(status, 1)
+            self.assertTrue(error.startswith("Error: "))
+
+    def test_stats(self):
+        """Test the statistics output."""
+        self.run_cli("add", "Task A", "-s", "completed")
+        self.run_cli("add", "Task B")
+        _, output, _ = self.run_cli("stats")
+        self.assertIn("Total Tasks: 2", output)
+        self.assertIn("Completed: 1 (50.0%)", output)
+
+    def test_export_and_import(self):
+        """Test exporting to a file and importing it into another list."""
+        self.run_cli("add", "Task A", "-p", "4")
+        export_path = os.path.join(self.directory.name, "export.json")
+        self.assertEqual(self.run_cli("export", export_path)[0], 0)
+
+        other_path = self.path
+        self.path = os.path.join(self.directory.name, "other.json")
+        _, output, _ = self.run_cli("import", export_path)
+        self.assertIn("Imported 1 tasks", output)
+        _, output, _ = self.run_cli("export")
+        self.assertEqual(json.loads(output)[0]['priority'], 4)
+        self.path = other_path
+
+    def test_batch_mode_uses_one_list(self):
+        """Test running commands from stdin against one loaded list."""
+        script = "add 'Task A'\nadd 'Task B' -p 1\n# comment\n\ndone 'Task A'\nbogus\nlist\n"
+        status, output, error = self.run_cli("-", stdin=script)
+
+        self.assertEqual(status, 1)
+        self.assertIn("line 6: unknown command 'bogus'", error)
+        self.assertIn("[COMPLETED] Task A", output)
+        with open(self.path, encoding="utf-8") as handle:
+            self.assertEqual(len(json.load(handle)), 2)
+
+    def test_import_rejects_non_task_files(self):
+        """Test that importing a file that is not a list of tasks keeps the batch going."""
+        bad_path = os.path.join(self.directory.name, "bad.json")
+        for content in ('{"name": "Not a list"}', '["Task A"]', "not json"):
+            with open(bad_path, "w", encoding="utf-8") as handle:
+                handle.write(content)
+            script = f"add 'Task A'\nimport '{bad_path}'\nadd 'Task B'\n"
+            status, _, error = self.run_cli("-", stdin=script)
+
+            self.assertEqual(status, 1)
+            self.assertIn("line 2: ", error)
+            self.assertIn(bad_path, error)
+            with open(self.path, encoding="utf-8") as handle:
+                self.assertEqual([row['name'] for row in json.load(handle)][-2:],
+                                 ["Task A", "Task B"])
+
+    def test_usage_errors(self):
+        """Test that malformed command lines exit with status 2."""
+        self.assertEqual(self.run_cli("list", "--bogus")[0], 2)
+        self.assertEqual(self.run_cli("add")[0], 2)
+        self.assertEqual(self.run_cli("frobnicate")[0], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
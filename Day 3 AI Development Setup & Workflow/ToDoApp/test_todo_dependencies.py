@@ -0,0 +1,104 @@
+"""
+Unit tests for task dependencies.
+
+This module tests the DependencyGraph class in todo_dependencies, including
+cycle detection and ready-set maintenance as tasks change.
+"""
+
+import random
+import unittest
+from todo_refactored import TaskStatus, ToDoList
+
+
+class TestDependencyGraph(unittest.TestCase):
+    """Test cases for the DependencyGraph class."""
+
+    def setUp(self):
+        """Set up a list with a design -> build -> ship chain."""
+        self.todo_list = ToDoList("Release")
+        self.design = self.todo_list.add_task("Design")
+        self.build = self.todo_list.add_task("Build")
+        self.ship = self.todo_list.add_task("Ship")
+        self.graph = self.todo_list.dependency_graph()
+        self.graph.add_dependency(self.design.task_id, self.build.task_id)
+        self.graph.add_dependency(self.build.task_id, self.ship.task_id)
+
+    def test_accessor_returns_same_graph(self):
+        """Test that the list creates its graph once."""
+        self.assertIs(self.todo_list.dependency_graph(), self.graph)
+
+    def test_ready_follows_completion(self):
+        """Test that completing a blocker readies its dependents."""
+        self.assertEqual(self.graph.ready(), [self.design])
+        self.design.mark_completed()
+        self.assertEqual(self.graph.ready(), [self.build])
+        self.build.mark_cancelled()
+        self.assertEqual(self.graph.ready(), [self.ship])
+        self.design.mark_pending()
+        self.assertEqual(self.graph.ready(), [self.ship, self.design])
+
+    def test_in_progress_still_blocks(self):
+        """Test that starting a blocker does not release its dependents."""
+        self.design.mark_in_progress()
+        self.assertTrue(self.graph.is_ready(self.design.task_id))
+        self.assertFalse(self.graph.is_ready(self.build.task_id))
+
+    def test_cycles_are_rejected(self):
+        """Test that edges closing a cycle raise ValueError."""
+        with self.assertRaises(ValueError):
+            self.graph.add_dependency(self.ship.task_id, self.design.task_id)
+        with self.assertRaises(ValueError):
+            self.graph.add_dependency(self.ship.task_id, self.ship.task_id)
+        with self.assertRaises(KeyError):
+            self.graph.add_dependency(self.ship.task_id, 999)
+        self.assertEqual(self.graph.dependents(self.ship.task_id), [])
+
+    def test_remove_edges_and_tasks(self):
+        """Test that removing edges or blocking tasks releases dependents."""
+        self.assertTrue(self.graph.remove_dependency(self.build.task_id, self.ship.task_id))
+        self.assertFalse(self.graph.remove_dependency(self.build.task_id, self.ship.task_id))
+        self.assertTrue(self.graph.is_ready(self.ship.task_id))
+        self.todo_list.remove_task("Design")
+        self.assertEqual(self.graph.blockers(self.build.task_id), [])
+        self.assertEqual(self.graph.ready(), [self.ship, self.build])
+
+    def test_batched_changes(self):
+        """Test events of a batch that finishes or removes blockers and removes their dependents."""
+        review = self.todo_list.add_task("Review")
+        self.graph.add_dependency(self.ship.task_id, review.task_id)
+        with self.todo_list.batch():
+            self.design.mark_completed()
+            self.todo_list.remove_task("Build")
+            self.todo_list.remove_task("Ship")
+        self.assertEqual(self.graph.ready(), [review])
+        self.assertEqual(self.graph.dependents(self.design.task_id), [])
+        with self.todo_list.batch():
+            self.design.mark_pending()
+            self.todo_list.remove_task("Review")
+        self.assertEqual(self.graph.ready(), [self.design])
+
+    def test_matches_recomputation(self):
+        """Test random edges and status changes against a from-scratch ready set."""
+        rng = random.Random(39)
+        tasks = [self.todo_list.add_task(f"Task {i}") for i in range(30)]
+        edges = set()
+        for _ in range(60):
+            blocker, blocked = rng.sample(tasks, 2)
+            try:
+                self.graph.add_dependency(blocker.task_id, blocked.task_id)
+                edges.add((blocker.task_id, blocked.task_id))
+            except ValueError:
+                pass
+        edges |= {(self.design.task_id, self.build.task_id), (self.build.task_id, self.ship.task_id)}
+        marks = ['mark_pending', 'mark_in_progress', 'mark_completed', 'mark_cancelled']
+        for _ in range(200):
+            getattr(rng.choice(tasks), rng.choice(marks))()
+            done = {t.task_id for t in self.todo_list
+                    if t.status in (TaskStatus.COMPLETED, TaskStatus.CANCELLED)}
+            expected = {t.task_id for t in self.todo_list if t.task_id not in done
+                        and all(b in done for b, d in edges if d == t.task_id)}
+            self.assertEqual({t.task_id for t in self.graph.ready()}, expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+"""
+Unit tests for disk-backed lists.
+
+This module tests DiskToDoList in todo_disk: that it behaves like an
+in-memory ToDoList, writes changes back from its bounded task cache and
+reports the cache's counters.
+"""
+
+import os
+import tempfile
+import unittest
+from todo_disk import DiskToDoList
+from todo_refactored import TaskStatus, ToDoList
+
+
+class TestDiskToDoList(unittest.TestCase):
+    """Test cases for the DiskToDoList class."""
+
+    def setUp(self):
+        """Set up the same tasks in memory and on disk, with a three-task cache."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "tasks.db")
+        self.memory = ToDoList("Disk")
+        statuses = list(TaskStatus)
+        for i in range(12):
+            self.memory.add_task(f"Task {i}", statuses[i % 4], priority=i % 5 + 1,
+                                 tags=["even"] if i % 2 == 0 else ())
+        self.disk = DiskToDoList(self.path, "Disk", cache_size=3)
+        self.disk.import_from_list(self.memory.export_to_list())
+
+    def tearDown(self):
+        """Close the database and remove the temporary directory."""
+        self.disk.close()
+        self.directory.cleanup()
+
+    def assertSameTasks(self):
+        """Assert that the disk list holds exactly the in-memory list's tasks."""
+        self.assertEqual(self.disk.export_to_list(), self.memory.export_to_list())
+        self.assertEqual(self.disk.get_statistics(), self.memory.get_statistics())
+
+    def test_views_match_in_memory_list(self):
+        """Test iteration, lookups and the status and priority views."""
+        self.assertSameTasks()
+        self.assertEqual(len(self.disk), 12)
+        self.assertEqual([str(task) for task in self.disk], [str(task) for task in self.memory])
+        self.assertEqual(self.disk.find_task("TASK 5").task_id, self.memory.find_task("task 5").task_id)
+        self.assertIsNone(self.disk.find_task("Task 99"))
+        for status in TaskStatus:
+            self.assertEqual([task.task_id for task in self.disk.find_tasks_by_status(status.value)],
+                             [task.task_id for task in self.memory.find_tasks_by_status(status)])
+        self.assertEqual([task.task_id for task in self.disk.get_tasks_by_priority(2)],
+                         [task.task_id for task in self.memory.get_tasks_by_priority(2)])
+
+    def test_changes_are_written_back(self):
+        """Test that changes to evicted, re-read and reopened tasks persist."""
+        for disk_task, task in zip(list(self.disk), list(self.memory)):
+            disk_task.mark_completed()
+            task.mark_completed()
+        self.disk.get_task_by_id(3).set_priority(5)
+        self.memory.get_task_by_id(3).set_priority(5)
+        self.assertGreater(self.disk.cache_info().write_backs, 0)
+        self.assertEqual(len(self.disk.find_tasks_by_status("completed")), 12)
+        self.disk.close()
+        self.disk = DiskToDoList(self.path)
+        self.assertEqual(self.disk.get_completed_count(), 12)
+        self.assertEqual(self.disk.get_task_by_id(3).priority, 5)
+
+    def test_direct_assignment_is_written_back(self):
+        """Test that assigning a task's fields directly updates counts and persists."""
+        for todo_list in (self.disk, self.memory):
+            task = todo_list.get_task_by_id(2)
+            task.status = TaskStatus.COMPLETED
+            task.priority = 5
+        self.assertSameTasks()
+        self.disk.close()
+        self.disk = DiskToDoList(self.path)
+        self.assertSameTasks()
+
+    def test_one_object_per_task(self):
+        """Test that a task held by the caller is reused after eviction."""
+        task = self.disk.get_task_by_id(1)
+        for other in self.disk:
+            pass
+        self.assertNotIn(1, self.disk._cache)
+        task.set_priority(4)
+        self.assertIs(self.disk.get_task_by_id(1), task)
+        self.assertEqual(self.disk.get_tasks_by_priority(4)[0], task)
+
+    def test_add_remove_and_clear(self):
+        """Test adding, removing and clearing tasks."""
+        added = self.memory.add_task("  New task ", "in_progress", priority=5)
+        self.disk.import_from_list(self.memory.export_to_list()[-1:])
+        self.assertEqual(self.disk.add_task("Later").task_id, added.task_id + 1)
+        self.disk.remove_task("later")
+        for todo_list in (self.memory, self.disk):
+            self.assertTrue(todo_list.remove_task("task 1"))
+            self.assertFalse(todo_list.remove_task("task 1"))
+            self.assertEqual(todo_list.clear_completed_tasks(), 2)
+        removed = self.disk.remove_task_by_id(3)
+        self.memory.remove_task_by_id(3)
+        self.assertIsNone(removed._owner)
+        self.assertSameTasks()
+        with self.assertRaises(ValueError):
+            self.disk.add_task("Bad", "done")
+
+    def test_cache_info(self):
+        """Test the hit, miss and eviction counters."""
+        self.disk.close()
+        self.disk = DiskToDoList(self.path, cache_size=3)
+        for task_id in (1, 2, 1, 1, 4, 5, 2):
+            self.disk.get_task_by_id(task_id)
+        info = self.disk.cache_info()
+        self.assertEqual((info.hits, info.misses, info.evictions, info.size), (2, 5, 2, 3))
+        self.assertAlmostEqual(info.hit_rate, 2 / 7)
+        with self.assertRaises(ValueError):
+            DiskToDoList(self.path, cache_size=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
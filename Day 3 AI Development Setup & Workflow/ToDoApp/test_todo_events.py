@@ -0,0 +1,196 @@
+"""
+Unit tests for the ToDoList change feed.
+
+This module tests the events emitted by ToDoList and the Subscription consumer.
+"""
+
+import asyncio
+import queue
+import unittest
+from todo_events import ChangeKind
+from todo_refactored import TaskStatus, ToDoList
+
+
+class TestChangeEvents(unittest.TestCase):
+    """Test that ToDoList operations emit the expected events."""
+
+    def setUp(self):
+        """Set up a todo list with a recording listener."""
+        self.todo_list = ToDoList("Events")
+        self.events = []
+        self.todo_list.add_listener(self.events.append)
+
+    def test_add_and_remove_events(self):
+        """Test that adding and removing tasks emits ADD and REMOVE."""
+        task = self.todo_list.add_task("Task 1")
+        self.todo_list.remove_task("Task 1")
+
+        kinds = [event.kind for event in self.events]
+        self.assertEqual(kinds, [ChangeKind.ADD, ChangeKind.REMOVE])
+        self.assertIs(self.events[0].task, task)
+
+    def test_update_events_carry_old_and_new_values(self):
+        """Test that status and priority changes emit UPDATE events."""
+        task = self.todo_list.add_task("Task 1")
+        task.mark_completed()
+        task.set_priority(5)
+
+        updates = [event for event in self.events if event.kind is ChangeKind.UPDATE]
+        self.assertEqual(updates[0].changes, {'status': (TaskStatus.PENDING, TaskStatus.COMPLETED)})
+        self.assertEqual(updates[1].changes, {'priority': (3, 5)})
+
+    def test_reorder_event_on_sort(self):
+        """Test that sorting emits a REORDER event."""
+        self.todo_list.add_task("B")
+        self.todo_list.add_task("A")
+        self.todo_list.sort_tasks_by_name()
+        self.assertIs(self.events[-1].kind, ChangeKind.REORDER)
+
+    def test_removed_task_no_longer_reports(self):
+        """Test that tasks stop emitting events once removed."""
+        task = self.todo_list.add_task("Task 1", TaskStatus.COMPLETED)
+        self.todo_list.clear_completed_tasks()
+        count = len(self.events)
+        task.mark_pending()
+        self.assertEqual(len(self.events), count)
+
+    def test_remove_listener(self):
+        """Test that removed listeners receive no further events."""
+        self.todo_list.remove_listener(self.events.append)
+        self.todo_list.add_task("Task 1")
+        self.assertEqual(self.events, [])
+
+
+class TestSubscription(unittest.TestCase):
+    """Test the Subscription queue."""
+
+    def setUp(self):
+        """Set up an empty todo list."""
+        self.todo_list = ToDoList("Subscriptions")
+
+    def test_get_returns_events_in_order(self):
+        """Test that events are delivered in emission order."""
+        subscription = self.todo_list.subscribe()
+        self.todo_list.add_task("Task 1")
+        self.todo_list.add_task("Task 2")
+
+        self.assertEqual(subscription.get(block=False).task.name, "Task 1")
+        self.assertEqual(subscription.get(block=False).task.name, "Task 2")
+        with self.assertRaises(queue.Empty):
+            subscription.get(block=False)
+
+    def test_bounded_queue_drops_oldest(self):
+        """Test that a full queue drops the oldest event."""
+        subscription = self.todo_list.subscribe(maxsize=2)
+        for i in range(5):
+            self.todo_list.add_task(f"Task {i}")
+
+        names = [event.task.name for event in subscription.drain()]
+        self.assertEqual(names, ["Task 3", "Task 4"])
+        self.assertEqual(subscription.dropped, 3)
+
+    def test_coalesces_repeated_updates(self):
+        """Test that repeated updates within the window merge into one event."""
+        task = self.todo_list.add_task("Task 1")
+        subscription = self.todo_list.subscribe(coalesce_window=60.0)
+        task.mark_in_progress()
+        task.mark_completed()
+        task.set_priority(4)
+
+        events = subscription.drain()
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0].changes, {
+            'status': (TaskStatus.PENDING, TaskStatus.COMPLETED),
+            'priority': (3, 4),
+        })
+        self.assertEqual(subscription.coalesced, 2)
+
+    def test_coalescing_leaves_other_subscribers_alone(self):
+        """Test that merging updates does not alter the events other subscribers get."""
+        task = self.todo_list.add_task("Task 1")
+        coalescing = self.todo_list.subscribe(coalesce_window=10.0)
+        plain = self.todo_list.subscribe()
+        task.set_priority(4)
+        task.set_priority(5)
+
+        self.assertEqual([event.changes for event in plain.drain()],
+                         [{'priority': (3, 4)}, {'priority': (4, 5)}])
+        self.assertEqual([event.changes for event in coalescing.drain()],
+                         [{'priority': (3, 5)}])
+
+        with self.todo_list.batch():
+            task.set_priority(1)
+        task.set_priority(2)
+        self.assertEqual([event.changes for event in plain.drain()],
+                         [{'priority': (5, 1)}, {'priority': (1, 2)}])
+        self.assertEqual(len(coalescing.drain()), 1)
+
+    def test_update_after_pending_add_is_folded(self):
+        """Test that updates to a not yet delivered task are folded into its ADD."""
+        subscription = self.todo_list.subscribe(coalesce_window=60.0)
+        task = self.todo_list.add_task("Task 1")
+        task.mark_completed()
+
+        events = subscription.drain()
+        self.assertEqual([event.kind for event in events], [ChangeKind.ADD])
+        self.assertTrue(events[0].task.is_completed())
+
+    def test_no_coalescing_without_window(self):
+        """Test that every update is delivered when coalescing is off."""
+        task = self.todo_list.add_task("Task 1")
+        subscription = self.todo_list.subscribe()
+        task.mark_in_progress()
+        task.mark_completed()
+        self.assertEqual(len(subscription), 2)
+
+    def test_close_unsubscribes(self):
+        """Test that a closed subscription stops receiving events."""
+        with self.todo_list.subscribe() as subscription:
+            pass
+        self.todo_list.add_task("Task 1")
+        self.assertEqual(len(subscription), 0)
+        self.assertEqual(self.todo_list._listeners, [])
+
+    def test_async_iteration(self):
+        """Test consuming events with ``async for``."""
+        subscription = self.todo_list.subscribe()
+
+        async def consume():
+            names = []
+            async for event in subscription:
+                names.append(event.task.name)
+                if len(names) == 2:
+                    subscription.close()
+            return names
+
+        async def produce_and_consume():
+            consumer = asyncio.ensure_future(consume())
+            await asyncio.sleep(0)
+            self.todo_list.add_task("Task 1")
+            self.todo_list.add_task("Task 2")
+            return await asyncio.wait_for(consumer, timeout=5)
+
+        self.assertEqual(asyncio.run(produce_and_consume()), ["Task 1", "Task 2"])
+
+    def test_abandoned_async_waiters(self):
+        """Test that waiters of timed-out consumers and closed loops do not break publishing."""
+        subscription = self.todo_list.subscribe()
+        other = self.todo_list.subscribe()
+
+        async def wait_briefly():
+            with self.assertRaises(asyncio.TimeoutError):
+                await asyncio.wait_for(subscription.__anext__(), timeout=0.01)
+
+        asyncio.run(wait_briefly())
+        self.assertEqual(subscription._waiters, [])
+        loop = asyncio.new_event_loop()
+        subscription._waiters.append((loop, loop.create_future()))
+        loop.close()
+        self.todo_list.add_task("Task 1")
+        self.todo_list.add_task("Task 2")
+        self.assertEqual([event.task.name for event in other.drain()], ["Task 1", "Task 2"])
+        self.assertEqual(len(subscription), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+"""
+Unit tests for the differential workload harness.
+
+This module tests that todo_harness generates reproducible streams, finds
+the original and refactored engines in agreement, and reports engines that
+disagree.
+"""
+
+import unittest
+import os
+from unittest import mock
+from todo_harness import (ENGINES, DiskEngine, LegacyEngine, RefactoredEngine,
+                          generate_operations, run_workload)
+
+
+class MiscountingEngine(RefactoredEngine):
+    """A refactored engine whose statistics forget one completed task."""
+
+    def statistics(self):
+        """Return the counts with one completed task missing."""
+        total, completed, pending = super().statistics()
+        return (total, max(0, completed - 1), pending)
+
+
+class TestHarness(unittest.TestCase):
+    """Test cases for todo_harness."""
+
+    def test_streams_are_reproducible(self):
+        """Test that the same seed gives the same stream."""
+        self.assertEqual(generate_operations(500, seed=1), generate_operations(500, seed=1))
+        self.assertNotEqual(generate_operations(500, seed=1), generate_operations(500, seed=2))
+
+    def test_engines_agree(self):
+        """Test that the original and refactored engines agree on several seeds."""
+        for seed in range(3):
+            report = run_workload(generate_operations(2_000, seed=seed, names=50))
+            self.assertTrue(report.ok, report.summary())
+            self.assertEqual(report.operations, 2_001)
+
+    def test_timings_are_recorded(self):
+        """Test that every engine gets a call count and time per kind of operation."""
+        operations = generate_operations(300, seed=4)
+        report = run_workload(operations, check_final_state=False)
+        self.assertEqual(set(report.timings), set(ENGINES))
+        for timings in report.timings.values():
+            self.assertEqual(sum(calls for calls, _ in timings.values()), 300)
+            self.assertTrue(all(seconds >= 0 for _, seconds in timings.values()))
+        self.assertIn("all results match", report.summary())
+
+    def test_mismatch_is_reported(self):
+        """Test that the run stops at the first operation where engines disagree."""
+        operations = [('add', ("Write docs", "completed")), ('add', ("Fix bug", "pending")),
+                      ('statistics', ()), ('add', ("Ship", "pending"))]
+        report = run_workload(operations, {'refactored': RefactoredEngine,
+                                           'broken': MiscountingEngine})
+        self.assertFalse(report.ok)
+        self.assertEqual(report.mismatch.index, 2)
+        self.assertEqual(report.mismatch.results, {'refactored': (2, 1, 1), 'broken': (2, 0, 1)})
+        self.assertEqual(report.operations, 3)
+        self.assertIn("MISMATCH", report.summary())
+
+    def test_engines_are_closed(self):
+        """Test that a run removes the disk engine's databases, even when an engine fails."""
+        created = []
+
+        def disk_engine():
+            engine = DiskEngine()
+            created.append(engine)
+            return engine
+
+        operations = generate_operations(200, seed=5, names=20)
+        self.assertTrue(run_workload(operations, {'legacy': LegacyEngine, 'disk': disk_engine}).ok)
+        with mock.patch.object(LegacyEngine, 'export', side_effect=KeyboardInterrupt):
+            with self.assertRaises(KeyboardInterrupt):
+                run_workload(operations, {'disk': disk_engine, 'legacy': LegacyEngine})
+        self.assertEqual(len(created), 2)
+        self.assertFalse(any(os.path.exists(engine._directory.name) for engine in created))
+
+    def test_legacy_lookups_ignore_case(self):
+        """Test that the original engine's find and reopen match names case-insensitively."""
+        engine = LegacyEngine()
+        engine.add("Write Docs", "completed")
+        self.assertEqual(engine.find("write docs"), ("Write Docs", "completed"))
+        self.assertTrue(engine.reopen("WRITE DOCS"))
+        self.assertEqual(engine.find("Write Docs"), ("Write Docs", "pending"))
+        self.assertIsNone(engine.find("Missing"))
+        self.assertFalse(engine.reopen("Missing"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+"""
+Unit tests for the indexed engine behind the original ToDo application.
+
+These tests check that ToDo.ToDoList keeps its index and counters consistent
+with the public tasks list; test_todo.py covers the public behavior itself.
+"""
+
+import io
+import unittest
+from contextlib import redirect_stdout
+from ToDo import Task, ToDoList
+
+
+class TestTaskIndex(unittest.TestCase):
+    """Tests for ToDoList's name index and status counters."""
+
+    def setUp(self):
+        """Set up a todo list with a few tasks, discarding the printed output."""
+        self.todo_list = ToDoList()
+        with redirect_stdout(io.StringIO()):
+            self.todo_list.add_task("Task 1")
+            self.todo_list.add_task("Task 2", "completed")
+            self.todo_list.add_task("Task 3")
+
+    def test_counts_come_from_counters(self):
+        """Test that counts are read from the engine counters."""
+        self.assertEqual(self.todo_list._index.status_counts, {"pending": 2, "completed": 1})
+        self.assertEqual(self.todo_list.get_completed_count(), 1)
+        self.assertEqual(self.todo_list.get_pending_count(), 2)
+
+    def test_direct_status_change_updates_counts(self):
+        """Test that changing a task's status directly keeps counts correct."""
+        self.todo_list.tasks[0].mark_completed()
+        self.todo_list.tasks[2].status = "completed"
+        self.assertEqual(self.todo_list.get_completed_count(), 3)
+        self.assertEqual(self.todo_list.get_pending_count(), 0)
+
+    def test_removed_task_no_longer_counted(self):
+        """Test that a removed task's later changes do not affect counts."""
+        task = self.todo_list.tasks[0]
+        with redirect_stdout(io.StringIO()):
+            self.todo_list.remove_task("Task 1")
+        task.mark_completed()
+        self.assertEqual(self.todo_list.get_completed_count(), 1)
+        self.assertEqual(self.todo_list.get_pending_count(), 1)
+
+    def test_direct_list_edits_trigger_reindex(self):
+        """Test that appending to or replacing the tasks list is picked up."""
+        self.todo_list.tasks.append(Task("Task 4", "completed"))
+        self.assertEqual(self.todo_list.get_completed_count(), 2)
+
+        self.todo_list.tasks = [Task("Only task")]
+        self.assertEqual(self.todo_list.get_task_count(), 1)
+        self.assertEqual(self.todo_list.get_pending_count(), 1)
+        with redirect_stdout(io.StringIO()):
+            self.assertTrue(self.todo_list.mark_task_completed("only TASK"))
+
+    def test_same_length_list_edits_trigger_reindex(self):
+        """Test that replacing, reordering and popping tasks in place is picked up."""
+        old_task = self.todo_list.tasks[0]
+        self.todo_list.tasks[0] = Task("x", "completed")
+        self.assertEqual(self.todo_list.get_completed_count(), 2)
+        old_task.mark_completed()
+        self.assertEqual(self.todo_list.get_completed_count(), 2)
+        with redirect_stdout(io.StringIO()):
+            self.assertTrue(self.todo_list.mark_task_completed("X"))
+            self.todo_list.add_task("task 3", "completed")
+        self.todo_list.tasks.reverse()
+        with redirect_stdout(io.StringIO()):
+            self.todo_list.remove_task("Task 3")
+        self.assertEqual([(task.name, task.status) for task in self.todo_list.tasks],
+                         [("Task 3", "pending"), ("Task 2", "completed"), ("x", "completed")])
+        self.todo_list.tasks.pop().mark_pending()
+        self.assertEqual(self.todo_list.get_pending_count(), 1)
+
+    def test_rename_updates_lookup(self):
+        """Test that renamed tasks are found under their new name."""
+        self.todo_list.tasks[1].name = "Renamed"
+        with redirect_stdout(io.StringIO()):
+            self.assertFalse(self.todo_list.remove_task("Task 2"))
+            self.assertTrue(self.todo_list.remove_task("renamed"))
+        self.assertEqual([task.name for task in self.todo_list.tasks], ["Task 1", "Task 3"])
+
+    def test_duplicates_removed_in_list_order(self):
+        """Test that duplicate names are removed first occurrence first."""
+        with redirect_stdout(io.StringIO()):
+            self.todo_list.add_task("task 1", "completed")
+            self.todo_list.remove_task("TASK 1")
+        self.assertEqual(self.todo_list.tasks[-1].status, "completed")
+        self.assertEqual([task.name for task in self.todo_list.tasks], ["Task 2", "Task 3", "task 1"])
+
+    def test_tasks_shared_between_lists(self):
+        """Test that lists sharing Task objects keep their own order and counts."""
+        with redirect_stdout(io.StringIO()):
+            for name in ("A", "B", "C", "D", "E"):
+                self.todo_list.add_task(name)
+        other = ToDoList()
+        other.tasks = list(reversed(self.todo_list.tasks))
+        self.assertEqual(other.get_pending_count(), 7)
+        self.todo_list.tasks[3].mark_completed()
+        self.assertEqual((self.todo_list.get_completed_count(), other.get_completed_count()), (2, 2))
+        with redirect_stdout(io.StringIO()):
+            self.assertTrue(self.todo_list.remove_task("a"))
+            self.assertTrue(other.remove_task("e"))
+        self.assertEqual([task.name for task in self.todo_list.tasks],
+                         ["Task 1", "Task 2", "Task 3", "B", "C", "D", "E"])
+        self.assertEqual([task.name for task in other.tasks],
+                         ["D", "C", "B", "A", "Task 3", "Task 2", "Task 1"])
+        self.todo_list.tasks[-1].mark_completed()
+        self.assertEqual((self.todo_list.get_completed_count(), other.get_completed_count()), (2, 2))
+        other.tasks[0].mark_completed()
+        self.assertEqual((self.todo_list.get_completed_count(), other.get_completed_count()), (3, 3))
+
+    def test_task_repeated_in_one_list(self):
+        """Test that a task appearing twice is counted and removed like a plain list would."""
+        task = self.todo_list.tasks[0]
+        self.todo_list.tasks = [task, self.todo_list.tasks[1], task]
+        task.mark_completed()
+        self.assertEqual(self.todo_list.get_completed_count(), 3)
+        with redirect_stdout(io.StringIO()):
+            self.assertTrue(self.todo_list.remove_task("task 1"))
+        self.assertEqual(self.todo_list.tasks, [self.todo_list.tasks[0], task])
+        self.assertEqual([t.name for t in self.todo_list.tasks], ["Task 2", "Task 1"])
+        self.assertEqual(self.todo_list.get_completed_count(), 2)
+
+    def test_printed_output_unchanged(self):
+        """Test that the engine does not change what the list prints."""
+        output = io.StringIO()
+        with redirect_stdout(output):
+            self.todo_list.mark_task_completed("task 3")
+            self.todo_list.remove_task("Task 2")
+            self.todo_list.remove_task("Missing")
+        self.assertEqual(output.getvalue(), (
+            "Task 'Task 3' marked as completed!\n"
+            "Task 'Task 2' removed successfully!\n"
+            "Task 'Missing' not found!\n"
+        ))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+"""
+Unit tests for memory accounting.
+
+This module tests memory_report() and the tracemalloc attribution in
+todo_memory.
+"""
+
+import unittest
+from todo_memory import COMPONENTS, CODE_PATHS, memory_report, tracing
+from todo_refactored import ToDoList
+
+
+class TestMemoryReport(unittest.TestCase):
+    """Test cases for memory_report()."""
+
+    def setUp(self):
+        """Set up a list of tagged tasks."""
+        self.todo_list = ToDoList("Memory")
+        for i in range(100):
+            self.todo_list.add_task(f"Task number {i}", tags=["backend"] if i % 2 else ())
+
+    def test_components(self):
+        """Test that every component is reported and totals add up."""
+        report = self.todo_list.memory_report()
+        self.assertEqual(tuple(report.components), COMPONENTS)
+        self.assertEqual(report.task_count, 100)
+        self.assertEqual(report.total, sum(report.components.values()))
+        self.assertAlmostEqual(report.per_task, report.total / 100)
+        self.assertGreater(report.components['names'], 0)
+        self.assertIsNone(report.allocations)
+        self.assertIn("per task", report.format())
+
+    def test_shared_objects_counted_once(self):
+        """Test that shared timestamps and status members are not counted per reference."""
+        report = memory_report(self.todo_list)
+        task = next(iter(self.todo_list))
+        self.assertIs(task.created_at, task.updated_at)
+        self.assertEqual(report.components['datetimes'], 100 * task.created_at.__sizeof__())
+        self.assertLess(report.components['statuses'], 1000)
+
+    def test_indexes_grow_with_structures(self):
+        """Test that lazily built structures are counted under indexes."""
+        before = memory_report(self.todo_list).components['indexes']
+        self.todo_list.tag_index()
+        self.todo_list.dependency_graph()
+        self.assertGreater(memory_report(self.todo_list).components['indexes'], before)
+
+    def test_traced_attribution(self):
+        """Test that live allocations are attributed to add, import and export."""
+        with self.assertRaises(RuntimeError):
+            memory_report(self.todo_list, traced=True)
+        with tracing():
+            added = ToDoList()
+            for i in range(200):
+                added.add_task(f"Traced task {i}")
+            exported = added.export_to_list()
+            imported = ToDoList()
+            imported.import_from_list(exported, trusted=True)
+            report = imported.memory_report(traced=True)
+        self.assertEqual(set(report.allocations), set(CODE_PATHS))
+        self.assertTrue(all(size > 0 for size in report.allocations.values()),
+                        report.allocations)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+"""
+Unit tests for parallel statistics.
+
+This module tests that todo_parallel's process-pool aggregation over
+snapshots gives exactly the results of ToDoList.get_statistics() and
+ToDoList.cross_tab().
+"""
+
+import os
+import random
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from todo_parallel import parallel_cross_tab, parallel_statistics
+from todo_refactored import TaskStatus, ToDoList
+from todo_shared import open_snapshot_file, write_snapshot_file
+
+
+class TestParallelStatistics(unittest.TestCase):
+    """Test cases for parallel_statistics() and parallel_cross_tab()."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up a list created over several months."""
+        rng = random.Random(45)
+        start = datetime(2024, 1, 1)
+        rows = []
+        for i in range(3_000):
+            created = (start + timedelta(minutes=rng.randrange(200_000))).isoformat()
+            rows.append({'name': f"Task {i}", 'status': rng.choice(list(TaskStatus)).value,
+                         'priority': rng.randint(1, 5), 'created_at': created,
+                         'updated_at': created})
+        cls.todo_list = ToDoList("Parallel")
+        cls.todo_list.import_from_list(rows)
+
+    def test_statistics_match(self):
+        """Test that pooled and in-process counting equal get_statistics()."""
+        expected = self.todo_list.get_statistics()
+        for workers in (1, 2):
+            self.assertEqual(parallel_statistics(self.todo_list, workers=workers, chunk_size=700),
+                             expected)
+
+    def test_time_buckets_match(self):
+        """Test that bucketed cross-tabs equal ToDoList.cross_tab()."""
+        for bucket in ('day', 'week', 'month'):
+            self.assertEqual(parallel_cross_tab(self.todo_list, bucket, workers=2),
+                             self.todo_list.cross_tab(bucket))
+
+    def test_snapshot_file(self):
+        """Test counting a snapshot file."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "tasks.col")
+            write_snapshot_file(self.todo_list, path)
+            snapshot = open_snapshot_file(path)
+            try:
+                self.assertEqual(snapshot.get_statistics(), self.todo_list.get_statistics())
+            finally:
+                snapshot.close()
+            self.assertEqual(parallel_cross_tab(path, 'month', workers=2),
+                             self.todo_list.cross_tab('month'))
+
+    def test_empty_list_and_bad_bucket(self):
+        """Test an empty list and an unknown time bucket."""
+        self.assertEqual(parallel_statistics(ToDoList(), workers=1), ToDoList().get_statistics())
+        with self.assertRaises(ValueError):
+            parallel_cross_tab(self.todo_list, 'year')
+
+
+if __name__ == '__main__':
+    unittest.main()
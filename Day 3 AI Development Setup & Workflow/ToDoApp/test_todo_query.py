@@ -0,0 +1,103 @@
+"""
+Unit tests for the query-result cache.
+
+This module tests ToDoList.version and todo_query's QueryCache: cached
+answers between changes, invalidation, immutability and the memory budget.
+"""
+
+import unittest
+from todo_refactored import TaskStatus, ToDoList
+
+
+class TestQueryCache(unittest.TestCase):
+    """Test cases for the QueryCache class."""
+
+    def setUp(self):
+        """Set up a list of tasks with mixed statuses and priorities."""
+        self.todo_list = ToDoList("Queries")
+        statuses = list(TaskStatus)
+        for i in range(20):
+            self.todo_list.add_task(f"Task {i}", statuses[i % 4], priority=i % 5 + 1)
+        self.cache = self.todo_list.query_cache()
+
+    def test_version_counts_changes(self):
+        """Test that every kind of change increases the version."""
+        todo_list = self.todo_list
+        versions = [todo_list.version]
+        task = todo_list.add_task("New")
+        versions.append(todo_list.version)
+        task.mark_completed()
+        versions.append(todo_list.version)
+        todo_list.sort_tasks_by_name()
+        versions.append(todo_list.version)
+        todo_list.remove_task_by_id(task.task_id)
+        versions.append(todo_list.version)
+        todo_list.import_from_list([{'name': "Imported", 'created_at': "2024-01-01T00:00:00",
+                                     'updated_at': "2024-01-01T00:00:00", 'status': "pending",
+                                     'priority': 2}], trusted=True)
+        versions.append(todo_list.version)
+        self.assertEqual(versions, sorted(set(versions)))
+        todo_list.find_task("Task 1")
+        self.assertEqual(todo_list.version, versions[-1])
+
+    def test_repeated_reads_are_cached(self):
+        """Test that identical reads between changes return the same cached view."""
+        pending = self.cache.find_tasks_by_status(TaskStatus.PENDING)
+        self.assertIsInstance(pending, tuple)
+        self.assertIs(self.cache.find_tasks_by_status(TaskStatus.PENDING), pending)
+        statistics = self.cache.get_statistics()
+        self.assertIs(self.cache.get_statistics(), statistics)
+        self.assertEqual(dict(statistics, priority_distribution=dict(statistics['priority_distribution'])),
+                         self.todo_list.get_statistics())
+        with self.assertRaises(TypeError):
+            statistics['completed'] = 0
+        with self.assertRaises(TypeError):
+            statistics['priority_distribution']['1'] = 0
+        info = self.cache.cache_info()
+        self.assertEqual((info.hits, info.misses, info.entries), (2, 2, 2))
+        self.assertEqual(info.hit_rate, 0.5)
+
+    def test_changes_invalidate(self):
+        """Test that answers after a change reflect it."""
+        pending = self.cache.find_tasks_by_status(TaskStatus.PENDING)
+        pending[0].mark_cancelled()
+        self.assertEqual(self.cache.find_tasks_by_status(TaskStatus.PENDING), pending[1:])
+        self.assertEqual(self.cache.get_tasks_by_priority(1),
+                         tuple(task for task in self.todo_list if task.priority == 1))
+        self.assertEqual(self.cache.cache_info().invalidations, 1)
+
+    def test_direct_assignment_invalidates(self):
+        """Test that assigning a task's status or priority directly invalidates answers."""
+        pending = self.cache.find_tasks_by_status(TaskStatus.PENDING)
+        statistics = self.cache.get_statistics()
+        pending[0].status = TaskStatus.COMPLETED
+        self.assertEqual(self.cache.find_tasks_by_status(TaskStatus.PENDING), pending[1:])
+        pending[1].priority = 5
+        self.assertEqual(self.cache.get_tasks_by_priority(5),
+                         tuple(task for task in self.todo_list if task.priority == 5))
+        self.assertEqual(self.cache.get_statistics()['completed'], statistics['completed'] + 1)
+
+    def test_list_methods_use_cache(self):
+        """Test that the list's own filters return fresh lists from the cache."""
+        first = self.todo_list.find_tasks_by_status("completed")
+        first.clear()
+        second = self.todo_list.find_tasks_by_status("completed")
+        self.assertEqual(second, [task for task in self.todo_list if task.is_completed()])
+        self.assertEqual(self.todo_list.get_tasks_by_priority(3),
+                         [task for task in self.todo_list if task.priority == 3])
+        self.assertEqual(self.todo_list.find_tasks_by_status("unknown"), [])
+        self.assertEqual(self.cache.cache_info().hits, 1)
+
+    def test_memory_budget(self):
+        """Test that least recently used answers are evicted to stay within budget."""
+        self.cache.max_size = 3 * self.cache.cache_info().size + 200
+        for priority in (1, 2, 3, 4, 5, 1):
+            self.cache.get_tasks_by_priority(priority)
+        info = self.cache.cache_info()
+        self.assertLessEqual(info.size, info.max_size)
+        self.assertGreater(info.evictions, 0)
+        self.assertEqual(info.misses, 6)
+
+
+if __name__ == '__main__':
+    unittest.main()
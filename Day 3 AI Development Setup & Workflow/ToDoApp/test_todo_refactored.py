@@ -4,8 +4,10 @@ Unit tests for the refactored ToDo application.
 This module contains comprehensive tests for the refactored Task and ToDoList classes.
 """
 
+import gc
 import unittest
-from datetime import datetime
+from datetime import date, datetime
+from todo_events import ChangeKind
 from todo_refactored import Task, TaskStatus, ToDoList, create_sample_todo_list
 
 
@@ -435,6 +437,60 @@ class TestToDoList(unittest.TestCase):
         task_names = [task.name for task in self.todo_list]
         self.assertEqual(set(task_names), {"Imported Task 1", "Imported Task 2"})
     
+    def test_import_restores_timestamps(self):
+        """Test that importing keeps the exported created_at/updated_at values."""
+        task_data = [{
+            'name': 'Old Task',
+            'status': 'completed',
+            'priority': 2,
+            'created_at': '2023-01-01T08:30:00',
+            'updated_at': '2023-01-02T09:45:30.123456'
+        }]
+
+        self.todo_list.import_from_list(task_data)
+        task = self.todo_list.find_task("Old Task")
+        self.assertEqual(task.created_at, datetime(2023, 1, 1, 8, 30))
+        self.assertEqual(task.updated_at, datetime(2023, 1, 2, 9, 45, 30, 123456))
+
+    def test_export_import_round_trip(self):
+        """Test that an export survives an import unchanged."""
+        self.todo_list.add_task("Task 1", TaskStatus.PENDING, priority=3)
+        self.todo_list.add_task("Task 2", TaskStatus.COMPLETED, priority=5)
+        self.todo_list.find_task("Task 2").set_priority(4)
+        exported = self.todo_list.export_to_list()
+
+        for trusted in (False, True):
+            new_list = ToDoList("Copy")
+            self.assertEqual(new_list.import_from_list(exported, trusted=trusted), 2)
+            self.assertEqual(new_list.export_to_list(), exported)
+
+    def test_trusted_import_tasks_are_owned(self):
+        """Test that tasks imported in trusted mode behave like added tasks."""
+        self.todo_list.add_task("Task 1")
+        new_list = ToDoList("Copy")
+        new_list.import_from_list(self.todo_list.export_to_list(), trusted=True)
+
+        events = []
+        new_list.add_listener(events.append)
+        new_list.find_task("Task 1").mark_completed()
+        self.assertEqual(len(events), 1)
+        self.assertEqual(new_list.get_completed_count(), 1)
+
+    def test_trusted_import_raises_on_malformed_rows(self):
+        """Test that trusted mode does not silently skip bad rows."""
+        with self.assertRaises(KeyError):
+            self.todo_list.import_from_list([{'name': 'No fields'}], trusted=True)
+
+    def test_import_invalid_timestamp(self):
+        """Test that rows with unparseable timestamps are skipped."""
+        invalid_data = [
+            {'name': 'Valid Task', 'created_at': '2023-01-01T00:00:00'},
+            {'name': 'Bad Task', 'created_at': 'yesterday'}
+        ]
+
+        self.assertEqual(self.todo_list.import_from_list(invalid_data), 1)
+        self.assertEqual(self.todo_list.find_task("Valid Task").created_at, datetime(2023, 1, 1))
+
     def test_import_invalid_data(self):
         """Test importing tasks with invalid data."""
         invalid_data = [
@@ -464,6 +520,569 @@ class TestToDoList(unittest.TestCase):
         self.assertEqual(str(self.todo_list), expected)
 
 
+class TestTombstones(unittest.TestCase):
+    """Tests for tombstone deletion and lazy compaction."""
+
+    def setUp(self):
+        """Set up a list that never compacts on its own."""
+        self.todo_list = ToDoList("Tombstones", compaction_ratio=1.0)
+        for i in range(10):
+            self.todo_list.add_task(f"Task {i}")
+
+    def test_removal_leaves_tombstone(self):
+        """Test that removing a task does not shift later slots."""
+        self.todo_list.remove_task("Task 3")
+        self.assertEqual(len(self.todo_list._slots), 10)
+        self.assertIsNone(self.todo_list._slots[3])
+        self.assertEqual(len(self.todo_list), 9)
+        self.assertEqual(str(self.todo_list), "Tombstones (9 tasks)")
+
+    def test_iteration_skips_tombstones(self):
+        """Test that iteration only yields live tasks."""
+        self.todo_list.remove_task("Task 0")
+        self.todo_list.remove_task("Task 5")
+        names = [task.name for task in self.todo_list]
+        self.assertEqual(names, [f"Task {i}" for i in (1, 2, 3, 4, 6, 7, 8, 9)])
+
+    def test_index_keeps_its_meaning(self):
+        """Test that indexes refer to live positions after removals."""
+        self.todo_list.remove_task("Task 1")
+        self.todo_list.remove_task("Task 2")
+
+        self.assertEqual(self.todo_list.remove_task_by_index(1).name, "Task 3")
+        self.assertEqual(self.todo_list.remove_task_by_index(-1).name, "Task 9")
+        self.assertEqual(self.todo_list.remove_task_by_index(0).name, "Task 0")
+        self.assertIsNone(self.todo_list.remove_task_by_index(7))
+        self.assertEqual([task.name for task in self.todo_list],
+                         [f"Task {i}" for i in (4, 5, 6, 7, 8)])
+
+    def test_removing_half_by_index(self):
+        """Test removing every other task by index."""
+        for i in range(5):
+            self.todo_list.remove_task_by_index(i)
+        self.assertEqual([task.name for task in self.todo_list],
+                         [f"Task {i}" for i in (1, 3, 5, 7, 9)])
+
+    def test_compaction_at_ratio(self):
+        """Test that slots are compacted once the tombstone ratio is reached."""
+        todo_list = ToDoList("Compacting", compaction_ratio=0.25)
+        for i in range(8):
+            todo_list.add_task(f"Task {i}")
+
+        todo_list.remove_task("Task 0")
+        self.assertEqual(len(todo_list._slots), 8)
+        todo_list.remove_task("Task 1")
+        self.assertEqual(len(todo_list._slots), 6)
+        self.assertNotIn(None, todo_list._slots)
+
+    def test_clear_completed_uses_tombstones(self):
+        """Test that clearing completed tasks keeps remaining positions valid."""
+        for name in ("Task 2", "Task 4", "Task 6"):
+            self.todo_list.mark_task_completed(name)
+
+        self.assertEqual(self.todo_list.clear_completed_tasks(), 3)
+        self.assertEqual(len(self.todo_list), 7)
+        self.assertEqual(self.todo_list.remove_task_by_index(2).name, "Task 3")
+
+    def test_dense_view_and_sort_compact(self):
+        """Test that the dense view and sorting drop tombstones."""
+        self.todo_list.remove_task("Task 4")
+        self.assertNotIn(None, self.todo_list._tasks)
+        self.assertEqual(len(self.todo_list._slots), 9)
+
+        self.todo_list.remove_task("Task 5")
+        self.todo_list.sort_tasks_by_name(reverse=True)
+        self.assertEqual(len(self.todo_list._slots), 8)
+        self.assertEqual(self.todo_list._tasks[0].name, "Task 9")
+
+    def test_add_after_index_lookup(self):
+        """Test that tasks added after removals are found at the right index."""
+        self.todo_list.remove_task("Task 0")
+        self.todo_list.remove_task_by_index(0)
+        self.todo_list.add_task("Task 10")
+        self.assertEqual(self.todo_list.remove_task_by_index(8).name, "Task 10")
+
+    def test_invalid_compaction_ratio(self):
+        """Test that the compaction ratio is validated."""
+        with self.assertRaises(ValueError):
+            ToDoList(compaction_ratio=0)
+
+
+class TestTaskIds(unittest.TestCase):
+    """Tests for stable task IDs and ID-keyed operations."""
+
+    def setUp(self):
+        """Set up a todo list with three tasks."""
+        self.todo_list = ToDoList("IDs")
+        self.tasks = [self.todo_list.add_task(f"Task {i}") for i in range(3)]
+
+    def test_ids_are_assigned_in_order(self):
+        """Test that added tasks receive increasing IDs."""
+        self.assertEqual([task.task_id for task in self.tasks], [1, 2, 3])
+
+    def test_ids_survive_sort_and_remove(self):
+        """Test that IDs keep addressing the same task after reordering."""
+        self.todo_list.sort_tasks_by_name(reverse=True)
+        self.todo_list.remove_task("Task 2")
+        self.assertIs(self.todo_list.get_task_by_id(1), self.tasks[0])
+        self.assertIsNone(self.todo_list.get_task_by_id(3))
+
+    def test_ids_are_not_reused(self):
+        """Test that IDs of removed tasks are not handed out again."""
+        self.todo_list.remove_task_by_id(3)
+        self.assertEqual(self.todo_list.add_task("Task 3").task_id, 4)
+
+    def test_remove_task_by_id(self):
+        """Test removing a task by ID."""
+        removed = self.todo_list.remove_task_by_id(2)
+        self.assertIs(removed, self.tasks[1])
+        self.assertEqual([task.name for task in self.todo_list], ["Task 0", "Task 2"])
+        self.assertIsNone(self.todo_list.remove_task_by_id(2))
+
+    def test_remove_by_id_after_sort(self):
+        """Test that ID removal finds the right slot after a sort."""
+        self.todo_list.sort_tasks_by_name(reverse=True)
+        self.todo_list.remove_task_by_id(3)
+        self.todo_list.remove_task_by_id(1)
+        self.assertEqual([task.name for task in self.todo_list], ["Task 1"])
+
+    def test_mark_task_by_id(self):
+        """Test changing a task's status by ID."""
+        self.assertTrue(self.todo_list.mark_task_by_id(1, TaskStatus.COMPLETED))
+        self.assertTrue(self.todo_list.mark_task_by_id(2, "in_progress"))
+        self.assertFalse(self.todo_list.mark_task_by_id(99, TaskStatus.COMPLETED))
+        self.assertEqual(self.tasks[0].status, TaskStatus.COMPLETED)
+        self.assertEqual(self.tasks[1].status, TaskStatus.IN_PROGRESS)
+        with self.assertRaises(ValueError):
+            self.todo_list.mark_task_by_id(1, "invalid_status")
+
+    def test_set_priority_by_id(self):
+        """Test changing a task's priority by ID."""
+        self.assertTrue(self.todo_list.set_priority_by_id(3, 5))
+        self.assertEqual(self.tasks[2].priority, 5)
+        self.assertFalse(self.todo_list.set_priority_by_id(99, 5))
+        with self.assertRaises(ValueError):
+            self.todo_list.set_priority_by_id(3, 6)
+
+    def test_export_includes_ids_and_import_keeps_them(self):
+        """Test that IDs round-trip through export and import."""
+        self.todo_list.remove_task_by_id(2)
+        exported = self.todo_list.export_to_list()
+        self.assertEqual([row['id'] for row in exported], [1, 3])
+
+        for trusted in (False, True):
+            new_list = ToDoList("Copy")
+            new_list.import_from_list(exported, trusted=trusted)
+            self.assertEqual(new_list.get_task_by_id(3).name, "Task 2")
+            self.assertEqual(new_list.add_task("New").task_id, 4)
+
+    def test_import_reassigns_conflicting_ids(self):
+        """Test that imported IDs already in use are replaced."""
+        self.todo_list.import_from_list([{'id': 1, 'name': 'Clash'}, {'name': 'No ID'}])
+        self.assertEqual(self.todo_list.get_task_by_id(1).name, "Task 0")
+        self.assertEqual(self.todo_list.find_task("Clash").task_id, 4)
+        self.assertEqual(self.todo_list.find_task("No ID").task_id, 5)
+
+    def test_failed_trusted_import_leaves_no_ids(self):
+        """Test that a failed trusted import does not register any IDs."""
+        rows = self.todo_list.export_to_list()
+        for row in rows:
+            row['id'] += 10
+        rows.append({'name': 'Broken'})
+        with self.assertRaises(KeyError):
+            self.todo_list.import_from_list(rows, trusted=True)
+        self.assertIsNone(self.todo_list.get_task_by_id(11))
+        self.assertEqual(len(self.todo_list), 3)
+
+
+class TestCrossTab(unittest.TestCase):
+    """Tests for the status x priority cross-tab and incremental cells."""
+
+    def setUp(self):
+        """Set up a list spread over statuses, priorities and creation days."""
+        self.todo_list = ToDoList("Report")
+        self.todo_list.import_from_list([
+            {'name': "A", 'status': "pending", 'priority': 5, 'created_at': "2024-01-01T09:00:00"},
+            {'name': "B", 'status': "pending", 'priority': 5, 'created_at': "2024-01-02T09:00:00"},
+            {'name': "C", 'status': "completed", 'priority': 5, 'created_at': "2024-01-08T09:00:00"},
+            {'name': "D", 'status': "in_progress", 'priority': 1, 'created_at': "2024-02-01T09:00:00"},
+        ])
+
+    def recount(self):
+        """Count (status, priority) cells by scanning the list."""
+        cells = {}
+        for task in self.todo_list:
+            cells[(task.status, task.priority)] = cells.get((task.status, task.priority), 0) + 1
+        return cells
+
+    def test_matrix_and_counts(self):
+        """Test the matrix, cell counts and roll-ups."""
+        tab = self.todo_list.cross_tab()
+        self.assertEqual(tab.count("pending", 5), 2)
+        self.assertEqual(tab.count(TaskStatus.COMPLETED), 1)
+        self.assertEqual(tab.count(priority=5), 3)
+        self.assertEqual(tab.count("bogus"), 0)
+        self.assertEqual(tab.total, 4)
+        self.assertEqual(tab.matrix()[TaskStatus.PENDING], {1: 0, 2: 0, 3: 0, 4: 0, 5: 2})
+        self.assertEqual(tab.rollup('priority'), {(5,): 3, (1,): 1})
+        self.assertEqual(tab.rollup(), {(): 4})
+        with self.assertRaises(ValueError):
+            tab.rollup('owner')
+
+    def test_completion_rate_matches_statistics(self):
+        """Test that completion rates use the get_statistics() definition."""
+        tab = self.todo_list.cross_tab()
+        self.assertEqual(tab.completion_rate(), self.todo_list.get_statistics()['completion_rate'])
+        self.assertAlmostEqual(tab.completion_rate(priority=5), 100 / 3)
+        self.assertEqual(tab.completion_rate(priority=2), 0)
+
+    def test_time_buckets(self):
+        """Test splitting the counts by created_at."""
+        by_week = self.todo_list.cross_tab('week').rollup('bucket')
+        self.assertEqual(by_week, {(date(2024, 1, 1),): 2, (date(2024, 1, 8),): 1,
+                                   (date(2024, 1, 29),): 1})
+        by_month = self.todo_list.cross_tab('month')
+        self.assertEqual(by_month.count(bucket=date(2024, 1, 1)), 3)
+        self.assertEqual(by_month.completion_rate(bucket=date(2024, 2, 1)), 0)
+        self.assertEqual(self.todo_list.cross_tab('day').count("pending", bucket=date(2024, 1, 2)), 1)
+        with self.assertRaises(ValueError):
+            self.todo_list.cross_tab('year')
+
+    def test_cells_follow_every_change(self):
+        """Test that the incremental cells always equal a full recount."""
+        self.todo_list.find_task("A").mark_completed()
+        self.todo_list.find_task("B").set_priority(2)
+        self.todo_list.mark_task_by_id(4, "cancelled")
+        self.todo_list.add_task("E", "in_progress", 4)
+        self.todo_list.import_from_list(self.todo_list.export_to_list(), trusted=True)
+        self.todo_list.remove_task("D")
+        self.todo_list.clear_completed_tasks()
+        self.assertEqual(self.todo_list._cells, self.recount())
+        self.assertEqual(self.todo_list.get_cancelled_count(), 1)
+        self.assertEqual(self.todo_list.get_statistics()['priority_distribution'],
+                         {'1': 1, '2': 2, '3': 0, '4': 2, '5': 0})
+
+    def test_cells_follow_direct_assignment(self):
+        """Test that assigning status and priority directly updates the counts."""
+        events = []
+        self.todo_list.add_listener(events.append)
+        version = self.todo_list.version
+        task = self.todo_list.find_task("A")
+        task.status = TaskStatus.CANCELLED
+        task.priority = 1
+        task.priority = 1
+        self.assertEqual(self.todo_list._cells, self.recount())
+        self.assertEqual((self.todo_list.get_pending_count(), self.todo_list.get_cancelled_count()), (1, 1))
+        self.assertEqual(self.todo_list.get_statistics()['priority_distribution']['1'], 2)
+        self.assertEqual([event.changes for event in events],
+                         [{'status': (TaskStatus.PENDING, TaskStatus.CANCELLED)}, {'priority': (5, 1)}])
+        self.assertEqual(self.todo_list.version, version + 2)
+
+
+class TestDueDates(unittest.TestCase):
+    """Tests for optional task deadlines."""
+
+    def setUp(self):
+        """Set up a list with one task that has a deadline."""
+        self.due = datetime(2024, 3, 1, 17, 0)
+        self.todo_list = ToDoList("Due")
+        self.task = self.todo_list.add_task("Report", due_at=self.due)
+
+    def test_deadline_defaults_to_none(self):
+        """Test that tasks have no deadline unless one is given."""
+        self.assertIsNone(Task("No deadline").due_at)
+        self.assertEqual(self.task.due_at, self.due)
+
+    def test_set_due_at_reports_change(self):
+        """Test that changing the deadline emits an UPDATE event."""
+        events = []
+        self.todo_list.add_listener(events.append)
+        self.task.set_due_at(self.due)
+        self.task.set_due_at(None)
+        self.assertEqual([event.changes for event in events], [{'due_at': (self.due, None)}])
+
+    def test_is_overdue(self):
+        """Test that only open tasks past their deadline are overdue."""
+        self.assertTrue(self.task.is_overdue(self.due))
+        self.assertFalse(self.task.is_overdue(datetime(2024, 2, 1)))
+        self.task.mark_completed()
+        self.assertFalse(self.task.is_overdue(self.due))
+
+    def test_export_import_round_trip(self):
+        """Test that deadlines survive export and both import modes."""
+        self.todo_list.add_task("Open ended")
+        exported = self.todo_list.export_to_list()
+        self.assertEqual(exported[0]['due_at'], "2024-03-01T17:00:00")
+        self.assertIsNone(exported[1]['due_at'])
+        for trusted in (False, True):
+            imported = ToDoList()
+            imported.import_from_list(exported, trusted=trusted)
+            self.assertEqual([task.due_at for task in imported], [self.due, None])
+
+
+class TestTags(unittest.TestCase):
+    """Tests for task tags."""
+
+    def setUp(self):
+        """Set up a list with one tagged task."""
+        self.todo_list = ToDoList("Tags")
+        self.task = self.todo_list.add_task("Deploy", tags=[" Backend ", "urgent"])
+
+    def test_tags_are_normalized(self):
+        """Test that tags are stripped, lowercased and must not be empty."""
+        self.assertEqual(self.task.tags, frozenset({"backend", "urgent"}))
+        self.assertTrue(self.task.has_tag("BACKEND"))
+        self.assertEqual(Task("Untagged").tags, frozenset())
+        with self.assertRaises(ValueError):
+            self.todo_list.add_task("Bad", tags=[" "])
+
+    def test_tag_changes_are_reported(self):
+        """Test that adding and removing tags emits UPDATE events only on change."""
+        events = []
+        self.todo_list.add_listener(events.append)
+        self.task.add_tag("urgent")
+        self.task.remove_tag("Urgent")
+        self.assertEqual([event.changes for event in events],
+                         [{'tags': (frozenset({"backend", "urgent"}), frozenset({"backend"}))}])
+
+    def test_export_import_round_trip(self):
+        """Test that tags survive export and both import modes."""
+        self.todo_list.add_task("Plain")
+        exported = self.todo_list.export_to_list()
+        self.assertEqual(exported[0]['tags'], ["backend", "urgent"])
+        for trusted in (False, True):
+            imported = ToDoList()
+            imported.import_from_list(exported, trusted=trusted)
+            self.assertEqual([task.tags for task in imported],
+                             [frozenset({"backend", "urgent"}), frozenset()])
+
+
+class TestRenderCache(unittest.TestCase):
+    """Tests for the cached display string and export record."""
+
+    def setUp(self):
+        """Set up a list with one task that has been rendered and exported."""
+        self.todo_list = ToDoList("Cache")
+        self.task = self.todo_list.add_task("Write report", priority=2)
+        str(self.task)
+        self.todo_list.export_to_list()
+
+    def test_display_follows_changes(self):
+        """Test that status, priority and name changes refresh the display string."""
+        self.assertIs(str(self.task), str(self.task))
+        self.task.mark_in_progress()
+        self.assertEqual(str(self.task), "[IN_PROGRESS] Write report (Priority: 2)")
+        self.task.set_priority(4)
+        self.task.rename("  Write final report ")
+        self.assertEqual(str(self.task), "[IN_PROGRESS] Write final report (Priority: 4)")
+
+    def test_export_follows_changes(self):
+        """Test that exports reflect every kind of change."""
+        self.task.mark_completed()
+        self.task.add_tag("docs")
+        self.task.set_due_at(datetime(2024, 5, 1))
+        row = self.todo_list.export_to_list()[0]
+        self.assertEqual((row['status'], row['tags'], row['due_at']),
+                         ("completed", ["docs"], "2024-05-01T00:00:00"))
+        self.assertEqual(row['updated_at'], self.task.updated_at.isoformat())
+
+    def test_direct_assignment_refreshes_cache(self):
+        """Test that assigning name, status or priority directly refreshes both cached forms."""
+        self.task.name = "Write memo"
+        self.task.status = TaskStatus.COMPLETED
+        self.task.priority = 5
+        self.assertEqual(str(self.task), "[COMPLETED] Write memo (Priority: 5)")
+        row = self.todo_list.export_to_list()[0]
+        self.assertEqual((row['name'], row['status'], row['priority']), ("Write memo", "completed", 5))
+
+    def test_exported_rows_are_copies(self):
+        """Test that modifying an exported row does not affect later exports."""
+        self.task.add_tag("docs")
+        row = self.todo_list.export_to_list()[0]
+        row['name'] = "Changed"
+        row['tags'].append("other")
+        again = self.todo_list.export_to_list()[0]
+        self.assertEqual((again['name'], again['tags']), ("Write report", ["docs"]))
+
+    def test_rename(self):
+        """Test that rename validates the name and reports the change."""
+        events = []
+        self.todo_list.add_listener(events.append)
+        self.task.rename("Write report")
+        self.task.rename("Review report")
+        self.assertEqual([event.changes for event in events],
+                         [{'name': ("Write report", "Review report")}])
+        with self.assertRaises(ValueError):
+            self.task.rename("   ")
+
+    def test_reassigned_id_is_exported(self):
+        """Test that a task whose ID changes on import exports its new ID."""
+        row = self.todo_list.export_to_list()[0]
+        other = ToDoList()
+        other.add_task("Taken")
+        other.import_from_list([row])
+        self.assertEqual([r['id'] for r in other.export_to_list()], [1, 2])
+
+
+class TestBatch(unittest.TestCase):
+    """Test cases for ToDoList.batch()."""
+
+    def setUp(self):
+        """Set up a list of ten tasks and record the events it delivers."""
+        self.todo_list = ToDoList("Batch", compaction_ratio=0.2)
+        for i in range(10):
+            self.todo_list.add_task(f"Task {i}", priority=i % 5 + 1, tags=["odd"] if i % 2 else ())
+        self.events = []
+        self.todo_list.add_listener(self.events.append)
+
+    def assertIndexesCurrent(self):
+        """Assert that the tag index and Merkle tree match ones built from scratch."""
+        fresh = ToDoList()
+        fresh.import_from_list(self.todo_list.export_to_list())
+        self.assertEqual(self.todo_list.tag_index().tag_counts(), fresh.tag_index().tag_counts())
+        self.assertEqual(self.todo_list.tag_index().find(status="completed"),
+                         [task for task in self.todo_list if task.is_completed()])
+        self.assertEqual(self.todo_list.merkle_tree().root, fresh.merkle_tree().root)
+
+    def test_events_are_merged_at_commit(self):
+        """Test that listeners get one event per task, only once the batch ends."""
+        tasks = list(self.todo_list)
+        with self.todo_list.batch():
+            added = self.todo_list.add_task("Added")
+            added.set_priority(5)
+            temporary = self.todo_list.add_task("Temporary")
+            tasks[0].set_priority(4)
+            tasks[0].mark_completed()
+            tasks[0].set_priority(1)
+            self.todo_list.remove_task_by_id(tasks[1].task_id)
+            self.todo_list.sort_tasks_by_name()
+            self.todo_list.remove_task_by_id(temporary.task_id)
+            self.assertEqual(self.events, [])
+            self.assertEqual(len(self.todo_list), 10)
+        self.assertEqual([(event.kind, event.task) for event in self.events],
+                         [(ChangeKind.ADD, added), (ChangeKind.UPDATE, tasks[0]),
+                          (ChangeKind.REMOVE, tasks[1]), (ChangeKind.REORDER, None)])
+        self.assertEqual(self.events[1].changes, {'priority': (1, 1),
+                                                  'status': (TaskStatus.PENDING, TaskStatus.COMPLETED)})
+
+    def test_indexes_after_commit(self):
+        """Test that indexes are correct after a batch, with compaction deferred to the end."""
+        self.todo_list.tag_index()
+        self.todo_list.merkle_tree()
+        with self.todo_list.batch():
+            for task in list(self.todo_list)[:6]:
+                task.mark_completed()
+                task.add_tag("done")
+            self.assertEqual(self.todo_list.clear_completed_tasks(), 6)
+            self.assertEqual(self.todo_list._tombstones, 6)
+            self.todo_list.add_task("After", tags=["odd"]).mark_completed()
+        self.assertEqual(self.todo_list._tombstones, 0)
+        self.assertIndexesCurrent()
+
+    def test_rollback(self):
+        """Test that an exception undoes every change and delivers no event."""
+        self.todo_list.tag_index()
+        before = self.todo_list.export_to_list()
+        statistics = self.todo_list.get_statistics()
+        version = self.todo_list.version
+        tasks = list(self.todo_list)
+        with self.assertRaises(RuntimeError):
+            with self.todo_list.batch():
+                added = self.todo_list.add_task("Added")
+                tasks[2].rename("Renamed")
+                tasks[3].mark_completed()
+                self.todo_list.remove_task_by_id(tasks[4].task_id)
+                self.todo_list.clear_completed_tasks()
+                self.todo_list.sort_tasks_by_priority()
+                self.todo_list.import_from_list(self.todo_list.export_to_list(), trusted=True)
+                raise RuntimeError("abort")
+        self.assertEqual(self.todo_list.export_to_list(), before)
+        self.assertEqual(self.todo_list.get_statistics(), statistics)
+        self.assertEqual(self.events, [])
+        self.assertGreater(self.todo_list.version, version)
+        self.assertIs(self.todo_list.get_task_by_id(tasks[4].task_id), tasks[4])
+        self.assertIs(tasks[4]._owner, self.todo_list)
+        self.assertIsNone(added._owner)
+        self.assertEqual(str(tasks[2]), "[PENDING] Task 2 (Priority: 3)")
+        self.assertEqual(self.todo_list.add_task("Next").task_id, 11)
+        self.assertIndexesCurrent()
+
+    def test_rollback_restores_tombstones(self):
+        """Test that undoing a sort or compaction brings back slots with tombstones."""
+        self.todo_list.remove_task("Task 3")
+        before = self.todo_list.export_to_list()
+        statistics = self.todo_list.get_statistics()
+        for reorder in (self.todo_list.sort_tasks_by_name, self.todo_list.compact):
+            with self.assertRaises(RuntimeError):
+                with self.todo_list.batch():
+                    self.todo_list.remove_task("Task 6")
+                    reorder()
+                    raise RuntimeError("abort")
+            self.assertEqual(self.todo_list._tombstones, 1)
+            self.assertEqual(self.todo_list.export_to_list(), before)
+            self.assertEqual(self.todo_list.get_statistics(), statistics)
+            self.assertNotIn(None, list(self.todo_list))
+        self.assertEqual(self.todo_list.remove_task_by_index(5).name, "Task 6")
+
+    def test_nested_batches_and_late_listeners(self):
+        """Test that an inner batch joins the outer one and late listeners get later changes."""
+        late = []
+        with self.todo_list.batch():
+            first = self.todo_list.add_task("First")
+            with self.todo_list.batch():
+                self.todo_list.add_listener(late.append)
+                second = self.todo_list.add_task("Second")
+            self.assertEqual(self.events, [])
+        self.assertEqual([event.task for event in self.events], [first, second])
+        self.assertEqual([event.task for event in late], [second])
+
+    def test_failed_inner_batch_rolls_back_alone(self):
+        """Test that an inner batch that raises undoes only its own changes."""
+        self.todo_list.tag_index()
+        tasks = list(self.todo_list)
+        with self.todo_list.batch():
+            first = self.todo_list.add_task("First")
+            tasks[0].mark_completed()
+            before = self.todo_list.export_to_list()
+            statistics = self.todo_list.get_statistics()
+            with self.assertRaises(RuntimeError):
+                with self.todo_list.batch():
+                    inner = self.todo_list.add_task("Inner")
+                    tasks[0].set_priority(5)
+                    tasks[1].rename("Renamed")
+                    first.mark_in_progress()
+                    self.todo_list.remove_task_by_id(tasks[2].task_id)
+                    self.todo_list.clear_completed_tasks()
+                    self.todo_list.sort_tasks_by_name(reverse=True)
+                    self.todo_list.import_from_list(before, trusted=True)
+                    raise RuntimeError("abort")
+            self.assertEqual(self.todo_list.export_to_list(), before)
+            self.assertEqual(self.todo_list.get_statistics(), statistics)
+            self.assertIsNone(inner._owner)
+            last = self.todo_list.add_task("Last")
+        self.assertEqual(last.task_id, first.task_id + 1)
+        self.assertEqual([(event.kind, event.task) for event in self.events],
+                         [(ChangeKind.ADD, first), (ChangeKind.UPDATE, tasks[0]),
+                          (ChangeKind.ADD, last)])
+        self.assertIndexesCurrent()
+
+    def test_failing_listener_does_not_starve_others(self):
+        """Test that every listener gets every event even if one raises during commit."""
+        def failing(event):
+            raise ValueError("listener failed")
+        self.todo_list.remove_listener(self.events.append)
+        self.todo_list.add_listener(failing)
+        self.todo_list.add_listener(self.events.append)
+        with self.assertRaises(ValueError):
+            with self.todo_list.batch():
+                self.assertTrue(gc.isenabled())
+                added = self.todo_list.add_task("Added")
+                self.todo_list.remove_task("Task 0")
+        self.assertEqual([event.kind for event in self.events], [ChangeKind.ADD, ChangeKind.REMOVE])
+        self.assertIs(self.todo_list.find_task("Added"), added)
+        self.assertEqual(len(self.todo_list), 10)
+
+
 class TestCreateSampleTodoList(unittest.TestCase):
     """Test the create_sample_todo_list function."""
     
@@ -0,0 +1,178 @@
+"""
+Unit tests for due-date reminders.
+
+This module tests the deadline index, the hierarchical timer wheel and the
+Reminders service in todo_reminders, using a fake clock.
+"""
+
+import asyncio
+import math
+import random
+import threading
+import unittest
+from datetime import datetime, timedelta
+from todo_refactored import ToDoList
+from todo_reminders import DeadlineIndex, Reminders, TimerWheel
+
+
+START = datetime(2024, 1, 1, 9, 0)
+
+
+class FakeClock:
+    """A clock that only moves when told to."""
+
+    def __init__(self, now):
+        """Start the clock at a given time in seconds."""
+        self.now = now
+
+    def __call__(self):
+        """Return the current fake time."""
+        return self.now
+
+
+class TestDeadlineIndex(unittest.TestCase):
+    """Test cases for the DeadlineIndex class."""
+
+    def setUp(self):
+        """Set up a list with deadlines in mixed order."""
+        self.todo_list = ToDoList("Deadlines")
+        self.later = self.todo_list.add_task("Later", due_at=START + timedelta(days=2))
+        self.none = self.todo_list.add_task("No deadline")
+        self.sooner = self.todo_list.add_task("Sooner", due_at=START + timedelta(days=1))
+        self.index = DeadlineIndex(self.todo_list)
+
+    def test_ordered_by_deadline(self):
+        """Test that open tasks with deadlines are returned earliest first."""
+        self.assertEqual(len(self.index), 2)
+        self.assertIs(self.index.next_due(), self.sooner)
+        self.assertEqual(self.index.due_before(START + timedelta(days=3)), [self.sooner, self.later])
+        self.assertEqual(self.index.overdue(START + timedelta(days=1)), [self.sooner])
+        self.assertEqual(self.index.overdue(START), [])
+
+    def test_follows_changes(self):
+        """Test that finishing, reopening and rescheduling update the index."""
+        self.sooner.mark_completed()
+        self.assertIs(self.index.next_due(), self.later)
+        self.sooner.mark_pending()
+        self.later.set_due_at(START)
+        self.none.set_due_at(START + timedelta(hours=1))
+        self.todo_list.remove_task("Sooner")
+        self.assertEqual(self.index.due_before(START + timedelta(days=5)), [self.later, self.none])
+        self.later.set_due_at(None)
+        self.assertEqual(len(self.index), 1)
+
+
+class TestTimerWheel(unittest.TestCase):
+    """Test cases for the TimerWheel class."""
+
+    def test_fires_once_at_deadline(self):
+        """Test random timers across every level and the overflow list."""
+        rng = random.Random(38)
+        clock = FakeClock(1000.0)
+        wheel = TimerWheel(tick=1.0, slots=4, levels=2, clock=clock)
+        fired = {}
+        timers = {}
+        for i in range(300):
+            deadline = 1000.0 + rng.uniform(-5, 60)
+            timers[i] = wheel.schedule(deadline, lambda i=i: fired.setdefault(i, clock.now))
+        cancelled = set(rng.sample(range(300), 30))
+        for i in cancelled:
+            timers[i].cancel()
+
+        while clock.now < 1070:
+            clock.now += rng.uniform(0.1, 3.0)
+            wheel.run_due()
+            for i, timer in timers.items():
+                if i in cancelled:
+                    continue
+                # Never early, and at the latest once the tick holding the
+                # deadline has passed
+                if i in fired:
+                    self.assertLessEqual(timer.deadline, fired[i])
+                else:
+                    self.assertGreater(math.ceil(timer.deadline), clock.now)
+        self.assertFalse(cancelled & fired.keys())
+        self.assertEqual(len(wheel), 0)
+
+    def test_invalid_configuration(self):
+        """Test that an invalid wheel shape is rejected."""
+        with self.assertRaises(ValueError):
+            TimerWheel(tick=0)
+        with self.assertRaises(ValueError):
+            TimerWheel(slots=1)
+
+
+class TestReminders(unittest.TestCase):
+    """Test cases for the Reminders service."""
+
+    def setUp(self):
+        """Set up a list, a fake clock and a Reminders service recording callbacks."""
+        self.clock = FakeClock(START.timestamp())
+        self.todo_list = ToDoList("Reminders")
+        self.task = self.todo_list.add_task("Report", due_at=START + timedelta(hours=2))
+        self.events = []
+        self.reminders = Reminders(
+            self.todo_list,
+            on_overdue=lambda task: self.events.append(("overdue", task.name)),
+            on_reminder=lambda task: self.events.append(("reminder", task.name)),
+            remind_before=timedelta(hours=1), tick=60, clock=self.clock)
+
+    def tearDown(self):
+        """Stop the service."""
+        self.reminders.close()
+
+    def move_to(self, moment):
+        """Move the fake clock and poll."""
+        self.clock.now = moment.timestamp()
+        return self.reminders.poll()
+
+    def test_reminder_then_overdue(self):
+        """Test that the reminder and the overdue callback fire at their times."""
+        self.assertEqual(self.move_to(START + timedelta(minutes=59)), 0)
+        self.move_to(START + timedelta(hours=1))
+        self.assertEqual(self.events, [("reminder", "Report")])
+        self.move_to(START + timedelta(hours=5))
+        self.assertEqual(self.events, [("reminder", "Report"), ("overdue", "Report")])
+
+    def test_finished_and_rescheduled_tasks(self):
+        """Test that completed tasks are not reported and new deadlines are used."""
+        self.task.set_due_at(START + timedelta(hours=3))
+        other = self.todo_list.add_task("Review", due_at=START + timedelta(minutes=30))
+        other.mark_completed()
+        self.move_to(START + timedelta(hours=2, minutes=30))
+        self.assertEqual(self.events, [("reminder", "Report")])
+        self.move_to(START + timedelta(hours=3))
+        self.assertEqual(self.events[-1], ("overdue", "Report"))
+
+    def test_already_overdue_fires_on_next_poll(self):
+        """Test that a task added past its deadline is reported straight away."""
+        self.todo_list.add_task("Late", due_at=START - timedelta(days=1))
+        self.assertEqual(self.reminders.poll(), 1)
+        self.assertEqual(self.events, [("overdue", "Late")])
+
+    def test_background_thread(self):
+        """Test polling from a background thread."""
+        fired = threading.Event()
+        self.reminders.on_overdue = lambda task: fired.set()
+        self.reminders.start(interval=0.01)
+        self.clock.now = (START + timedelta(days=1)).timestamp()
+        self.assertTrue(fired.wait(timeout=5))
+        self.reminders.stop()
+
+    def test_asyncio_task(self):
+        """Test polling from an asyncio task."""
+        async def run():
+            poller = asyncio.ensure_future(self.reminders.run_async(interval=0.01))
+            self.clock.now = (START + timedelta(days=1)).timestamp()
+            for _ in range(500):
+                if ("overdue", "Report") in self.events:
+                    break
+                await asyncio.sleep(0.01)
+            poller.cancel()
+
+        asyncio.run(run())
+        self.assertIn(("overdue", "Report"), self.events)
+
+
+if __name__ == '__main__':
+    unittest.main()
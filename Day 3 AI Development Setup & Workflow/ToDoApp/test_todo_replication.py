@@ -0,0 +1,196 @@
+"""
+Unit tests for log-shipping replication.
+
+This module tests todo_replication with in-process followers and with a
+follower running in a separate process.
+"""
+
+import multiprocessing
+import threading
+import unittest
+from todo_refactored import ToDoList
+from todo_replication import (Follower, Leader, ReadClient, ReplicationError, run_follower,
+                              serve_reads)
+
+
+class TestReplication(unittest.TestCase):
+    """Test cases for the Leader and Follower classes."""
+
+    def setUp(self):
+        """Set up a leader list with a few tasks and one attached follower."""
+        self.todo_list = ToDoList("Team")
+        self.todo_list.add_task("Task A", priority=2)
+        self.todo_list.add_task("Task B", "in_progress", 5)
+        self.leader = Leader(self.todo_list, log_size=5)
+        leader_end, follower_end = multiprocessing.Pipe()
+        self.follower_id = self.leader.attach(leader_end)
+        self.follower = Follower(follower_end)
+        self.leader.flush()
+
+    def tearDown(self):
+        """Disconnect every follower."""
+        self.leader.close()
+
+    def assert_in_sync(self):
+        """Assert that the follower's replica matches the leader's list."""
+        self.assertTrue(self.follower.wait_for(self.leader.seq, timeout=1))
+        self.assertEqual(self.follower.export_to_list(), self.todo_list.export_to_list())
+
+    def test_bootstrap_from_snapshot(self):
+        """Test that a new follower starts from a snapshot."""
+        self.assertEqual(self.follower.get_task_count(), 2)
+        self.assertEqual(self.follower.replica.name, "Team")
+        self.assert_in_sync()
+
+    def test_changes_are_replicated_in_order(self):
+        """Test that every kind of change reaches the follower."""
+        self.todo_list.add_task("Task C", "completed", 1)
+        self.todo_list.mark_task_by_id(1, "completed")
+        self.todo_list.sort_tasks_by_priority()
+        self.todo_list.clear_completed_tasks()
+        self.todo_list.add_task("Task D")
+        self.assert_in_sync()
+        self.assertEqual([task.name for task in self.follower.list_tasks(priority=5)], ["Task B"])
+        self.assertEqual(self.follower.get_statistics(), self.todo_list.get_statistics())
+
+    def test_lag_reporting(self):
+        """Test that the leader sees acknowledged positions and followers report theirs."""
+        self.todo_list.add_task("Task C")
+        self.todo_list.add_task("Task D")
+        self.assertEqual(self.leader.lag(), {self.follower_id: 2})
+        self.leader.flush()
+        self.follower.replicate()
+        self.assertEqual(self.leader.lag(), {self.follower_id: 0})
+        self.assertEqual(self.follower.lag()['applied_seq'], 2)
+        self.assertGreaterEqual(self.follower.lag()['replay_delay'], 0.0)
+
+    def test_reconnect_catches_up_from_log(self):
+        """Test that a returning follower only receives the entries it missed."""
+        self.follower.replicate()
+        replica = self.follower.replica
+        self.leader.detach(self.follower_id)
+        self.todo_list.add_task("Task C")
+        self.todo_list.mark_task_by_id(2, "completed")
+
+        leader_end, follower_end = multiprocessing.Pipe()
+        self.leader.attach(leader_end, since=self.follower.applied_seq)
+        self.follower.reconnect(follower_end)
+        self.assert_in_sync()
+        self.assertIs(self.follower.replica, replica)
+
+    def test_reconnect_after_log_truncated_uses_snapshot(self):
+        """Test that a follower too far behind is sent a new snapshot."""
+        self.follower.replicate()
+        replica = self.follower.replica
+        self.leader.detach(self.follower_id)
+        for i in range(10):
+            self.todo_list.add_task(f"Task {i}")
+
+        leader_end, follower_end = multiprocessing.Pipe()
+        self.leader.attach(leader_end, since=self.follower.applied_seq)
+        self.follower.reconnect(follower_end)
+        self.assert_in_sync()
+        self.assertIsNot(self.follower.replica, replica)
+
+    def test_gap_in_log_is_an_error(self):
+        """Test that a follower refuses entries it cannot apply in order."""
+        follower = Follower(None)
+        follower.replica = ToDoList()
+        with self.assertRaises(ReplicationError):
+            follower._apply(('entry', 3, 0.0, None, None))
+
+    def test_stalled_follower_does_not_block_leader(self):
+        """Test that a follower that stops reading is detached instead of blocking changes."""
+        todo_list = ToDoList("Busy")
+        leader = Leader(todo_list, max_pending=100)
+        leader_end, follower_end = multiprocessing.Pipe()
+        stalled_id = leader.attach(leader_end)
+        writer = threading.Thread(
+            target=lambda: [todo_list.add_task(f"Task {i}") for i in range(20_000)])
+        writer.start()
+        writer.join(timeout=30)
+        try:
+            self.assertFalse(writer.is_alive(), "adding tasks blocked on a stalled follower")
+            self.assertNotIn(stalled_id, leader.lag())
+            self.assertEqual(leader.overflows, 1)
+
+            # Reading again drains what was sent; reattaching catches up
+            follower = Follower(follower_end)
+            while follower.connected:
+                follower.replicate(timeout=1)
+            leader_end, follower_end = multiprocessing.Pipe()
+            leader.attach(leader_end, since=follower.applied_seq)
+            follower.reconnect(follower_end)
+            self.assertTrue(follower.wait_for(leader.seq))
+            self.assertEqual(follower.get_task_count(), 20_000)
+        finally:
+            leader.close()
+
+    def test_serve_reads_reports_replication_errors(self):
+        """Test that a log the follower cannot apply is reported to readers."""
+        log_leader, log_follower = multiprocessing.Pipe()
+        read_client, read_server = multiprocessing.Pipe()
+        server = threading.Thread(target=serve_reads, args=(Follower(log_follower), read_server))
+        server.start()
+        client = ReadClient(read_client)
+        try:
+            log_leader.send(('entry', 3, 0.0, None, None))
+            for _ in range(2):
+                with self.assertRaisesRegex(ValueError, "Replication stopped: Expected entry 1"):
+                    client.call('get_task_count')
+        finally:
+            client.close()
+            server.join(timeout=10)
+            log_leader.close()
+        self.assertFalse(server.is_alive())
+
+    def test_leader_disconnect_keeps_replica(self):
+        """Test that a follower keeps serving reads after the leader goes away."""
+        self.follower.replicate()
+        self.leader.close()
+        self.assertEqual(self.follower.replicate(), 0)
+        self.assertFalse(self.follower.connected)
+        self.assertEqual(self.follower.get_task_count(), 2)
+
+
+class TestFollowerProcess(unittest.TestCase):
+    """Test a follower serving reads from another process."""
+
+    def test_reads_from_follower_process(self):
+        """Test reads, filtered listings and errors through a ReadClient."""
+        todo_list = ToDoList("Team")
+        todo_list.add_task("Task A", priority=2)
+        leader = Leader(todo_list)
+        # A spawned child does not inherit the parent's pipe ends, so
+        # closing them here is seen by the follower as a disconnect
+        context = multiprocessing.get_context("spawn")
+        log_leader, log_follower = context.Pipe()
+        read_client, read_server = context.Pipe()
+        process = context.Process(target=run_follower, args=(log_follower, read_server))
+        process.start()
+        log_follower.close()
+        read_server.close()
+        leader.attach(log_leader)
+        client = ReadClient(read_client)
+        try:
+            todo_list.add_task("Task B", "in_progress", 5)
+            todo_list.mark_task_by_id(1, "completed")
+
+            self.assertEqual(client.call('get_statistics'), todo_list.get_statistics())
+            rows = client.call('find_tasks_by_status', 'in_progress')
+            self.assertEqual([row['name'] for row in rows], ["Task B"])
+            self.assertEqual(client.call('list_tasks', None, 2)[0]['status'], "completed")
+            self.assertEqual(client.call('lag')['applied_seq'], leader.seq)
+            with self.assertRaises(ValueError):
+                client.call('clear_completed_tasks')
+        finally:
+            client.close()
+            leader.close()
+            process.join(timeout=10)
+            if process.is_alive():
+                process.kill()
+        self.assertEqual(process.exitcode, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+"""
+Unit tests for the next-task scheduler.
+
+This module tests the heap-based Scheduler in todo_scheduler.
+"""
+
+import unittest
+from datetime import datetime, timedelta
+from todo_refactored import TaskStatus, ToDoList
+from todo_scheduler import Scheduler
+
+
+class TestScheduler(unittest.TestCase):
+    """Test cases for the Scheduler class."""
+
+    def setUp(self):
+        """Set up a list of tasks created an hour apart."""
+        start = datetime(2024, 1, 1, 9, 0)
+        self.todo_list = ToDoList("Queue")
+        self.todo_list.import_from_list([
+            {'name': "Old low", 'priority': 2, 'created_at': start.isoformat()},
+            {'name': "High", 'priority': 5, 'created_at': (start + timedelta(hours=3)).isoformat()},
+            {'name': "Mid", 'priority': 3, 'created_at': (start + timedelta(hours=1)).isoformat()},
+            {'name': "Started", 'status': "in_progress", 'priority': 5,
+             'created_at': start.isoformat()},
+            {'name': "Old mid", 'priority': 3, 'created_at': start.isoformat()},
+        ])
+        self.scheduler = Scheduler(self.todo_list)
+
+    def claim_all(self, scheduler):
+        """Claim every pending task and return the names in claim order."""
+        names = []
+        while (task := scheduler.claim_next()) is not None:
+            names.append(task.name)
+        return names
+
+    def test_order_by_priority_then_age(self):
+        """Test that higher priorities come first and ties go to older tasks."""
+        self.assertEqual(len(self.scheduler), 4)
+        self.assertEqual(self.scheduler.peek_next().name, "High")
+        self.assertEqual(self.claim_all(self.scheduler), ["High", "Old mid", "Mid", "Old low"])
+        self.assertEqual(self.todo_list.get_in_progress_count(), 5)
+        self.assertIsNone(self.scheduler.peek_next())
+
+    def test_aging_boosts_older_tasks(self):
+        """Test that aging lets old tasks overtake newer higher-priority ones."""
+        # One level per hour: "High" (5, 3h younger) now ties with "Old low" (2)
+        scheduler = Scheduler(self.todo_list, aging_rate=1.0)
+        self.assertEqual(self.claim_all(scheduler), ["Old mid", "Old low", "Mid", "High"])
+
+    def test_follows_changes_made_elsewhere(self):
+        """Test that priority, status, add and remove changes are picked up."""
+        self.todo_list.find_task("Old low").set_priority(5)
+        self.todo_list.find_task("High").mark_completed()
+        self.todo_list.remove_task("Old mid")
+        self.todo_list.find_task("Started").mark_pending()
+        self.todo_list.add_task("New", priority=4)
+        self.assertEqual(self.claim_all(self.scheduler), ["Old low", "Started", "New", "Mid"])
+
+    def test_requeued_task_after_claim(self):
+        """Test that a claimed task put back to pending is scheduled again."""
+        task = self.scheduler.claim_next()
+        task.mark_pending()
+        self.assertIs(self.scheduler.peek_next(), task)
+        self.assertEqual(len(self.scheduler), 4)
+
+    def test_stale_entries_are_compacted(self):
+        """Test that repeated reprioritizing does not grow the heap without bound."""
+        task = self.todo_list.find_task("Mid")
+        for i in range(200):
+            task.set_priority(i % 5 + 1)
+        self.assertLess(len(self.scheduler._heap), 40)
+        self.assertEqual(self.todo_list.find_task("Mid").status, TaskStatus.PENDING)
+
+    def test_negative_aging_rate(self):
+        """Test that a negative aging rate is rejected."""
+        with self.assertRaises(ValueError):
+            Scheduler(self.todo_list, aging_rate=-1)
+
+
+if __name__ == '__main__':
+    unittest.main()
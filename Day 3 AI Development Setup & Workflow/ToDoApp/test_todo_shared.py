@@ -0,0 +1,82 @@
+"""
+Unit tests for shared-memory columnar snapshots.
+
+This module tests publishing, attaching, generation switches and reading a
+snapshot from another process with todo_shared.
+"""
+
+import multiprocessing
+import unittest
+from datetime import datetime, timedelta
+from todo_refactored import TaskStatus, ToDoList
+from todo_shared import SnapshotPublisher, SnapshotReader, read_statistics
+
+
+class TestSharedSnapshots(unittest.TestCase):
+    """Test cases for SnapshotPublisher, SnapshotReader and ColumnarSnapshot."""
+
+    def setUp(self):
+        """Set up a published list with mixed statuses, priorities and deadlines."""
+        self.todo_list = ToDoList("Shared")
+        statuses = list(TaskStatus)
+        for i in range(40):
+            self.todo_list.add_task(f"Tâche {i}", statuses[i % 4], priority=i % 5 + 1,
+                                    due_at=datetime(2024, 1, 1) + timedelta(days=i) if i % 3 else None)
+        self.publisher = SnapshotPublisher(self.todo_list)
+        self.reader = SnapshotReader(self.publisher.name)
+
+    def tearDown(self):
+        """Detach the reader and unlink the publisher's blocks."""
+        self.reader.close()
+        self.publisher.close()
+
+    def test_columns_match_list(self):
+        """Test that the snapshot holds the list's tasks and statistics."""
+        snapshot = self.reader.snapshot()
+        try:
+            tasks = list(self.todo_list)
+            self.assertEqual(len(snapshot), 40)
+            self.assertEqual(list(snapshot.ids), [task.task_id for task in tasks])
+            self.assertEqual(snapshot.name(0), "Tâche 0")
+            self.assertEqual(snapshot.name(39), "Tâche 39")
+            self.assertEqual(snapshot.get_statistics(), self.todo_list.get_statistics())
+        finally:
+            snapshot.close()
+
+    def test_filters(self):
+        """Test row filters against filtering the list."""
+        snapshot = self.reader.snapshot()
+        try:
+            now = datetime(2024, 1, 20)
+            self.assertEqual(snapshot.task_ids(status="pending", priority=1),
+                             [task.task_id for task in self.todo_list
+                              if task.status is TaskStatus.PENDING and task.priority == 1])
+            self.assertEqual(snapshot.task_ids(overdue_at=now.timestamp()),
+                             [task.task_id for task in self.todo_list if task.is_overdue(now)])
+            self.assertEqual(snapshot.rows(created_after=datetime(2100, 1, 1).timestamp()), [])
+        finally:
+            snapshot.close()
+
+    def test_old_generation_survives_switch(self):
+        """Test that a reader keeps its generation while new ones are published."""
+        old = self.reader.snapshot()
+        self.todo_list.clear_completed_tasks()
+        self.assertEqual(self.publisher.publish(), 2)
+        new = self.reader.snapshot()
+        try:
+            self.assertEqual((old.generation, len(old)), (1, 40))
+            self.assertEqual((new.generation, len(new)), (2, 30))
+            self.assertEqual(old.name(1), "Tâche 1")
+        finally:
+            old.close()
+            new.close()
+
+    def test_worker_process(self):
+        """Test that a worker process computes statistics from the shared snapshot."""
+        with multiprocessing.get_context("spawn").Pool(1) as pool:
+            statistics = pool.apply(read_statistics, (self.publisher.name,))
+        self.assertEqual(statistics, self.todo_list.get_statistics())
+
+
+if __name__ == '__main__':
+    unittest.main()
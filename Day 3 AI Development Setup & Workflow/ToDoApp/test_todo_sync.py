@@ -0,0 +1,115 @@
+"""
+Unit tests for Merkle-tree diff and sync between ToDoLists.
+
+This module tests todo_sync with in-process replicas and over a socket pair.
+"""
+
+import socket
+import threading
+import unittest
+from todo_refactored import TaskStatus, ToDoList
+from todo_sync import MerkleTree, RemoteTree, serve
+
+
+def make_replicas(count=200):
+    """Create a list and an identical replica imported from its export."""
+    server = ToDoList("Server")
+    for i in range(count):
+        server.add_task(f"Task {i}", priority=i % 5 + 1)
+    laptop = ToDoList("Laptop")
+    laptop.import_from_list(server.export_to_list())
+    return server, laptop
+
+
+class TestMerkleTree(unittest.TestCase):
+    """Test cases for the MerkleTree class."""
+
+    def setUp(self):
+        """Set up two identical replicas."""
+        self.server, self.laptop = make_replicas()
+
+    def test_identical_replicas_share_root(self):
+        """Test that equal content gives equal roots regardless of order."""
+        self.laptop.sort_tasks_by_priority()
+        self.assertEqual(self.server.merkle_tree().root, self.laptop.merkle_tree().root)
+        self.assertEqual(self.laptop.merkle_tree().diff(self.server.merkle_tree()), [])
+
+    def test_tree_follows_changes(self):
+        """Test that the incrementally updated tree equals a rebuilt one."""
+        tree = self.laptop.merkle_tree()
+        self.assertIs(self.laptop.merkle_tree(), tree)
+        self.laptop.mark_task_by_id(3, TaskStatus.COMPLETED)
+        self.laptop.set_priority_by_id(4, 1)
+        self.laptop.remove_task_by_id(5)
+        self.laptop.add_task("New task")
+        self.laptop.clear_completed_tasks()
+        rebuilt = MerkleTree(self.laptop)
+        self.assertEqual(tree.root, rebuilt.root)
+        self.assertEqual(tree.diff(rebuilt), [])
+
+    def test_diff_finds_changed_tasks(self):
+        """Test that diff reports changed, added and removed tasks."""
+        self.laptop.mark_task_by_id(10, "completed")
+        self.laptop.remove_task_by_id(20)
+        new_task = self.laptop.add_task("Laptop only")
+        self.assertEqual(self.laptop.merkle_tree().diff(self.server.merkle_tree()),
+                         [10, 20, new_task.task_id])
+
+    def test_pull_makes_replicas_equal(self):
+        """Test that pulling from a replica copies only the differences."""
+        self.server.mark_task_by_id(10, "in_progress")
+        self.server.remove_task_by_id(20)
+        self.server.add_task("Server only", priority=5)
+        self.laptop.add_task("Laptop only")
+
+        # Both new tasks got ID 201, so the laptop's is replaced by the server's
+        changed = self.laptop.merkle_tree().pull(self.server.merkle_tree())
+        self.assertEqual(changed, 3)
+        self.assertEqual(self.laptop.merkle_tree().root, self.server.merkle_tree().root)
+        self.assertEqual(self.laptop.get_task_by_id(10).status, TaskStatus.IN_PROGRESS)
+        self.assertEqual(sorted(map(str, self.laptop)), sorted(map(str, self.server)))
+
+    def test_shape_mismatch(self):
+        """Test that trees of different shapes cannot be compared."""
+        with self.assertRaises(ValueError):
+            MerkleTree(self.laptop, fanout=4).diff(self.server.merkle_tree())
+
+
+class TestSocketSync(unittest.TestCase):
+    """Test syncing with a replica on the other end of a socket."""
+
+    def setUp(self):
+        """Serve the server replica's tree on one end of a socket pair."""
+        self.server, self.laptop = make_replicas(2000)
+        server_sock, client_sock = socket.socketpair()
+        self.thread = threading.Thread(target=serve, args=(self.server.merkle_tree(), server_sock))
+        self.thread.start()
+        self.sockets = (server_sock, client_sock)
+        self.remote = RemoteTree(client_sock)
+
+    def tearDown(self):
+        """Stop the server and close the sockets."""
+        self.remote.close()
+        self.thread.join(timeout=5)
+        for sock in self.sockets:
+            sock.close()
+
+    def test_pull_over_socket(self):
+        """Test that a remote pull exchanges only differing subtrees."""
+        self.server.mark_task_by_id(1234, "completed")
+        self.server.set_priority_by_id(42, 5)
+
+        self.assertEqual(self.laptop.merkle_tree().pull(self.remote), 2)
+        self.assertEqual(self.laptop.merkle_tree().root, self.server.merkle_tree().root)
+        self.assertEqual(self.laptop.get_task_by_id(1234).status, TaskStatus.COMPLETED)
+        self.assertLess(self.remote.bytes_received, 4000)
+
+    def test_remote_errors(self):
+        """Test that a bad request is reported without stopping the server."""
+        with self.assertRaises(ValueError):
+            self.remote.node_hashes(9, [0])
+        self.assertEqual(self.remote.shape(), (16, 3))
+
+
+if __name__ == '__main__':
+    unittest.main()
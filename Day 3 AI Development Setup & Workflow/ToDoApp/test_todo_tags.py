@@ -0,0 +1,80 @@
+"""
+Unit tests for the tag bitmap index.
+
+This module tests the TagIndex class in todo_tags against plain filtering
+of the list, including after removals, reorders and compaction.
+"""
+
+import random
+import unittest
+from todo_refactored import TaskStatus, ToDoList
+
+
+class TestTagIndex(unittest.TestCase):
+    """Test cases for the TagIndex class."""
+
+    def setUp(self):
+        """Set up a list with a few tagged tasks."""
+        self.todo_list = ToDoList("Tags")
+        self.api = self.todo_list.add_task("API", priority=5, tags=["Backend", "urgent"])
+        self.db = self.todo_list.add_task("Database", tags=["backend", "blocked", "urgent"])
+        self.ui = self.todo_list.add_task("UI", TaskStatus.COMPLETED, tags=["frontend", "urgent"])
+        self.docs = self.todo_list.add_task("Docs")
+        self.index = self.todo_list.tag_index()
+
+    def test_set_algebra(self):
+        """Test AND, OR and NOT queries combined with status and priority."""
+        self.assertEqual(self.index.find(tags=["backend", "urgent"], exclude=["blocked"]), [self.api])
+        self.assertEqual(self.index.count(tags=["urgent"]), 3)
+        self.assertEqual(self.index.count(any_tags=["backend", "frontend"], status="pending"), 2)
+        self.assertEqual(self.index.find(exclude=["urgent"]), [self.docs])
+        self.assertEqual(self.index.find(tags=["urgent"], priority=5), [self.api])
+        self.assertEqual(self.index.count(tags=["unknown"]), 0)
+        self.assertEqual(self.index.tag_counts(),
+                         {"backend": 2, "blocked": 1, "frontend": 1, "urgent": 3})
+
+    def test_follows_changes(self):
+        """Test that tag, status and priority changes and removals are indexed."""
+        self.db.remove_tag("blocked")
+        self.docs.add_tag("backend")
+        self.api.mark_completed()
+        self.todo_list.remove_task("UI")
+        self.assertEqual(self.index.find(tags=["backend"], status=TaskStatus.PENDING),
+                         [self.db, self.docs])
+        self.assertEqual(self.index.count(tags=["frontend"]), 0)
+        self.db.set_priority(1)
+        self.assertEqual(self.index.find(priority=1), [self.db])
+
+    def test_matches_filtering(self):
+        """Test random changes, sorts and compaction against filtering every task."""
+        rng = random.Random(40)
+        names = ["backend", "frontend", "urgent", "blocked"]
+        tasks = [self.todo_list.add_task(f"Task {i}", priority=rng.randint(1, 5),
+                                         tags=rng.sample(names, rng.randint(0, 3)))
+                 for i in range(200)]
+        for step in range(400):
+            action = rng.random()
+            if action < 0.3:
+                rng.choice(tasks).set_tags(rng.sample(names, rng.randint(0, 3)))
+            elif action < 0.5:
+                rng.choice(tasks).mark_completed()
+            elif action < 0.7 and len(self.todo_list) > 10:
+                task = rng.choice(list(self.todo_list))
+                self.todo_list.remove_task_by_id(task.task_id)
+                tasks = [t for t in tasks if t is not task]
+            elif action < 0.75:
+                self.todo_list.sort_tasks_by_priority()
+            else:
+                tasks.append(self.todo_list.add_task(f"New {step}", tags=rng.sample(names, 2)))
+            required, excluded = rng.sample(names, 2)
+            expected = [task for task in self.todo_list
+                        if required in task.tags and excluded not in task.tags
+                        and task.status is TaskStatus.PENDING]
+            self.assertEqual(self.index.find(tags=[required], exclude=[excluded],
+                                             status=TaskStatus.PENDING), expected)
+            self.assertEqual(self.index.count(tags=[required]),
+                             sum(required in task.tags for task in self.todo_list))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+"""
+Unit tests for the multi-list Workspace.
+
+This module tests name interning, incremental statistics and cross-list
+queries in todo_workspace.
+"""
+
+import unittest
+from todo_refactored import TaskStatus, ToDoList
+from todo_workspace import Workspace
+
+
+class TestWorkspace(unittest.TestCase):
+    """Test cases for the Workspace class."""
+
+    def setUp(self):
+        """Set up a workspace with two lists."""
+        self.workspace = Workspace()
+        self.alpha = self.workspace.create_list("Alpha")
+        self.beta = self.workspace.create_list("Beta")
+        self.alpha.add_task("Deploy", "in_progress", 5)
+        self.alpha.add_task("Write docs", "pending", 2)
+        self.beta.add_task("".join(["Dep", "loy"]), "in_progress", 5)
+        self.beta.add_task("Review", "completed", 3)
+
+    def assert_statistics_match_lists(self):
+        """Assert that workspace totals equal the sum over its lists."""
+        stats = self.workspace.get_statistics()
+        for key in ('total_tasks', 'completed', 'pending', 'in_progress', 'cancelled'):
+            self.assertEqual(stats[key], sum(l.get_statistics()[key] for l in self.workspace))
+        for priority, count in stats['priority_distribution'].items():
+            self.assertEqual(count, sum(l.get_statistics()['priority_distribution'][priority]
+                                        for l in self.workspace))
+
+    def test_membership(self):
+        """Test creating, looking up and rejecting duplicate lists."""
+        self.assertEqual(len(self.workspace), 2)
+        self.assertIn("Alpha", self.workspace)
+        self.assertIs(self.workspace.get_list("Beta"), self.beta)
+        with self.assertRaises(ValueError):
+            self.workspace.create_list("Alpha")
+
+    def test_names_interned_across_lists(self):
+        """Test that equal task names in different lists share one string."""
+        self.assertIs(self.alpha.find_task("Deploy").name, self.beta.find_task("Deploy").name)
+        self.assertEqual(self.workspace.get_statistics()['distinct_names'], 3)
+
+        self.alpha.remove_task("Deploy")
+        self.beta.remove_task("Deploy")
+        self.assertEqual(self.workspace.get_statistics()['distinct_names'], 2)
+
+    def test_cross_list_query(self):
+        """Test finding tasks by status and priority across every list."""
+        found = self.workspace.find_tasks(TaskStatus.IN_PROGRESS, 5)
+        self.assertEqual([(name, task.name) for name, task in found],
+                         [("Alpha", "Deploy"), ("Beta", "Deploy")])
+        self.assertEqual(len(self.workspace.find_tasks(priority=5)), 2)
+        self.assertEqual(len(self.workspace.find_tasks("completed")), 1)
+        self.assertEqual(self.workspace.find_tasks("bogus"), [])
+        self.assertEqual(self.workspace.count_tasks(TaskStatus.PENDING), 1)
+        self.assertEqual(self.workspace.count_tasks(priority=3), 1)
+        self.assertEqual(self.workspace.count_tasks(), 4)
+
+    def test_index_follows_changes(self):
+        """Test that status and priority changes move tasks between cells."""
+        deploy = self.alpha.find_task("Deploy")
+        deploy.mark_completed()
+        self.beta.set_priority_by_id(self.beta.find_task("Deploy").task_id, 1)
+
+        self.assertEqual(self.workspace.find_tasks(TaskStatus.IN_PROGRESS), [("Beta", self.beta.find_task("Deploy"))])
+        self.assertEqual(self.workspace.count_tasks(TaskStatus.COMPLETED, 5), 1)
+        self.assert_statistics_match_lists()
+
+    def test_renames_are_interned(self):
+        """Test that renaming a task re-interns its name and releases the old one."""
+        self.alpha.find_task("Write docs").rename("Review")
+        self.assertIs(self.alpha.find_task("Review").name, self.beta.find_task("Review").name)
+        self.assertEqual(self.workspace.get_statistics()['distinct_names'], 2)
+
+        self.beta.find_task("Review").rename("Publish")
+        self.alpha.find_task("Review").rename("Publish")
+        self.assertEqual(self.workspace.get_statistics()['distinct_names'], 2)
+        self.alpha.remove_task("Publish")
+        self.beta.remove_task("Publish")
+        self.assertEqual(self.workspace.get_statistics()['distinct_names'], 1)
+
+    def test_statistics_follow_bulk_operations(self):
+        """Test statistics after imports, clears and removals."""
+        self.alpha.import_from_list([{'name': "Deploy", 'status': "completed", 'priority': 4}])
+        self.beta.import_from_list(self.beta.export_to_list(), trusted=True)
+        self.alpha.clear_completed_tasks()
+        self.beta.remove_task("Review")
+        self.assert_statistics_match_lists()
+        self.assertEqual(self.workspace.get_statistics()['lists'], 2)
+
+    def test_add_and_remove_existing_list(self):
+        """Test adding a populated list and detaching it again."""
+        gamma = ToDoList("Gamma")
+        gamma.add_task("Deploy", "cancelled", 1)
+        self.workspace.add_list(gamma)
+        self.assertIs(gamma.find_task("Deploy").name, self.alpha.find_task("Deploy").name)
+        self.assertEqual(self.workspace.count_tasks(TaskStatus.CANCELLED), 1)
+
+        self.assertIs(self.workspace.remove_list("Gamma"), gamma)
+        gamma.add_task("Later")
+        self.assertEqual(self.workspace.count_tasks(), 4)
+        self.assertIsNone(self.workspace.remove_list("Gamma"))
+        self.assert_statistics_match_lists()
+
+
+if __name__ == '__main__':
+    unittest.main()
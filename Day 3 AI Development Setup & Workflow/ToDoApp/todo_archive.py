@@ -0,0 +1,317 @@
+"""
+Cold-Storage Archive for the Refactored ToDo Application
+
+This module moves finished tasks (completed or cancelled) that have not
+changed for a while out of a ToDoList and into an append-only archive file,
+so scans of the list only touch the tasks that are still in play.  Unlike
+clear_completed_tasks(), nothing is lost: each sweep appends the archived
+tasks' export records as compressed frames (zlib or lzma), and the tasks
+can still be looked up by ID, listed and counted.
+
+The file starts with a magic string and then holds one frame per batch of
+tasks:
+
+    codec (1 byte) | payload length (4 bytes, little endian) | payload
+
+where the payload is a compressed JSON array of export_to_list() records.
+Only compact bookkeeping stays in memory: the status x priority counts, the
+archived IDs with the frame holding each (two arrays of machine integers)
+and the offset of every frame.  Queries that need the tasks themselves
+decompress frames on demand.
+
+While an archive is attached, ``include_archived=True`` makes the list's
+get_statistics(), cross_tab() and get_task_by_id() take archived tasks into
+account.
+"""
+
+from __future__ import annotations
+from array import array
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from operator import itemgetter
+from typing import Dict, Iterator, List, Optional, Tuple
+import json
+import lzma
+import os
+import struct
+import zlib
+
+from todo_refactored import (CrossTab, Task, TaskStatus, ToDoList, _STATUS_BY_VALUE,
+                             _TIME_BUCKETS, _gc_paused, _parse_timestamp,
+                             _statistics_from_cells, _task_record)
+
+
+MAGIC = b"TODOARC1"
+# Codec name -> (ID stored in each frame header, compress, decompress)
+CODECS = {
+    'zlib': (1, zlib.compress, zlib.decompress),
+    'lzma': (2, lzma.compress, lzma.decompress),
+}
+_DECOMPRESS = {codec_id: decompress for codec_id, _, decompress in CODECS.values()}
+_FRAME = struct.Struct("<BI")
+_FINISHED = (TaskStatus.COMPLETED, TaskStatus.CANCELLED)
+
+
+def _record_task(record: dict) -> Task:
+    """Build a detached Task from an export record."""
+    return Task(record['name'], _STATUS_BY_VALUE[record['status']],
+                _parse_timestamp(record['created_at']), _parse_timestamp(record['updated_at']),
+                record['priority'], record['id'], _parse_timestamp(record.get('due_at')),
+                record.get('tags') or ())
+
+
+class Archive:
+    """
+    Append-only, compressed cold storage for a ToDoList's finished tasks.
+
+    Archived tasks never change, so every count over them is computed once:
+    status x priority counts are kept up to date by sweep(), and
+    time-bucketed counts only decompress the frames written since the last
+    query for that bucket size.
+    """
+
+    def __init__(self, todo_list: ToDoList, path: str, max_age: timedelta = timedelta(days=30),
+                 codec: str = 'zlib', frame_size: int = 10_000):
+        """
+        Open (or create) an archive file and attach it to a list.
+
+        Args:
+            todo_list: The list whose finished tasks are archived
+            path: The archive file; an existing archive is reopened and
+                appended to, and a frame cut short by a crash is dropped
+            max_age: How long a finished task must have gone unchanged
+                (by updated_at) before sweep() archives it
+            codec: 'zlib' (faster) or 'lzma' (smaller) for new frames;
+                frames written with either codec can be read
+            frame_size: Maximum tasks per frame; looking up one archived
+                task decompresses one frame
+
+        Raises:
+            ValueError: If the codec or frame_size is invalid, the file is
+                not an archive, or the list already has an archive
+        """
+        if codec not in CODECS:
+            raise ValueError(f"Unknown codec: {codec!r}. Must be one of {sorted(CODECS)}")
+        if frame_size < 1:
+            raise ValueError("frame_size must be at least 1")
+        if todo_list._archive is not None:
+            raise ValueError(f"{todo_list.name!r} already has an archive")
+        self.todo_list = todo_list
+        self.path = path
+        self.max_age = max_age
+        self.codec = codec
+        self.frame_size = frame_size
+        self.cells: Dict[Tuple[TaskStatus, int], int] = {}
+        self._frames: List[Tuple[int, int, int]] = []
+        self._ids = array('q')
+        self._frame_of = array('l')
+        self._buckets: Dict[str, Tuple[int, Dict[tuple, int]]] = {}
+        self._decoded: Optional[Tuple[int, Dict[int, dict]]] = None
+        self._open()
+        if self._ids and self._ids[-1] > todo_list._task_id_counter:
+            # Never hand out the ID of an archived task again
+            todo_list._task_id_counter = self._ids[-1]
+        todo_list._archive = self
+
+    def __len__(self) -> int:
+        """Return the number of archived tasks."""
+        return len(self._ids)
+
+    def __contains__(self, task_id: int) -> bool:
+        """Return True if a task with this ID is archived."""
+        return self._find(task_id) is not None
+
+    def __iter__(self) -> Iterator[Task]:
+        """Iterate over the archived tasks (as detached copies) in archive order."""
+        for frame in range(len(self._frames)):
+            for record in self._read(frame):
+                yield _record_task(record)
+
+    def _open(self) -> None:
+        """Create the file, or index an existing one and drop a truncated last frame."""
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            with open(self.path, "wb") as handle:
+                handle.write(MAGIC)
+            return
+        with open(self.path, "rb") as handle:
+            if handle.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{self.path} is not a task archive")
+            end = len(MAGIC)
+            entries = []
+            while True:
+                header = handle.read(_FRAME.size)
+                if len(header) < _FRAME.size:
+                    break
+                codec_id, length = _FRAME.unpack(header)
+                payload = handle.read(length)
+                if len(payload) < length or codec_id not in _DECOMPRESS:
+                    break
+                frame = len(self._frames)
+                self._frames.append((codec_id, end + _FRAME.size, length))
+                for record in json.loads(_DECOMPRESS[codec_id](payload)):
+                    entries.append((record['id'], frame))
+                    self._count(record['status'], record['priority'])
+                end += _FRAME.size + length
+        if end < os.path.getsize(self.path):
+            with open(self.path, "r+b") as handle:
+                handle.truncate(end)
+        self._index(entries)
+
+    def _count(self, status: str, priority: int) -> None:
+        """Add one archived task to the status x priority counts."""
+        cell = (_STATUS_BY_VALUE[status], priority)
+        self.cells[cell] = self.cells.get(cell, 0) + 1
+
+    def _index(self, entries: List[Tuple[int, int]]) -> None:
+        """Merge (task ID, frame) pairs into the sorted ID lookup."""
+        if not entries:
+            return
+        entries.sort(key=itemgetter(0))
+        if self._ids and entries[0][0] <= self._ids[-1]:
+            # Older IDs were archived late; rebuild the lookup in ID order
+            entries = sorted([*zip(self._ids, self._frame_of), *entries], key=itemgetter(0))
+            self._ids, self._frame_of = array('q'), array('l')
+        self._ids.extend(task_id for task_id, _ in entries)
+        self._frame_of.extend(frame for _, frame in entries)
+
+    def _find(self, task_id: int) -> Optional[int]:
+        """Return the frame holding an archived task, or None."""
+        position = bisect_left(self._ids, task_id)
+        if position < len(self._ids) and self._ids[position] == task_id:
+            return self._frame_of[position]
+        return None
+
+    def _read(self, frame: int) -> List[dict]:
+        """Decompress one frame's records."""
+        codec_id, offset, length = self._frames[frame]
+        with open(self.path, "rb") as handle:
+            handle.seek(offset)
+            return json.loads(_DECOMPRESS[codec_id](handle.read(length)))
+
+    def due(self, now: Optional[datetime] = None) -> List[Task]:
+        """
+        Return the list's tasks that sweep() would archive.
+
+        Args:
+            now: The current time (datetime.now() if None)
+
+        Returns:
+            Finished tasks whose updated_at is at least max_age before now
+        """
+        cutoff = (now or datetime.now()) - self.max_age
+        return [task for task in self.todo_list
+                if task.status in _FINISHED and task.updated_at <= cutoff]
+
+    def sweep(self, now: Optional[datetime] = None) -> int:
+        """
+        Move every due task from the list into the archive.
+
+        The tasks are written (and synced to disk) before anything else
+        changes: if the write fails, the file is cut back to its old end,
+        the archive's bookkeeping is untouched and the tasks stay in the
+        list.  Removing them emits the usual REMOVE events.  A sweep cannot
+        run inside the list's batch(): the frames are already on disk, so a
+        rollback would bring back tasks the archive still holds.
+
+        Args:
+            now: The current time (datetime.now() if None)
+
+        Returns:
+            Number of tasks archived
+
+        Raises:
+            OSError: If the frames could not be written
+            ValueError: If the list is in a batch
+        """
+        if self.todo_list._batch is not None:
+            raise ValueError(f"Cannot sweep {self.todo_list.name!r} inside a batch")
+        tasks = self.due(now)
+        if not tasks:
+            return 0
+        codec_id, compress, _ = CODECS[self.codec]
+        written: List[Tuple[int, int, List[dict]]] = []
+        start = end = os.path.getsize(self.path)
+        try:
+            with _gc_paused(), open(self.path, "ab") as handle:
+                for first in range(0, len(tasks), self.frame_size):
+                    records = [_task_record(task) for task in tasks[first:first + self.frame_size]]
+                    payload = compress(json.dumps(records, separators=(",", ":")).encode("utf-8"))
+                    handle.write(_FRAME.pack(codec_id, len(payload)))
+                    handle.write(payload)
+                    written.append((end + _FRAME.size, len(payload), records))
+                    end += _FRAME.size + len(payload)
+                handle.flush()
+                os.fsync(handle.fileno())
+        except BaseException:
+            # Leave no frame behind that a reopen would count as archived
+            os.truncate(self.path, start)
+            raise
+        entries = []
+        for offset, length, records in written:
+            frame = len(self._frames)
+            self._frames.append((codec_id, offset, length))
+            for record in records:
+                entries.append((record['id'], frame))
+                self._count(record['status'], record['priority'])
+        self._index(entries)
+        return self.todo_list._discard(tasks)
+
+    def get(self, task_id: int) -> Optional[Task]:
+        """
+        Look up an archived task by ID, decompressing only its frame.
+
+        Args:
+            task_id: The ID the task had in the list
+
+        Returns:
+            A detached copy of the task, or None if it is not archived
+        """
+        frame = self._find(task_id)
+        if frame is None:
+            return None
+        if self._decoded is None or self._decoded[0] != frame:
+            self._decoded = (frame, {record['id']: record for record in self._read(frame)})
+        return _record_task(self._decoded[1][task_id])
+
+    def get_statistics(self) -> dict:
+        """
+        Get statistics over the archived tasks alone, without reading the file.
+
+        Returns:
+            The same dictionary as ToDoList.get_statistics()
+        """
+        return _statistics_from_cells(self.cells)
+
+    def cross_tab(self, time_bucket: Optional[str] = None) -> CrossTab:
+        """
+        Count the archived tasks by status and priority, optionally by creation time.
+
+        Args:
+            time_bucket: 'day', 'week' or 'month' to also split the counts by
+                created_at, as in ToDoList.cross_tab()
+
+        Returns:
+            A CrossTab of the counts
+
+        Raises:
+            ValueError: If time_bucket is not a known bucket size
+        """
+        if time_bucket is None:
+            return CrossTab({(status, priority, None): n
+                             for (status, priority), n in self.cells.items()})
+        bucket_of = _TIME_BUCKETS.get(time_bucket)
+        if bucket_of is None:
+            raise ValueError(f"Unknown time bucket: {time_bucket!r}")
+        counted, cells = self._buckets.get(time_bucket, (0, {}))
+        for frame in range(counted, len(self._frames)):
+            for record in self._read(frame):
+                cell = (_STATUS_BY_VALUE[record['status']], record['priority'],
+                        bucket_of(datetime.fromisoformat(record['created_at'])))
+                cells[cell] = cells.get(cell, 0) + 1
+        self._buckets[time_bucket] = (len(self._frames), cells)
+        return CrossTab(dict(cells))
+
+    def close(self) -> None:
+        """Detach the archive from its list; the file is left in place."""
+        if self.todo_list._archive is self:
+            self.todo_list._archive = None
@@ -0,0 +1,241 @@
+"""
+Background Autosave for the Refactored ToDo Application
+
+This module keeps a ToDoList saved to a JSON-lines log without rewriting the
+whole list on every change.  AutoSave tracks which tasks changed since the
+last write; a background thread waits for a debounce window after the first
+change and then appends one record per dirty task, so a burst of changes
+costs a single small write.  Pending changes are also flushed when the
+interpreter exits.
+
+Each line of the log is one JSON record:
+
+    {"op": "list", "name": ...}          starts a snapshot (first line)
+    {"op": "add", "task": {...}}         task appended to the end of the list
+    {"op": "put", "task": {...}}         task content changed in place
+    {"op": "remove", "id": ...}          task removed
+    {"op": "order", "ids": [...]}        tasks reordered
+
+The log is rewritten as a fresh snapshot once it holds many more records
+than the list has tasks.  load() replays a log into a ToDoList.
+
+The list is only ever read in the thread that changes it: the listener
+copies each changed task's record (and, after a reorder, the task order)
+as the change is reported, so the background writer never looks at a list
+that may be in the middle of a sort or an import.  Compaction rebuilds the
+snapshot from the log itself.
+"""
+
+from __future__ import annotations
+from typing import Dict, List, Optional, Set, Tuple
+import atexit
+import json
+import os
+import threading
+
+from todo_events import ChangeEvent, ChangeKind
+from todo_refactored import ToDoList, _task_record
+
+
+class AutoSave:
+    """
+    Debounced, incremental saving of a ToDoList to a JSON-lines log.
+
+    Changes are recorded, as records ready to write, by the list's
+    listener in the thread that makes them; writes happen on a daemon
+    thread (or on flush()).
+    """
+
+    def __init__(self, todo_list: ToDoList, path: str, debounce: float = 1.0,
+                 compact_ratio: float = 4.0):
+        """
+        Write a snapshot of the list and start saving its changes.
+
+        Args:
+            todo_list: The list to save
+            path: The log file, overwritten with a snapshot of the list
+            debounce: Seconds to wait after a change before writing, so
+                later changes join the same write
+            compact_ratio: Rewrite the log once it holds this many records
+                per task (counting at least 100 tasks)
+
+        Raises:
+            ValueError: If debounce is negative or compact_ratio is below 1
+        """
+        if debounce < 0 or compact_ratio < 1:
+            raise ValueError("debounce must not be negative and compact_ratio must be at least 1")
+        self.todo_list = todo_list
+        self.path = path
+        self.debounce = debounce
+        self.compact_ratio = compact_ratio
+        self.writes = 0
+        self._records = 0
+        self._tasks = 0
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._dirty: Dict[int, list] = {}
+        self._removed: Set[int] = set()
+        self._queued: List[dict] = []
+        self._changed = threading.Event()
+        self._closed = threading.Event()
+        self.compact()
+        todo_list.add_listener(self._on_change)
+        atexit.register(self.flush)
+        self._thread = threading.Thread(target=self._run, name="todo-autosave", daemon=True)
+        self._thread.start()
+
+    @property
+    def dirty(self) -> bool:
+        """True if there are changes not yet written."""
+        return bool(self._dirty or self._removed or self._queued)
+
+    def _on_change(self, event: ChangeEvent) -> None:
+        """Record what a change did, copying the records to write while the list is consistent."""
+        task = event.task
+        with self._lock:
+            if event.kind is ChangeKind.ADD:
+                self._dirty.pop(task.task_id, None)
+                self._dirty[task.task_id] = [_task_record(task), True]
+                self._removed.discard(task.task_id)
+                self._tasks += 1
+            elif event.kind is ChangeKind.UPDATE:
+                entry = self._dirty.get(task.task_id)
+                if entry is None:
+                    self._dirty[task.task_id] = [_task_record(task), False]
+                else:
+                    entry[0] = _task_record(task)
+            elif event.kind is ChangeKind.REMOVE:
+                self._dirty.pop(task.task_id, None)
+                self._removed.add(task.task_id)
+                self._tasks -= 1
+            elif event.kind is ChangeKind.REORDER:
+                # The order covers the tasks as they are now, so the changes
+                # before it must be replayed before it
+                self._queued.extend(self._take())
+                self._queued.append({'op': 'order', 'ids': [task.task_id for task in self.todo_list]})
+        self._changed.set()
+
+    def _take(self) -> List[dict]:
+        """Turn the coalesced removes, adds and puts into records (the lock must be held)."""
+        records: List[dict] = [{'op': 'remove', 'id': task_id} for task_id in self._removed]
+        records.extend({'op': 'add' if added else 'put', 'task': record}
+                       for record, added in self._dirty.values())
+        self._removed = set()
+        self._dirty = {}
+        return records
+
+    def _run(self) -> None:
+        """Wait for changes, let the debounce window pass, then write them."""
+        while not self._closed.is_set():
+            self._changed.wait()
+            if self._closed.wait(self.debounce):
+                break
+            self._changed.clear()
+            self.flush()
+
+    def flush(self) -> bool:
+        """
+        Append the changes made since the last write to the log.
+
+        Returns:
+            True if anything was written
+        """
+        with self._write_lock:
+            with self._lock:
+                if not self.dirty:
+                    return False
+                records, self._queued = self._queued, []
+                records.extend(self._take())
+            with open(self.path, "a", encoding="utf-8") as handle:
+                handle.write("".join(json.dumps(record) + "\n" for record in records))
+            self.writes += 1
+            self._records += len(records)
+            if self._records > self.compact_ratio * max(self._tasks, 100):
+                name, rows = _replay(self.path)
+                self._rewrite(name, rows.values())
+            return True
+
+    def compact(self) -> None:
+        """
+        Rewrite the log as a snapshot of the list, dropping pending changes.
+
+        This reads the list, so call it from the thread that changes it.
+        """
+        with self._write_lock:
+            with self._lock:
+                self._dirty.clear()
+                self._removed.clear()
+                self._queued.clear()
+                self._tasks = len(self.todo_list)
+            self._rewrite(self.todo_list.name, self.todo_list.export_to_list())
+
+    def _rewrite(self, name: str, rows) -> None:
+        """Atomically replace the log with a snapshot (the write lock must be held)."""
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as handle:
+            handle.write(json.dumps({'op': 'list', 'name': name}) + "\n")
+            for row in rows:
+                handle.write(json.dumps({'op': 'add', 'task': row}) + "\n")
+        os.replace(temp_path, self.path)
+        self._records = 0
+
+    def close(self) -> None:
+        """Write pending changes and stop saving."""
+        self.todo_list.remove_listener(self._on_change)
+        self._closed.set()
+        self._changed.set()
+        self._thread.join()
+        self.flush()
+        atexit.unregister(self.flush)
+
+
+def load(path: str, name: Optional[str] = None) -> ToDoList:
+    """
+    Rebuild a ToDoList from an autosave log.
+
+    A last line cut short by a crash is ignored.
+
+    Args:
+        path: The log file
+        name: Name for the list (defaults to the name in the log)
+
+    Returns:
+        The restored list
+
+    Raises:
+        ValueError: If a line other than the last is not valid JSON
+    """
+    logged_name, rows = _replay(path)
+    todo_list = ToDoList(name or logged_name or "My ToDo List")
+    todo_list.import_from_list(rows.values(), trusted=True)
+    return todo_list
+
+
+def _replay(path: str) -> Tuple[Optional[str], Dict[int, dict]]:
+    """Replay an autosave log into the list name and the task records in list order."""
+    name = None
+    rows: Dict[int, dict] = {}
+    with open(path, encoding="utf-8") as handle:
+        lines = handle.read().splitlines()
+    for number, line in enumerate(lines, 1):
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            if number == len(lines):
+                break
+            raise ValueError(f"{path}:{number}: corrupt autosave record")
+        op = record['op']
+        if op == 'list':
+            rows.clear()
+            name = record['name']
+        elif op == 'add':
+            row = record['task']
+            rows.pop(row['id'], None)
+            rows[row['id']] = row
+        elif op == 'put':
+            rows[record['task']['id']] = record['task']
+        elif op == 'remove':
+            rows.pop(record['id'], None)
+        elif op == 'order':
+            rows = {task_id: rows[task_id] for task_id in record['ids']}
+    return name, rows
@@ -0,0 +1,160 @@
+"""
+Burn-Down Time Series for the Refactored ToDo Application
+
+This module keeps per-interval counters for a ToDoList (tasks created,
+completed and cancelled, and tasks still open at the end of the interval),
+updated from the list's change events as they happen.  The counters live in
+fixed-size circular buffers, so charts over the retained window are served
+in O(intervals) without replaying task history.
+"""
+
+from __future__ import annotations
+from typing import Callable, List, Optional
+from dataclasses import dataclass
+import time
+
+from todo_events import ChangeEvent, ChangeKind
+from todo_refactored import TaskStatus, ToDoList
+
+
+# Statuses of tasks that still count towards the burn-down
+_OPEN = frozenset({TaskStatus.PENDING, TaskStatus.IN_PROGRESS})
+
+
+@dataclass(frozen=True)
+class Interval:
+    """
+    Counters for one interval of a burn-down series.
+
+    Attributes:
+        start: Clock time at which the interval starts
+        created: Tasks added to the list during the interval
+        completed: Tasks marked completed during the interval
+        cancelled: Tasks marked cancelled during the interval
+        open: Pending and in-progress tasks at the end of the interval
+            (or now, for the current interval)
+    """
+    start: float
+    created: int
+    completed: int
+    cancelled: int
+    open: int
+
+
+class BurnDown:
+    """
+    Circular per-interval counters following a ToDoList's changes.
+
+    Intervals are ``interval`` seconds long and aligned to multiples of it
+    on the clock.  Only the most recent ``size`` intervals are kept; older
+    ones are overwritten as time moves on.
+    """
+
+    def __init__(self, todo_list: ToDoList, interval: float = 3600.0, size: int = 168,
+                 clock: Callable[[], float] = time.time):
+        """
+        Start counting a list's changes.
+
+        Args:
+            todo_list: The list to follow
+            interval: Length of each interval in seconds
+            size: Number of intervals to keep
+            clock: Returns the current time in seconds (injectable for tests)
+
+        Raises:
+            ValueError: If interval or size is not positive
+        """
+        if interval <= 0 or size < 1:
+            raise ValueError("interval and size must be positive")
+        self.todo_list = todo_list
+        self.interval = interval
+        self.size = size
+        self.clock = clock
+        self.open = todo_list.get_pending_count() + todo_list.get_in_progress_count()
+        self._created = [0] * size
+        self._completed = [0] * size
+        self._cancelled = [0] * size
+        self._open = [self.open] * size
+        self._first = self._current = self._index(clock())
+        todo_list.add_listener(self._on_change)
+
+    def close(self) -> None:
+        """Stop following the list's changes."""
+        self.todo_list.remove_listener(self._on_change)
+
+    def _index(self, moment: float) -> int:
+        """Return the number of the interval containing a clock time."""
+        return int(moment // self.interval)
+
+    def _advance(self) -> int:
+        """Start any intervals that began since the last change; return the current slot."""
+        index = self._index(self.clock())
+        if index > self._current:
+            for skipped in range(max(self._current + 1, index - self.size + 1), index + 1):
+                slot = skipped % self.size
+                self._created[slot] = self._completed[slot] = self._cancelled[slot] = 0
+                self._open[slot] = self.open
+            self._current = index
+        return self._current % self.size
+
+    def _on_change(self, event: ChangeEvent) -> None:
+        """Count a change in the current interval."""
+        if event.kind is ChangeKind.ADD:
+            slot = self._advance()
+            self._created[slot] += 1
+            if event.task.status in _OPEN:
+                self.open += 1
+        elif event.kind is ChangeKind.REMOVE:
+            if event.task.status not in _OPEN:
+                return
+            slot = self._advance()
+            self.open -= 1
+        elif event.kind is ChangeKind.UPDATE and 'status' in event.changes:
+            old, new = event.changes['status']
+            slot = self._advance()
+            if new is TaskStatus.COMPLETED:
+                self._completed[slot] += 1
+            elif new is TaskStatus.CANCELLED:
+                self._cancelled[slot] += 1
+            self.open += (new in _OPEN) - (old in _OPEN)
+        else:
+            return
+        self._open[slot] = self.open
+
+    def series(self, last: Optional[int] = None) -> List[Interval]:
+        """
+        Return the counters for recent intervals, oldest first.
+
+        Args:
+            last: Number of most recent intervals to return (all kept
+                intervals since tracking started if None)
+
+        Returns:
+            One Interval per interval, including the current one
+        """
+        self._advance()
+        count = min(self.size, self._current - self._first + 1)
+        if last is not None:
+            count = max(0, min(count, last))
+        first = self._current - count + 1
+        result = []
+        for index in range(first, self._current + 1):
+            slot = index % self.size
+            result.append(Interval(index * self.interval, self._created[slot],
+                                   self._completed[slot], self._cancelled[slot],
+                                   self._open[slot]))
+        return result
+
+    def throughput(self, last: Optional[int] = None) -> float:
+        """
+        Get the average number of tasks completed per interval.
+
+        Args:
+            last: Number of most recent intervals to average over (all kept
+                intervals if None)
+
+        Returns:
+            Completed tasks per interval (0 if no intervals)
+        """
+        intervals = self.series(last)
+        return (sum(i.completed for i in intervals) / len(intervals)) if intervals else 0
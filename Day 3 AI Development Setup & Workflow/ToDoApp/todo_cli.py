@@ -0,0 +1,353 @@
+"""
+Command-Line Interface for the Refactored ToDo Application
+
+Usage:
+    python todo_cli.py [-f FILE] add NAME [-p PRIORITY] [-s STATUS]
+    python todo_cli.py [-f FILE] list [-s STATUS]
+    python todo_cli.py [-f FILE] done NAME|ID
+    python todo_cli.py [-f FILE] done --id ID
+    python todo_cli.py [-f FILE] stats
+    python todo_cli.py [-f FILE] import PATH
+    python todo_cli.py [-f FILE] export [PATH]
+    python todo_cli.py [-f FILE] -
+
+The list is stored in FILE ($TODO_FILE, or todo.json by default) as the JSON
+written by ToDoList.export_to_list().  The command "-" reads one command per
+line from stdin and runs them all against a single loaded list, saving once
+at the end.  A malformed FILE is reported and left untouched.
+
+Only ``sys`` is imported up front: the ToDo engine, ``json`` and ``shlex``
+are imported by the commands that use them.
+"""
+
+import sys
+
+
+DEFAULT_FILE = "todo.json"
+
+
+class UsageError(Exception):
+    """Raised when a command line cannot be parsed."""
+
+
+def _read_rows(path):
+    """
+    Read a JSON list of task objects, as written by export_to_list().
+
+    Args:
+        path: The file to read
+
+    Returns:
+        The list of task rows
+
+    Raises:
+        OSError: If the file cannot be read
+        ValueError: If the file is not a JSON list of task objects
+    """
+    import json
+
+    try:
+        with open(path, encoding="utf-8") as handle:
+            rows = json.load(handle)
+    except ValueError as e:
+        raise ValueError(f"{path} is not valid JSON: {e}") from None
+    if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+        raise ValueError(f"{path} must hold a JSON list of task objects")
+    return rows
+
+
+class Session:
+    """
+    A task list file, loaded on first use and saved only if it changed.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize a session.
+
+        Args:
+            path: The JSON file holding the task list
+        """
+        self.path = path
+        self.dirty = False
+        self._todo_list = None
+
+    @property
+    def todo_list(self):
+        """The loaded ToDoList (imports the engine and reads the file)."""
+        if self._todo_list is None:
+            self._todo_list = self._load()
+        return self._todo_list
+
+    def _load(self):
+        """
+        Read the task list from disk, or start an empty one.
+
+        The file may have been edited by hand, so every row is validated.
+
+        Raises:
+            ValueError: If the file is not a JSON list of task objects, or
+                any task in it is malformed (the rejected rows are logged)
+        """
+        import logging
+        import todo_refactored
+
+        todo_refactored.logger.setLevel(logging.ERROR)
+        todo_list = todo_refactored.ToDoList("ToDo")
+        try:
+            rows = _read_rows(self.path)
+        except FileNotFoundError:
+            return todo_list
+        rejected = len(rows) - todo_list.import_from_list(rows)
+        if rejected:
+            raise ValueError(f"{self.path} has {rejected} malformed task(s); "
+                             f"fix or remove them and try again")
+        return todo_list
+
+    def save(self) -> None:
+        """Write the task list back atomically if any command changed it."""
+        if not self.dirty:
+            return
+        import json
+        import os
+
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as handle:
+            json.dump(self._todo_list.export_to_list(), handle)
+        os.replace(temp_path, self.path)
+        self.dirty = False
+
+
+def _parse(args, options, positional):
+    """
+    Split command arguments into positionals and options.
+
+    Args:
+        args: The arguments after the command name
+        options: Maps each option flag (e.g. "-p", "--priority") to its key
+        positional: (minimum, maximum) number of positional arguments
+
+    Returns:
+        A (positionals, options) tuple
+
+    Raises:
+        UsageError: If an option is unknown or the positional count is wrong
+    """
+    values = []
+    parsed = {}
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        if arg in options:
+            if i + 1 >= len(args):
+                raise UsageError(f"option {arg} requires a value")
+            parsed[options[arg]] = args[i + 1]
+            i += 2
+            continue
+        if arg.startswith("-") and arg != "-":
+            raise UsageError(f"unknown option {arg}")
+        values.append(arg)
+        i += 1
+    minimum, maximum = positional
+    if not minimum <= len(values) <= maximum:
+        raise UsageError("wrong number of arguments")
+    return values, parsed
+
+
+def cmd_add(session, args):
+    """Add a task: add NAME [-p PRIORITY] [-s STATUS]."""
+    (name,), options = _parse(args, {"-p": "priority", "--priority": "priority",
+                                     "-s": "status", "--status": "status"}, (1, 1))
+    try:
+        priority = int(options.get("priority", 3))
+        task = session.todo_list.add_task(name, options.get("status", "pending"), priority)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    session.dirty = True
+    print(f"Added task {task.task_id}: {task}")
+    return 0
+
+
+def cmd_list(session, args):
+    """List tasks: list [-s STATUS]."""
+    _, options = _parse(args, {"-s": "status", "--status": "status"}, (0, 0))
+    status = options.get("status")
+    tasks = session.todo_list.find_tasks_by_status(status) if status else list(session.todo_list)
+    if not tasks:
+        print(f"No tasks found{' for the specified status' if status else ''}!")
+        return 0
+    for task in tasks:
+        print(f"{task.task_id:4d}. {task}")
+    return 0
+
+
+def cmd_done(session, args):
+    """Mark a task completed: done NAME|ID or done --id ID."""
+    targets, options = _parse(args, {"--id": "id"}, (0, 1))
+    if len(targets) + len(options) != 1:
+        raise UsageError("give either a task NAME or --id ID")
+    todo_list = session.todo_list
+    if options:
+        target = options["id"]
+        if not target.isdigit():
+            raise UsageError(f"invalid task ID {target!r}")
+        task = todo_list.get_task_by_id(int(target))
+    else:
+        # A name is matched first, so a task named "42" is not taken for ID 42
+        (target,) = targets
+        task = todo_list.find_task(target)
+        if task is None and target.isdigit():
+            task = todo_list.get_task_by_id(int(target))
+    if task is None:
+        print(f"Task not found: {target}", file=sys.stderr)
+        return 1
+    task.mark_completed()
+    session.dirty = True
+    print(f"Completed task {task.task_id}: {task.name}")
+    return 0
+
+
+def cmd_stats(session, args):
+    """Show statistics: stats."""
+    _parse(args, {}, (0, 0))
+    stats = session.todo_list.get_statistics()
+    print(f"Total Tasks: {stats['total_tasks']}")
+    print(f"Completed: {stats['completed']} ({stats['completion_rate']:.1f}%)")
+    print(f"Pending: {stats['pending']}")
+    print(f"In Progress: {stats['in_progress']}")
+    print(f"Cancelled: {stats['cancelled']}")
+    for priority, count in stats['priority_distribution'].items():
+        print(f"Priority {priority}: {count}")
+    return 0
+
+
+def cmd_import(session, args):
+    """Import tasks from an exported JSON file: import PATH."""
+    (path,), _ = _parse(args, {}, (1, 1))
+    count = session.todo_list.import_from_list(_read_rows(path))
+    session.dirty = session.dirty or count > 0
+    print(f"Imported {count} tasks from {path}")
+    return 0
+
+
+def cmd_export(session, args):
+    """Export tasks as JSON to a file or stdout: export [PATH]."""
+    paths, _ = _parse(args, {}, (0, 1))
+    import json
+
+    exported = session.todo_list.export_to_list()
+    if paths:
+        with open(paths[0], "w", encoding="utf-8") as handle:
+            json.dump(exported, handle, indent=2)
+        print(f"Exported {len(exported)} tasks to {paths[0]}")
+    else:
+        json.dump(exported, sys.stdout, indent=2)
+        print()
+    return 0
+
+
+COMMANDS = {
+    "add": cmd_add,
+    "list": cmd_list,
+    "done": cmd_done,
+    "stats": cmd_stats,
+    "import": cmd_import,
+    "export": cmd_export,
+}
+
+
+def run_command(session, argv):
+    """
+    Run a single command against a session.
+
+    Args:
+        session: The Session to operate on
+        argv: The command name followed by its arguments
+
+    Returns:
+        The command's exit status
+
+    Raises:
+        UsageError: If the command is unknown or its arguments are invalid
+    """
+    if not argv or argv[0] not in COMMANDS:
+        raise UsageError(f"unknown command {argv[0]!r}" if argv else "missing command")
+    return COMMANDS[argv[0]](session, argv[1:])
+
+
+def run_batch(session, lines):
+    """
+    Run one command per line against a single loaded list.
+
+    Blank lines and lines starting with "#" are skipped.  A failing line is
+    reported on stderr and does not stop the batch.
+
+    Args:
+        session: The Session to operate on
+        lines: An iterable of command lines (e.g. sys.stdin)
+
+    Returns:
+        0 if every command succeeded, 1 otherwise
+    """
+    import shlex
+
+    status = 0
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        try:
+            status |= run_command(session, shlex.split(line))
+        except (UsageError, OSError, ValueError) as e:
+            print(f"line {number}: {e}", file=sys.stderr)
+            status = 1
+    return status
+
+
+def main(argv=None):
+    """
+    Entry point for the command-line tool.
+
+    Args:
+        argv: Arguments excluding the program name (defaults to sys.argv[1:])
+
+    Returns:
+        The process exit status
+    """
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if not argv:
+        print(__doc__.strip(), file=sys.stderr)
+        return 2
+    if argv[0] in ("-h", "--help", "help"):
+        print(__doc__.strip())
+        return 0
+    path = None
+    if argv[0] in ("-f", "--file"):
+        if len(argv) < 2:
+            print("Error: option -f requires a value", file=sys.stderr)
+            return 2
+        path = argv[1]
+        argv = argv[2:]
+    if path is None:
+        import os
+        path = os.environ.get("TODO_FILE", DEFAULT_FILE)
+
+    session = Session(path)
+    try:
+        if argv == ["-"]:
+            status = run_batch(session, sys.stdin)
+        else:
+            status = run_command(session, argv)
+    except UsageError as e:
+        print(f"Error: {e}\n\n{__doc__.strip()}", file=sys.stderr)
+        return 2
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    session.save()
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,195 @@
+"""
+Task Dependencies for the Refactored ToDo Application
+
+This module keeps "A blocks B" edges between the tasks of a ToDoList and the
+set of ready tasks: open tasks whose blockers are all completed or
+cancelled.  Each task's number of unfinished blockers is kept up to date
+from the list's change events, so finishing or reopening a task only
+touches its direct dependents and listing the ready tasks costs O(ready).
+"""
+
+from __future__ import annotations
+from typing import Dict, List, Set
+
+from todo_events import ChangeEvent, ChangeKind
+from todo_refactored import Task, TaskStatus, ToDoList
+
+
+# Statuses of tasks that no longer block their dependents
+_DONE = frozenset({TaskStatus.COMPLETED, TaskStatus.CANCELLED})
+
+
+class DependencyGraph:
+    """
+    Blocking edges between a ToDoList's tasks, with an incrementally kept ready set.
+
+    Edges are keyed by task ID and are dropped when either task leaves the
+    list.  Adding an edge that would close a cycle raises ValueError.
+    Events from a ToDoList.batch() arrive after the whole batch applied, so
+    an event may mention a dependent that a later event removes; such
+    dependents are only counted, never looked up.
+    """
+
+    def __init__(self, todo_list: ToDoList):
+        """
+        Start tracking dependencies for a list.
+
+        Args:
+            todo_list: The list whose tasks the edges connect
+        """
+        self.todo_list = todo_list
+        self._blocks: Dict[int, Set[int]] = {}
+        self._blocked_by: Dict[int, Set[int]] = {}
+        self._waiting: Dict[int, int] = {}
+        self._ready: Dict[int, Task] = {
+            task.task_id: task for task in todo_list if task.status not in _DONE
+        }
+        todo_list.add_listener(self._on_change)
+
+    def close(self) -> None:
+        """Stop following the list's changes."""
+        self.todo_list.remove_listener(self._on_change)
+
+    def _task(self, task_id: int) -> Task:
+        """Look up a task of the list by ID."""
+        task = self.todo_list.get_task_by_id(task_id)
+        if task is None:
+            raise KeyError(f"No task with ID {task_id}")
+        return task
+
+    def add_dependency(self, blocker_id: int, blocked_id: int) -> None:
+        """
+        Record that one task blocks another.
+
+        Args:
+            blocker_id: ID of the task that must be finished first
+            blocked_id: ID of the task that waits for it
+
+        Raises:
+            KeyError: If either task is not in the list
+            ValueError: If the edge would create a cycle
+        """
+        blocker = self._task(blocker_id)
+        blocked = self._task(blocked_id)
+        if blocked_id in self._blocks.get(blocker_id, ()):
+            return
+        if blocker_id == blocked_id or self._reaches(blocked_id, blocker_id):
+            raise ValueError(f"Task {blocker_id} blocking task {blocked_id} would create a cycle")
+        self._blocks.setdefault(blocker_id, set()).add(blocked_id)
+        self._blocked_by.setdefault(blocked_id, set()).add(blocker_id)
+        if blocker.status not in _DONE:
+            self._wait(blocked.task_id)
+
+    def remove_dependency(self, blocker_id: int, blocked_id: int) -> bool:
+        """
+        Remove a blocking edge.
+
+        Args:
+            blocker_id: ID of the blocking task
+            blocked_id: ID of the blocked task
+
+        Returns:
+            True if the edge existed
+        """
+        dependents = self._blocks.get(blocker_id)
+        if dependents is None or blocked_id not in dependents:
+            return False
+        self._unlink(blocker_id, blocked_id)
+        if self._task(blocker_id).status not in _DONE:
+            self._unwait(blocked_id)
+        return True
+
+    def _unlink(self, blocker_id: int, blocked_id: int) -> None:
+        """Delete an edge from both adjacency maps."""
+        for index, key, value in ((self._blocks, blocker_id, blocked_id),
+                                  (self._blocked_by, blocked_id, blocker_id)):
+            neighbours = index[key]
+            neighbours.discard(value)
+            if not neighbours:
+                del index[key]
+
+    def _reaches(self, start_id: int, target_id: int) -> bool:
+        """Check whether target_id can be reached from start_id along blocking edges."""
+        stack = [start_id]
+        seen = {start_id}
+        while stack:
+            for dependent in self._blocks.get(stack.pop(), ()):
+                if dependent == target_id:
+                    return True
+                if dependent not in seen:
+                    seen.add(dependent)
+                    stack.append(dependent)
+        return False
+
+    def _wait(self, task_id: int) -> None:
+        """Count one more unfinished blocker for a task."""
+        self._waiting[task_id] = self._waiting.get(task_id, 0) + 1
+        self._ready.pop(task_id, None)
+
+    def _unwait(self, task_id: int) -> None:
+        """Count one fewer unfinished blocker for a task, readying it at zero."""
+        waiting = self._waiting[task_id] - 1
+        if waiting:
+            self._waiting[task_id] = waiting
+            return
+        del self._waiting[task_id]
+        task = self.todo_list.get_task_by_id(task_id)
+        # A task already gone is dropped by its own (later) REMOVE event
+        if task is not None and task.status not in _DONE:
+            self._ready[task_id] = task
+
+    def _on_change(self, event: ChangeEvent) -> None:
+        """Keep blocker counts and the ready set in step with the list."""
+        task = event.task
+        if event.kind is ChangeKind.ADD:
+            if task.status not in _DONE:
+                self._ready[task.task_id] = task
+        elif event.kind is ChangeKind.REMOVE:
+            self._forget(task)
+        elif event.kind is ChangeKind.UPDATE and 'status' in event.changes:
+            old, new = event.changes['status']
+            if (old in _DONE) == (new in _DONE):
+                return
+            dependents = list(self._blocks.get(task.task_id, ()))
+            if new in _DONE:
+                self._ready.pop(task.task_id, None)
+                for dependent in dependents:
+                    self._unwait(dependent)
+            else:
+                if task.task_id not in self._waiting:
+                    self._ready[task.task_id] = task
+                for dependent in dependents:
+                    self._wait(dependent)
+
+    def _forget(self, task: Task) -> None:
+        """Drop a removed task and every edge touching it."""
+        task_id = task.task_id
+        self._ready.pop(task_id, None)
+        self._waiting.pop(task_id, None)
+        for blocker_id in list(self._blocked_by.get(task_id, ())):
+            self._unlink(blocker_id, task_id)
+        for dependent_id in list(self._blocks.get(task_id, ())):
+            self._unlink(task_id, dependent_id)
+            if task.status not in _DONE:
+                self._unwait(dependent_id)
+
+    def ready(self) -> List[Task]:
+        """
+        Get the open tasks that are not waiting for any unfinished blocker.
+
+        Returns:
+            Ready tasks, in the order they became ready
+        """
+        return list(self._ready.values())
+
+    def is_ready(self, task_id: int) -> bool:
+        """Check if a task is open and not blocked."""
+        return task_id in self._ready
+
+    def blockers(self, task_id: int) -> List[Task]:
+        """Get the tasks that directly block a task, finished or not."""
+        return [self._task(blocker_id) for blocker_id in self._blocked_by.get(task_id, ())]
+
+    def dependents(self, task_id: int) -> List[Task]:
+        """Get the tasks directly blocked by a task."""
+        return [self._task(dependent_id) for dependent_id in self._blocks.get(task_id, ())]
@@ -0,0 +1,540 @@
+"""
+Disk-Backed Lists for the Refactored ToDo Application
+
+This module provides DiskToDoList, a list whose tasks live in an SQLite
+database instead of in memory.  Task objects are built only when a task is
+accessed, and the most recently used ones are kept in a bounded LRU cache.
+Tasks are ordinary Task objects owned by the list, so changing one (for
+example with mark_completed()) marks its cache entry dirty; dirty entries
+are written back when they are evicted, before any query that filters on
+the database, and on flush().  No more than one Task object exists per task
+at a time, even after eviction, as long as the caller holds a reference.
+
+DiskToDoList offers the ToDoList methods that make sense without holding
+every task: adding, removing and finding tasks, the status and priority
+views, counts and statistics, import and export.  It does not support
+listeners, index-based access or reordering.
+"""
+
+from __future__ import annotations
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+import json
+import logging
+import sqlite3
+import weakref
+
+from todo_refactored import (Task, TaskStatus, _NO_TAGS, _STATUS_BY_VALUE, _gc_paused,
+                             _parse_timestamp, _statistics_from_cells)
+
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    status TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    due_at TEXT,
+    tags TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    name_key TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS tasks_position ON tasks (position);
+CREATE INDEX IF NOT EXISTS tasks_name ON tasks (name_key, position);
+CREATE INDEX IF NOT EXISTS tasks_status ON tasks (status, position);
+"""
+_COLUMNS = "id, name, status, priority, created_at, updated_at, due_at, tags, position"
+_INSERT = ("INSERT INTO tasks (id, name, status, priority, created_at, updated_at, due_at, tags,"
+           " position, name_key) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)")
+_UPDATE = ("UPDATE tasks SET name = ?, status = ?, priority = ?, created_at = ?, updated_at = ?,"
+           " due_at = ?, tags = ?, name_key = ? WHERE id = ?")
+# Rows fetched per query while iterating
+_BATCH = 1000
+
+
+@dataclass(frozen=True)
+class CacheInfo:
+    """
+    Counters of a DiskToDoList's task cache.
+
+    Attributes:
+        hits: Accesses served by an existing Task object
+        misses: Accesses that built a Task from its database row
+        evictions: Tasks dropped from the cache to make room
+        write_backs: Evicted tasks whose changes were written to the database
+        size: Tasks currently cached
+        capacity: Maximum number of cached tasks
+    """
+    hits: int
+    misses: int
+    evictions: int
+    write_backs: int
+    size: int
+    capacity: int
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of accesses that were hits (0 before any access)."""
+        accesses = self.hits + self.misses
+        return self.hits / accesses if accesses else 0.0
+
+
+def _values(task: Task) -> Tuple:
+    """Return a task's column values in _UPDATE order."""
+    return (task.name, task.status.value, task.priority, task.created_at.isoformat(),
+            task.updated_at.isoformat(), task.due_at.isoformat() if task.due_at else None,
+            json.dumps(sorted(task.tags)) if task.tags else "[]", task.name.lower(),
+            task.task_id)
+
+
+class DiskToDoList:
+    """
+    A todo list stored in SQLite, with an LRU cache of materialized tasks.
+
+    Changes are written to the database within a transaction that flush()
+    and close() commit.
+    """
+
+    def __init__(self, path: str, name: str = "My ToDo List", cache_size: int = 10_000):
+        """
+        Open (or create) a disk-backed list.
+
+        Args:
+            path: The SQLite database file
+            name: Name of the list when the database is new; an existing
+                database keeps its stored name
+            cache_size: Maximum number of Task objects kept in the cache
+
+        Raises:
+            ValueError: If cache_size is less than 1
+        """
+        if cache_size < 1:
+            raise ValueError("cache_size must be at least 1")
+        self.path = path
+        self.cache_size = cache_size
+        self._db = sqlite3.connect(path)
+        self._db.executescript(_SCHEMA)
+        stored = self._db.execute("SELECT value FROM meta WHERE key = 'name'").fetchone()
+        if stored is None:
+            self._db.execute("INSERT INTO meta VALUES ('name', ?)", (name,))
+            self._db.commit()
+        self.name = stored[0] if stored else name
+        self._task_id_counter, self._next_position = self._db.execute(
+            "SELECT COALESCE(MAX(id), 0), COALESCE(MAX(position), -1) + 1 FROM tasks").fetchone()
+        self._cells: Dict[Tuple[TaskStatus, int], int] = {
+            (_STATUS_BY_VALUE[status], priority): n for status, priority, n in self._db.execute(
+                "SELECT status, priority, COUNT(*) FROM tasks GROUP BY status, priority")}
+        self._cache: OrderedDict[int, Task] = OrderedDict()
+        self._objects: weakref.WeakValueDictionary[int, Task] = weakref.WeakValueDictionary()
+        self._dirty: Set[int] = set()
+        self._hits = self._misses = self._evictions = self._write_backs = 0
+
+    def __len__(self) -> int:
+        """Return the number of tasks in the list."""
+        return sum(self._cells.values())
+
+    def __iter__(self) -> Iterator[Task]:
+        """Iterate over the tasks in list order, materializing them as needed."""
+        return self._select()
+
+    def __str__(self) -> str:
+        """String representation of the todo list."""
+        return f"{self.name} ({len(self)} tasks)"
+
+    def _row_task(self, row: Tuple) -> Task:
+        """Build an owned Task from a database row."""
+        task_id, name, status, priority, created, updated, due, tags, _ = row
+        created_at = datetime.fromisoformat(created)
+        task = Task(name, _STATUS_BY_VALUE[status], created_at,
+                    created_at if updated == created else datetime.fromisoformat(updated),
+                    priority, task_id, datetime.fromisoformat(due) if due else None,
+                    json.loads(tags) if tags != "[]" else _NO_TAGS)
+        task._owner = self
+        return task
+
+    def _materialize(self, row: Tuple) -> Task:
+        """Return the Task object for a row, reusing a live one if there is one."""
+        task_id = row[0]
+        task = self._cache.get(task_id)
+        if task is not None:
+            self._cache.move_to_end(task_id)
+            self._hits += 1
+            return task
+        task = self._objects.get(task_id)
+        if task is not None:
+            self._hits += 1
+        else:
+            self._misses += 1
+            task = self._objects[task_id] = self._row_task(row)
+        self._admit(task)
+        return task
+
+    def _admit(self, task: Task) -> None:
+        """Cache a task as most recently used, evicting the least recently used one."""
+        cache = self._cache
+        cache[task.task_id] = task
+        if len(cache) > self.cache_size:
+            task_id, evicted = cache.popitem(last=False)
+            self._evictions += 1
+            if task_id in self._dirty:
+                self._dirty.discard(task_id)
+                self._db.execute(_UPDATE, _values(evicted))
+                self._write_backs += 1
+
+    def _write_back(self) -> None:
+        """Write every dirty cached task to the database."""
+        if self._dirty:
+            self._db.executemany(_UPDATE, [_values(self._cache[task_id])
+                                           for task_id in self._dirty])
+            self._dirty.clear()
+
+    def _forget(self, task: Task) -> None:
+        """Release a task that has left the list."""
+        self._cache.pop(task.task_id, None)
+        self._objects.pop(task.task_id, None)
+        self._dirty.discard(task.task_id)
+        self._uncount((task.status, task.priority))
+        task._owner = None
+
+    def _uncount(self, cell: Tuple[TaskStatus, int]) -> None:
+        """Decrement a status x priority cell, dropping it when it empties."""
+        n = self._cells[cell] - 1
+        if n:
+            self._cells[cell] = n
+        else:
+            del self._cells[cell]
+
+    def _task_changing(self, task: Task) -> None:
+        """Called by an owned task just before it changes; nothing to save here."""
+
+    def _task_changed(self, task: Task, changes: dict) -> None:
+        """Called by an owned task after one of its fields changed."""
+        if 'status' in changes or 'priority' in changes:
+            self._uncount((changes['status'][0] if 'status' in changes else task.status,
+                           changes['priority'][0] if 'priority' in changes else task.priority))
+            cell = (task.status, task.priority)
+            self._cells[cell] = self._cells.get(cell, 0) + 1
+        if task.task_id in self._cache:
+            self._cache.move_to_end(task.task_id)
+        else:
+            self._admit(task)
+        self._dirty.add(task.task_id)
+
+    def _select(self, where: str = "1", params: Tuple = ()) -> Iterator[Task]:
+        """Iterate over the tasks matching an SQL condition, in list order."""
+        position = -1
+        while True:
+            self._write_back()
+            rows = self._db.execute(
+                f"SELECT {_COLUMNS} FROM tasks WHERE {where} AND position > ?"
+                f" ORDER BY position LIMIT {_BATCH}", (*params, position)).fetchall()
+            for row in rows:
+                yield self._materialize(row)
+            if len(rows) < _BATCH:
+                return
+            position = rows[-1][-1]
+
+    def _insert(self, task: Task) -> None:
+        """Store a new task at the end of the list, keeping its ID if it is free."""
+        values = _values(task)
+        columns = (*values[:7], self._next_position, values[7])
+        task_id = task.task_id
+        if task_id is not None:
+            try:
+                self._db.execute(_INSERT, (task_id, *columns))
+            except sqlite3.IntegrityError:
+                task_id = None
+            else:
+                self._task_id_counter = max(self._task_id_counter, task_id)
+        if task_id is None:
+            self._task_id_counter += 1
+            task_id = task.task_id = self._task_id_counter
+            self._db.execute(_INSERT, (task_id, *columns))
+        self._next_position += 1
+        task._owner = self
+        self._objects[task.task_id] = task
+        self._admit(task)
+        cell = (task.status, task.priority)
+        self._cells[cell] = self._cells.get(cell, 0) + 1
+
+    def add_task(self, name: str, status: Union[TaskStatus, str] = TaskStatus.PENDING,
+                 priority: int = 3, due_at: Optional[datetime] = None,
+                 tags: Iterable[str] = ()) -> Task:
+        """
+        Add a new task to the list.
+
+        Args:
+            name: The name/description of the task
+            status: The status of the task
+            priority: Priority level (1-5)
+            due_at: Optional deadline for the task
+            tags: Tags to attach to the task
+
+        Returns:
+            The created Task object
+
+        Raises:
+            ValueError: If name or a tag is empty, or status or priority is invalid
+        """
+        if not name or not name.strip():
+            raise ValueError("Task name cannot be empty")
+        if isinstance(status, str):
+            try:
+                status = TaskStatus(status.lower())
+            except ValueError:
+                raise ValueError(f"Invalid status: {status}. Must be one of {[s.value for s in TaskStatus]}")
+        task = Task(name.strip(), status, priority=priority, due_at=due_at, tags=tags)
+        self._insert(task)
+        logger.info(f"Added task: {task.name}")
+        return task
+
+    def get_task_by_id(self, task_id: int) -> Optional[Task]:
+        """
+        Get a task by its stable ID.
+
+        Args:
+            task_id: The ID assigned when the task was added or imported
+
+        Returns:
+            The Task object if found, None otherwise
+        """
+        task = self._cache.get(task_id)
+        if task is not None:
+            self._cache.move_to_end(task_id)
+            self._hits += 1
+            return task
+        row = self._db.execute(f"SELECT {_COLUMNS} FROM tasks WHERE id = ?", (task_id,)).fetchone()
+        return self._materialize(row) if row else None
+
+    def find_task(self, name: str) -> Optional[Task]:
+        """
+        Find a task by name (case-insensitive) using the name index.
+
+        Args:
+            name: The name of the task to find
+
+        Returns:
+            The first Task object with that name, None otherwise
+        """
+        return next(self._select("name_key = ?", (name.lower(),)), None)
+
+    def find_tasks_by_status(self, status: Union[TaskStatus, str]) -> List[Task]:
+        """
+        Find all tasks with a specific status using the status index.
+
+        Args:
+            status: The status to filter by
+
+        Returns:
+            List of tasks with the specified status
+        """
+        if isinstance(status, str):
+            status = _STATUS_BY_VALUE.get(status.lower())
+            if status is None:
+                return []
+        return list(self._select("status = ?", (status.value,)))
+
+    def get_tasks_by_priority(self, priority: int) -> List[Task]:
+        """
+        Get all tasks with a specific priority.
+
+        Args:
+            priority: The priority level (1-5)
+
+        Returns:
+            List of tasks with the specified priority
+        """
+        return list(self._select("priority = ?", (priority,)))
+
+    def mark_task_by_id(self, task_id: int, status: Union[TaskStatus, str]) -> bool:
+        """
+        Set the status of a task identified by its stable ID.
+
+        Args:
+            task_id: The ID of the task to update
+            status: The new status
+
+        Returns:
+            True if task was found and marked, False otherwise
+
+        Raises:
+            ValueError: If status is not a valid TaskStatus
+        """
+        if isinstance(status, str):
+            try:
+                status = TaskStatus(status.lower())
+            except ValueError:
+                raise ValueError(f"Invalid status: {status}. Must be one of {[s.value for s in TaskStatus]}")
+        task = self.get_task_by_id(task_id)
+        if task is None:
+            logger.warning(f"Task ID not found for status change: {task_id}")
+            return False
+        task._update_status(status)
+        return True
+
+    def remove_task_by_id(self, task_id: int) -> Optional[Task]:
+        """
+        Remove a task by its stable ID.
+
+        Args:
+            task_id: The ID of the task to remove
+
+        Returns:
+            The removed Task object, or None if no task has that ID
+        """
+        task = self.get_task_by_id(task_id)
+        if task is None:
+            logger.warning(f"Task ID not found: {task_id}")
+            return None
+        self._db.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+        self._forget(task)
+        logger.info(f"Removed task by ID {task_id}: {task.name}")
+        return task
+
+    def remove_task(self, name: str) -> bool:
+        """
+        Remove a task from the list by name (case-insensitive).
+
+        Args:
+            name: The name of the task to remove
+
+        Returns:
+            True if task was found and removed, False otherwise
+        """
+        task = self.find_task(name)
+        if task is None:
+            logger.warning(f"Task not found: {name}")
+            return False
+        return self.remove_task_by_id(task.task_id) is not None
+
+    def clear_completed_tasks(self) -> int:
+        """
+        Remove all completed tasks from the list without loading them.
+
+        Returns:
+            Number of tasks removed
+        """
+        self._write_back()
+        for task in list(self._objects.values()):
+            if task.status is TaskStatus.COMPLETED:
+                self._forget(task)
+        removed_count = self._db.execute(
+            "DELETE FROM tasks WHERE status = ?", (TaskStatus.COMPLETED.value,)).rowcount
+        for cell in [cell for cell in self._cells if cell[0] is TaskStatus.COMPLETED]:
+            del self._cells[cell]
+        logger.info(f"Cleared {removed_count} completed tasks")
+        return removed_count
+
+    def get_task_count(self) -> int:
+        """Get the total number of tasks."""
+        return len(self)
+
+    def _status_count(self, status: TaskStatus) -> int:
+        """Count tasks with a status from the status x priority cells."""
+        return sum(n for (cell_status, _), n in self._cells.items() if cell_status is status)
+
+    def get_completed_count(self) -> int:
+        """Get the number of completed tasks."""
+        return self._status_count(TaskStatus.COMPLETED)
+
+    def get_pending_count(self) -> int:
+        """Get the number of pending tasks."""
+        return self._status_count(TaskStatus.PENDING)
+
+    def get_in_progress_count(self) -> int:
+        """Get the number of in-progress tasks."""
+        return self._status_count(TaskStatus.IN_PROGRESS)
+
+    def get_cancelled_count(self) -> int:
+        """Get the number of cancelled tasks."""
+        return self._status_count(TaskStatus.CANCELLED)
+
+    def get_statistics(self) -> dict:
+        """
+        Get comprehensive statistics about the todo list.
+
+        Returns:
+            The same dictionary as ToDoList.get_statistics()
+        """
+        return _statistics_from_cells(self._cells)
+
+    def export_to_list(self) -> List[dict]:
+        """
+        Export tasks in the ToDoList.export_to_list() format.
+
+        Records are built straight from the database rows, so exporting
+        does not go through (or disturb) the task cache.
+
+        Returns:
+            List of task dictionaries
+        """
+        self._write_back()
+        with _gc_paused():
+            return [{'id': task_id, 'name': name, 'status': status, 'priority': priority,
+                     'created_at': created, 'updated_at': updated, 'due_at': due,
+                     'tags': json.loads(tags)}
+                    for task_id, name, status, priority, created, updated, due, tags, _
+                    in self._db.execute(f"SELECT {_COLUMNS} FROM tasks ORDER BY position")]
+
+    def import_from_list(self, task_data: Iterable[dict]) -> int:
+        """
+        Append tasks from a list of dictionaries, as ToDoList.import_from_list() does.
+
+        A row's ID is kept if it is free; malformed rows are logged and skipped.
+
+        Args:
+            task_data: List of task dictionaries
+
+        Returns:
+            Number of tasks imported
+        """
+        imported_count = 0
+        with _gc_paused():
+            for data in task_data:
+                try:
+                    status = data.get('status', 'pending')
+                    if not isinstance(status, TaskStatus):
+                        status = _STATUS_BY_VALUE.get(status)
+                        if status is None:
+                            raise ValueError(f"{data['status']!r} is not a valid TaskStatus")
+                    task = Task(data['name'], status, _parse_timestamp(data.get('created_at')),
+                                _parse_timestamp(data.get('updated_at')), data.get('priority', 3),
+                                data.get('id'), _parse_timestamp(data.get('due_at')),
+                                data.get('tags') or _NO_TAGS)
+                except (KeyError, TypeError, ValueError) as e:
+                    logger.error(f"Failed to import task: {e}")
+                    continue
+                self._insert(task)
+                imported_count += 1
+        logger.info(f"Imported {imported_count} tasks")
+        return imported_count
+
+    def cache_info(self) -> CacheInfo:
+        """
+        Report how well the task cache is working.
+
+        Returns:
+            A CacheInfo with the hit, miss, eviction and write-back counts
+        """
+        return CacheInfo(self._hits, self._misses, self._evictions, self._write_backs,
+                         len(self._cache), self.cache_size)
+
+    def flush(self) -> None:
+        """Write back every dirty task and commit."""
+        self._write_back()
+        self._db.commit()
+
+    def close(self) -> None:
+        """Flush, release the cached tasks and close the database."""
+        self.flush()
+        for task in list(self._objects.values()):
+            task._owner = None
+        self._cache.clear()
+        self._db.close()
@@ -0,0 +1,226 @@
+"""
+Change Feed for the Refactored ToDo Application
+
+This module provides the change events emitted by ``todo_refactored.ToDoList``
+and the ``Subscription`` consumer used to mirror a list without re-exporting
+and diffing it.  A subscription keeps a bounded per-subscriber queue, can
+coalesce repeated updates to the same task, and supports both blocking and
+``async for`` consumption.
+"""
+
+from __future__ import annotations
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple, TYPE_CHECKING
+from enum import Enum
+from dataclasses import dataclass, field
+from collections import deque
+import queue
+import threading
+import time
+
+if TYPE_CHECKING:
+    from todo_refactored import Task, ToDoList
+
+
+class ChangeKind(Enum):
+    """Enumeration of the kinds of change a ToDoList can report."""
+    ADD = "add"
+    REMOVE = "remove"
+    UPDATE = "update"
+    REORDER = "reorder"
+
+
+@dataclass
+class ChangeEvent:
+    """
+    A single change made to a ToDoList.
+
+    Attributes:
+        kind: What happened to the list
+        task: The affected task (None for REORDER)
+        changes: For UPDATE events, maps field name to (old, new) values
+        timestamp: Monotonic time at which the change was emitted
+    """
+    kind: ChangeKind
+    task: Optional[Task] = None
+    changes: Dict[str, Tuple[Any, Any]] = field(default_factory=dict)
+    timestamp: float = field(default_factory=time.monotonic)
+
+    @property
+    def key(self) -> int:
+        """Identity of the affected task, used for coalescing."""
+        return id(self.task)
+
+
+Listener = Callable[[ChangeEvent], None]
+
+
+def _wake(future) -> None:
+    """Resolve an asyncio waiter future if nobody else did."""
+    if not future.done():
+        future.set_result(None)
+
+
+class Subscription:
+    """
+    A bounded, optionally coalescing queue of change events.
+
+    Subscriptions are created with ``ToDoList.subscribe()``.  When the queue
+    is full the oldest event is dropped and ``dropped`` is incremented, so a
+    mirror can detect that it must resynchronise from a full export.
+    """
+
+    def __init__(self, source: ToDoList, maxsize: int = 1024,
+                 coalesce_window: float = 0.0):
+        """
+        Initialize a subscription.
+
+        Args:
+            source: The todo list being observed
+            maxsize: Maximum number of undelivered events to keep
+            coalesce_window: Seconds during which repeated updates to the
+                same task are merged into the first undelivered event
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self._source = source
+        self.maxsize = maxsize
+        self.coalesce_window = coalesce_window
+        self._queue: Deque[ChangeEvent] = deque()
+        self._pending: Dict[int, ChangeEvent] = {}
+        self._cond = threading.Condition()
+        self._waiters: List[Tuple[Any, Any]] = []
+        self.closed = False
+        self.dropped = 0
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        """Return the number of undelivered events."""
+        return len(self._queue)
+
+    def __enter__(self) -> Subscription:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _publish(self, event: ChangeEvent) -> None:
+        """Enqueue an event; called synchronously by the source list."""
+        with self._cond:
+            if self.closed:
+                return
+            if self._coalesce(event):
+                return
+            if len(self._queue) >= self.maxsize:
+                self._forget(self._queue.popleft())
+                self.dropped += 1
+            if event.kind is ChangeKind.UPDATE and self.coalesce_window > 0:
+                # The list hands the same event to every listener; later
+                # updates are merged into this subscriber's own copy
+                event = ChangeEvent(event.kind, event.task, dict(event.changes), event.timestamp)
+            self._queue.append(event)
+            if event.kind in (ChangeKind.ADD, ChangeKind.UPDATE):
+                self._pending[event.key] = event
+            elif event.kind is ChangeKind.REMOVE:
+                self._pending.pop(event.key, None)
+            self._notify_waiters()
+
+    def _coalesce(self, event: ChangeEvent) -> bool:
+        """Merge an UPDATE into an undelivered event for the same task."""
+        if event.kind is not ChangeKind.UPDATE or self.coalesce_window <= 0:
+            return False
+        pending = self._pending.get(event.key)
+        if pending is None or event.timestamp - pending.timestamp > self.coalesce_window:
+            return False
+        if pending.kind is ChangeKind.UPDATE:
+            for name, (old, new) in event.changes.items():
+                if name in pending.changes:
+                    old = pending.changes[name][0]
+                pending.changes[name] = (old, new)
+        # A pending ADD already refers to the live task, so it carries the update
+        self.coalesced += 1
+        return True
+
+    def _forget(self, event: ChangeEvent) -> None:
+        """Drop the coalescing entry for an event leaving the queue."""
+        if self._pending.get(event.key) is event:
+            del self._pending[event.key]
+
+    def _notify_waiters(self) -> None:
+        """Wake blocked threads and asyncio waiters."""
+        self._cond.notify_all()
+        waiters, self._waiters = self._waiters, []
+        for loop, future in waiters:
+            if future.done():
+                continue
+            try:
+                loop.call_soon_threadsafe(_wake, future)
+            except RuntimeError:
+                # The consumer's event loop has closed; nobody is waiting any more
+                pass
+
+    def _pop(self) -> ChangeEvent:
+        event = self._queue.popleft()
+        self._forget(event)
+        return event
+
+    def get(self, block: bool = True, timeout: Optional[float] = None) -> ChangeEvent:
+        """
+        Remove and return the next event.
+
+        Args:
+            block: Whether to wait for an event if none is queued
+            timeout: Maximum number of seconds to wait
+
+        Returns:
+            The next ChangeEvent
+
+        Raises:
+            queue.Empty: If no event is available (or the subscription closed)
+        """
+        with self._cond:
+            if block:
+                self._cond.wait_for(lambda: self._queue or self.closed, timeout)
+            if not self._queue:
+                raise queue.Empty
+            return self._pop()
+
+    def drain(self) -> List[ChangeEvent]:
+        """Remove and return all queued events without blocking."""
+        with self._cond:
+            events = list(self._queue)
+            self._queue.clear()
+            self._pending.clear()
+            return events
+
+    def close(self) -> None:
+        """Stop receiving events and wake any waiting consumers."""
+        with self._cond:
+            if self.closed:
+                return
+            self.closed = True
+            self._notify_waiters()
+        self._source.remove_listener(self._publish)
+
+    def __aiter__(self) -> Subscription:
+        return self
+
+    async def __anext__(self) -> ChangeEvent:
+        """Await the next event; iteration stops once closed and drained."""
+        import asyncio
+
+        while True:
+            with self._cond:
+                if self._queue:
+                    return self._pop()
+                if self.closed:
+                    raise StopAsyncIteration
+                loop = asyncio.get_running_loop()
+                future = loop.create_future()
+                self._waiters.append((loop, future))
+            try:
+                await future
+            finally:
+                if future.cancelled():
+                    with self._cond:
+                        if (loop, future) in self._waiters:
+                            self._waiters.remove((loop, future))
@@ -0,0 +1,409 @@
+"""
+Differential Workload Harness for the ToDo Applications
+
+This module generates seeded random streams of list operations and runs each
+stream against several engines: the original ``ToDo.ToDoList``, the
+refactored ``todo_refactored.ToDoList``, the SQLite-backed
+``todo_disk.DiskToDoList`` and any backend registered in ENGINES.  After every operation the results of all engines are compared, and
+the time each engine spends per kind of operation is recorded.
+
+Only behavior the original engine has is exercised: tasks have a name and a
+"pending" or "completed" status, are found by case-insensitive name, and
+lists can be counted, sorted by name and exported.  Run it from the command
+line:
+
+    python todo_harness.py --operations 20000 --seed 7
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+import contextlib
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+
+
+# An operation: its kind and its arguments
+Operation = Tuple[str, tuple]
+
+# Relative frequency of each kind of operation in generated streams
+OPERATION_WEIGHTS: Dict[str, int] = {
+    'add': 40,
+    'remove': 12,
+    'complete': 15,
+    'reopen': 8,
+    'find': 10,
+    'statistics': 8,
+    'sort': 2,
+    'export': 3,
+    'round_trip': 2,
+}
+
+_STATUSES = ("pending", "completed")
+
+
+class LegacyEngine:
+    """Adapter running operations against ToDo.ToDoList, the original engine."""
+
+    def __init__(self):
+        """Create an empty original list."""
+        import ToDo
+        self._module = ToDo
+        self.todo_list = ToDo.ToDoList()
+
+    def _find(self, name: str):
+        """Return the first task with a name (case-insensitive), scanning the public task list."""
+        key = name.lower()
+        return next((task for task in self.todo_list.tasks if task.name.lower() == key), None)
+
+    def add(self, name: str, status: str) -> None:
+        """Add a task."""
+        self.todo_list.add_task(name, status)
+
+    def remove(self, name: str) -> bool:
+        """Remove the first task with a name."""
+        return self.todo_list.remove_task(name)
+
+    def complete(self, name: str) -> bool:
+        """Mark the first task with a name completed."""
+        return self.todo_list.mark_task_completed(name)
+
+    def reopen(self, name: str) -> bool:
+        """Mark the first task with a name pending."""
+        task = self._find(name)
+        if task is None:
+            return False
+        task.mark_pending()
+        return True
+
+    def find(self, name: str) -> Optional[Tuple[str, str]]:
+        """Return the first task with a name as (name, status)."""
+        task = self._find(name)
+        return (task.name, task.status) if task is not None else None
+
+    def statistics(self) -> Tuple[int, int, int]:
+        """Return the (total, completed, pending) counts."""
+        return (self.todo_list.get_task_count(), self.todo_list.get_completed_count(),
+                self.todo_list.get_pending_count())
+
+    def sort(self) -> None:
+        """Sort tasks by name, case-insensitively and stably."""
+        self.todo_list.tasks = sorted(self.todo_list.tasks, key=lambda task: task.name.lower())
+
+    def export(self) -> List[Tuple[str, str]]:
+        """Return every task as (name, status), in list order."""
+        return [(task.name, task.status) for task in self.todo_list.tasks]
+
+    def round_trip(self) -> None:
+        """Replace the list with a copy rebuilt from its export."""
+        rows = self.export()
+        self.todo_list = self._module.ToDoList()
+        for name, status in rows:
+            self.todo_list.add_task(name, status)
+
+
+class RefactoredEngine:
+    """Adapter running operations against todo_refactored.ToDoList."""
+
+    def __init__(self):
+        """Create an empty refactored list."""
+        import todo_refactored
+        self._module = todo_refactored
+        self.todo_list = todo_refactored.ToDoList()
+
+    def add(self, name: str, status: str) -> None:
+        """Add a task."""
+        self.todo_list.add_task(name, status)
+
+    def remove(self, name: str) -> bool:
+        """Remove the first task with a name."""
+        return self.todo_list.remove_task(name)
+
+    def complete(self, name: str) -> bool:
+        """Mark the first task with a name completed."""
+        return self.todo_list.mark_task_completed(name)
+
+    def reopen(self, name: str) -> bool:
+        """Mark the first task with a name pending."""
+        return self.todo_list.mark_task_pending(name)
+
+    def find(self, name: str) -> Optional[Tuple[str, str]]:
+        """Return the first task with a name as (name, status)."""
+        task = self.todo_list.find_task(name)
+        return (task.name, task.status.value) if task is not None else None
+
+    def statistics(self) -> Tuple[int, int, int]:
+        """Return the (total, completed, pending) counts."""
+        stats = self.todo_list.get_statistics()
+        return (stats['total_tasks'], stats['completed'], stats['pending'])
+
+    def sort(self) -> None:
+        """Sort tasks by name, case-insensitively and stably."""
+        self.todo_list.sort_tasks_by_name()
+
+    def export(self) -> List[Tuple[str, str]]:
+        """Return every task as (name, status), in list order."""
+        return [(row['name'], row['status']) for row in self.todo_list.export_to_list()]
+
+    def round_trip(self) -> None:
+        """Replace the list with a copy rebuilt from its export."""
+        rows = self.todo_list.export_to_list()
+        self.todo_list = self._module.ToDoList()
+        self.todo_list.import_from_list(rows, trusted=True)
+
+
+class DiskEngine:
+    """
+    Adapter running operations against todo_disk.DiskToDoList.
+
+    Each engine keeps its databases in its own temporary directory, which
+    close() removes.  A DiskToDoList cannot reorder its tasks, so sort()
+    removes them all and appends them again in sorted order, keeping their
+    IDs.
+    """
+
+    def __init__(self):
+        """Create an empty disk-backed list."""
+        import todo_disk
+        self._module = todo_disk
+        self._directory = tempfile.TemporaryDirectory()
+        self._databases = 0
+        self.todo_list = self._open([])
+
+    def _open(self, rows: List[dict]):
+        """Close the current database (if any) and return a new list holding rows."""
+        if self._databases:
+            self.todo_list.close()
+            os.remove(self.todo_list.path)
+        self._databases += 1
+        todo_list = self._module.DiskToDoList(
+            os.path.join(self._directory.name, f"tasks-{self._databases}.db"))
+        todo_list.import_from_list(rows)
+        return todo_list
+
+    def add(self, name: str, status: str) -> None:
+        """Add a task."""
+        self.todo_list.add_task(name, status)
+
+    def remove(self, name: str) -> bool:
+        """Remove the first task with a name."""
+        return self.todo_list.remove_task(name)
+
+    def complete(self, name: str) -> bool:
+        """Mark the first task with a name completed."""
+        task = self.todo_list.find_task(name)
+        if task is None:
+            return False
+        task.mark_completed()
+        return True
+
+    def reopen(self, name: str) -> bool:
+        """Mark the first task with a name pending."""
+        task = self.todo_list.find_task(name)
+        if task is None:
+            return False
+        task.mark_pending()
+        return True
+
+    def find(self, name: str) -> Optional[Tuple[str, str]]:
+        """Return the first task with a name as (name, status)."""
+        task = self.todo_list.find_task(name)
+        return (task.name, task.status.value) if task is not None else None
+
+    def statistics(self) -> Tuple[int, int, int]:
+        """Return the (total, completed, pending) counts."""
+        stats = self.todo_list.get_statistics()
+        return (stats['total_tasks'], stats['completed'], stats['pending'])
+
+    def sort(self) -> None:
+        """Sort tasks by name, case-insensitively and stably."""
+        rows = sorted(self.todo_list.export_to_list(), key=lambda row: row['name'].lower())
+        for row in rows:
+            self.todo_list.remove_task_by_id(row['id'])
+        self.todo_list.import_from_list(rows)
+
+    def export(self) -> List[Tuple[str, str]]:
+        """Return every task as (name, status), in list order."""
+        return [(row['name'], row['status']) for row in self.todo_list.export_to_list()]
+
+    def round_trip(self) -> None:
+        """Replace the list with a copy rebuilt from its export."""
+        self.todo_list = self._open(self.todo_list.export_to_list())
+
+    def close(self) -> None:
+        """Close the current database and remove the temporary directory."""
+        self.todo_list.close()
+        self._directory.cleanup()
+
+
+# Engines the harness knows about; register new backends here
+ENGINES: Dict[str, Callable[[], object]] = {
+    'legacy': LegacyEngine,
+    'refactored': RefactoredEngine,
+    'disk': DiskEngine,
+}
+
+
+def generate_operations(count: int, seed: int = 0, names: int = 200) -> List[Operation]:
+    """
+    Generate a reproducible random stream of operations.
+
+    Names are drawn from a fixed pool in varying letter case, so streams
+    contain duplicate names, case-insensitive matches and misses.
+
+    Args:
+        count: Number of operations to generate
+        seed: Seed for the random generator
+        names: Size of the pool of task names
+
+    Returns:
+        List of (kind, arguments) operations
+    """
+    rng = random.Random(seed)
+    kinds = list(OPERATION_WEIGHTS)
+    weights = list(OPERATION_WEIGHTS.values())
+    cases = (str, str.lower, str.upper)
+    operations = []
+    for kind in rng.choices(kinds, weights, k=count):
+        name = rng.choice(cases)(f"Task {rng.randrange(names)}")
+        if kind == 'add':
+            operations.append((kind, (name, rng.choice(_STATUSES))))
+        elif kind in ('remove', 'complete', 'reopen', 'find'):
+            operations.append((kind, (name,)))
+        else:
+            operations.append((kind, ()))
+    return operations
+
+
+@dataclass
+class Mismatch:
+    """
+    The first operation on which the engines disagreed.
+
+    Attributes:
+        index: Position of the operation in the stream
+        operation: The operation itself
+        results: Each engine's result (or raised exception)
+    """
+    index: int
+    operation: Operation
+    results: Dict[str, object]
+
+
+@dataclass
+class HarnessReport:
+    """
+    Outcome of running a stream against several engines.
+
+    Attributes:
+        operations: Number of operations run before stopping
+        timings: Per engine and kind of operation, [calls, seconds]
+        mismatch: The first disagreement, or None if all results matched
+    """
+    operations: int = 0
+    timings: Dict[str, Dict[str, List[float]]] = field(default_factory=dict)
+    mismatch: Optional[Mismatch] = None
+
+    @property
+    def ok(self) -> bool:
+        """True if every engine produced the same results."""
+        return self.mismatch is None
+
+    def summary(self) -> str:
+        """Format the timings as a table, one row per kind of operation."""
+        engines = list(self.timings)
+        kinds = sorted({kind for timings in self.timings.values() for kind in timings})
+        lines = [f"{'operation':<12}{'calls':>8}" + "".join(f"{name + ' us/op':>20}" for name in engines)]
+        for kind in kinds:
+            calls = int(next(iter(self.timings.values())).get(kind, [0, 0.0])[0])
+            cells = []
+            for name in engines:
+                n, seconds = self.timings[name].get(kind, [0, 0.0])
+                cells.append(f"{seconds / n * 1e6:>20.2f}" if n else f"{'-':>20}")
+            lines.append(f"{kind:<12}{calls:>8}" + "".join(cells))
+        status = "all results match" if self.ok else (
+            f"MISMATCH at operation {self.mismatch.index} {self.mismatch.operation}: "
+            f"{self.mismatch.results}")
+        lines.append(f"{self.operations} operations, {status}")
+        return "\n".join(lines)
+
+
+def _call(engine, operation: Operation) -> Tuple[object, float]:
+    """Run one operation on an engine; exceptions become the result."""
+    kind, args = operation
+    method = getattr(engine, kind)
+    start = time.perf_counter()
+    try:
+        result = method(*args)
+    except Exception as e:
+        result = (type(e).__name__, str(e))
+    return result, time.perf_counter() - start
+
+
+def run_workload(operations: List[Operation],
+                 engines: Optional[Dict[str, Callable[[], object]]] = None,
+                 check_final_state: bool = True) -> HarnessReport:
+    """
+    Run an operation stream against several engines and compare their results.
+
+    The engines' console output is discarded.  The run stops at the first
+    operation on which the engines disagree, since their states differ
+    from then on.  Engines with a close() method are closed at the end.
+
+    Args:
+        operations: The stream to run, e.g. from generate_operations()
+        engines: Engine factories by name (defaults to ENGINES)
+        check_final_state: Also compare the engines' exports at the end
+
+    Returns:
+        A HarnessReport with the timings and the first mismatch, if any
+    """
+    factories = engines if engines is not None else ENGINES
+    if check_final_state:
+        operations = list(operations) + [('export', ())]
+    with contextlib.ExitStack() as stack:
+        instances = {}
+        for name, factory in factories.items():
+            instances[name] = engine = factory()
+            if hasattr(engine, 'close'):
+                stack.callback(engine.close)
+        report = HarnessReport(timings={name: {} for name in instances})
+        stack.enter_context(contextlib.redirect_stdout(
+            stack.enter_context(open(os.devnull, 'w'))))
+        for index, operation in enumerate(operations):
+            results = {}
+            for name, engine in instances.items():
+                result, seconds = _call(engine, operation)
+                timing = report.timings[name].setdefault(operation[0], [0, 0.0])
+                timing[0] += 1
+                timing[1] += seconds
+                results[name] = result
+            report.operations = index + 1
+            values = list(results.values())
+            if any(value != values[0] for value in values[1:]):
+                report.mismatch = Mismatch(index, operation, results)
+                break
+    return report
+
+
+def main(argv: List[str]) -> int:
+    """Run a generated workload and print the report; return 1 on a mismatch."""
+    logging.disable(logging.CRITICAL)
+    options = {'--operations': 10_000, '--seed': 0, '--names': 200}
+    for option in options:
+        if option in argv:
+            position = argv.index(option)
+            options[option] = int(argv[position + 1])
+    operations = generate_operations(options['--operations'], options['--seed'],
+                                     options['--names'])
+    report = run_workload(operations)
+    print(report.summary())
+    return 0 if report.ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,235 @@
+"""
+Memory Accounting for the Refactored ToDo Application
+
+This module estimates how much memory a ToDoList holds and which part of it
+is responsible: the task objects, their names, timestamps, tags, the slot
+list and the index structures built on top of it.  Sizes come from
+``sys.getsizeof`` and every object is counted once, however many tasks share
+it (an unmodified task's two timestamps, interned names, TaskStatus members).
+
+With ``tracemalloc`` tracing, the memory still held by allocations made in
+``add_task``, ``import_from_list`` and the export code paths can also be
+attributed to those paths.
+"""
+
+from __future__ import annotations
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+import sys
+import tracemalloc
+
+import todo_refactored
+from todo_refactored import Task, ToDoList
+
+
+# Components memory is attributed to, in report order
+COMPONENTS = ('list', 'tasks', 'names', 'datetimes', 'statuses', 'ids', 'tags', 'slots', 'indexes')
+
+# Code paths allocations can be attributed to, and the functions making them up
+CODE_PATHS: Dict[str, Tuple[str, ...]] = {
+    'add_task': ('add_task',),
+    'import_from_list': ('import_from_list', '_import_trusted', '_parse_timestamp'),
+    'export': ('export_to_list', '_task_record'),
+}
+
+
+@dataclass(frozen=True)
+class MemoryReport:
+    """
+    Estimated memory held by a ToDoList.
+
+    Attributes:
+        task_count: Number of tasks in the list
+        components: Bytes per component (see COMPONENTS)
+        allocations: With tracemalloc, live bytes allocated per code path
+            (see CODE_PATHS), or None
+    """
+    task_count: int
+    components: Dict[str, int]
+    allocations: Optional[Dict[str, int]] = field(default=None)
+
+    @property
+    def total(self) -> int:
+        """Total estimated bytes over all components."""
+        return sum(self.components.values())
+
+    @property
+    def per_task(self) -> float:
+        """Total estimated bytes divided by the number of tasks (0 if empty)."""
+        return self.total / self.task_count if self.task_count else 0
+
+    def per_task_by_component(self) -> Dict[str, float]:
+        """Return each component's bytes divided by the number of tasks."""
+        count = self.task_count or 1
+        return {name: size / count for name, size in self.components.items()}
+
+    def format(self) -> str:
+        """Format the report as a table, one row per component."""
+        lines = [f"{'component':<12}{'bytes':>14}{'per task':>12}"]
+        per_task = self.per_task_by_component()
+        for name, size in self.components.items():
+            lines.append(f"{name:<12}{size:>14,}{per_task[name]:>12.1f}")
+        lines.append(f"{'total':<12}{self.total:>14,}{self.per_task:>12.1f}")
+        for path, size in (self.allocations or {}).items():
+            lines.append(f"{'traced ' + path:<24}{size:>14,}")
+        return "\n".join(lines)
+
+
+class _Sizer:
+    """Adds up object sizes, counting every object only once."""
+
+    def __init__(self):
+        """Start with nothing counted."""
+        self.seen: Set[int] = set()
+
+    def size(self, obj: object) -> int:
+        """Return an object's own size, or 0 if it was already counted."""
+        if id(obj) in self.seen:
+            return 0
+        self.seen.add(id(obj))
+        return sys.getsizeof(obj)
+
+    def deep_size(self, obj: object) -> int:
+        """
+        Return the size of an index structure and everything it references.
+
+        Tasks, lists, classes and callables are not followed: tasks are
+        accounted for separately and the rest is shared with other code.
+        """
+        total = 0
+        stack = [obj]
+        while stack:
+            obj = stack.pop()
+            if (isinstance(obj, (Task, ToDoList, type)) or callable(obj)
+                    or id(obj) in self.seen):
+                continue
+            total += self.size(obj)
+            if isinstance(obj, dict):
+                stack.extend(obj.keys())
+                stack.extend(obj.values())
+            elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+                stack.extend(obj)
+            elif hasattr(obj, '__dict__'):
+                stack.append(vars(obj))
+            elif hasattr(type(obj), '__slots__'):
+                stack.extend(getattr(obj, name) for name in type(obj).__slots__
+                             if hasattr(obj, name))
+        return total
+
+
+def memory_report(todo_list: ToDoList, traced: bool = False) -> MemoryReport:
+    """
+    Estimate the memory held by a list, by component.
+
+    Status and priority are references to shared objects, so they cost a
+    slot in each task's instance dict (under 'tasks') plus the shared
+    objects once.  Lazily built structures (the position index, Merkle
+    tree, dependency graph and tag index) are included under 'indexes'
+    when they exist.
+
+    Args:
+        todo_list: The list to measure
+        traced: Also attribute live traced allocations to code paths; the
+            list must have been built while tracemalloc was tracing (see
+            tracing())
+
+    Returns:
+        A MemoryReport
+
+    Raises:
+        RuntimeError: If traced is True and tracemalloc is not tracing
+    """
+    if traced and not tracemalloc.is_tracing():
+        raise RuntimeError("tracemalloc is not tracing; build the list inside tracing()")
+    sizer = _Sizer()
+    size = sizer.size
+    components = dict.fromkeys(COMPONENTS, 0)
+    components['list'] = size(todo_list) + size(vars(todo_list))
+    components['slots'] = size(todo_list._slots)
+    tasks = names = datetimes = statuses = ids = tags = 0
+    for task in todo_list._live():
+        tasks += size(task) + size(vars(task))
+        names += size(task.name)
+        datetimes += size(task.created_at) + size(task.updated_at)
+        if task.due_at is not None:
+            datetimes += size(task.due_at)
+        statuses += size(task.status)
+        ids += size(task.task_id)
+        tags += size(task.tags)
+        for tag in task.tags:
+            tags += size(tag)
+    components.update(tasks=tasks, names=names, datetimes=datetimes, statuses=statuses,
+                      ids=ids, tags=tags)
+    components['indexes'] = sum(
+        sizer.deep_size(structure) for structure in (
+            todo_list._by_id, todo_list._cells, todo_list._rank, todo_list._merkle,
+            todo_list._dependencies, todo_list._tag_index, todo_list._archive,
+            todo_list._query_cache)
+        if structure is not None)
+    allocations = allocations_by_path(tracemalloc.take_snapshot()) if traced else None
+    return MemoryReport(len(todo_list), components, allocations)
+
+
+@contextmanager
+def tracing(frames: int = 32) -> Iterator[None]:
+    """
+    Trace allocations with tracemalloc for the duration of the block.
+
+    Tracing is left running if it was already started elsewhere.
+
+    Args:
+        frames: Number of stack frames stored per allocation; it must reach
+            from the allocation back to the ToDoList method that caused it
+    """
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start(frames)
+    try:
+        yield
+    finally:
+        if started:
+            tracemalloc.stop()
+
+
+def _line_ranges() -> List[Tuple[str, range]]:
+    """Return (code path, line range in todo_refactored.py) for every traced function."""
+    namespaces = (vars(ToDoList), vars(todo_refactored))
+    ranges = []
+    for path, functions in CODE_PATHS.items():
+        for name in functions:
+            code = next(namespace[name] for namespace in namespaces if name in namespace).__code__
+            last = max(line for _, _, line in code.co_lines() if line is not None)
+            ranges.append((path, range(code.co_firstlineno, last + 1)))
+    return ranges
+
+
+def allocations_by_path(snapshot: tracemalloc.Snapshot) -> Dict[str, int]:
+    """
+    Attribute the live memory in a tracemalloc snapshot to code paths.
+
+    An allocation belongs to a code path if any frame of its traceback lies
+    in one of the path's functions (the most recent such frame wins).
+    Allocations made outside every path are not counted.
+
+    Args:
+        snapshot: A snapshot taken while tracing
+
+    Returns:
+        Live bytes per code path in CODE_PATHS
+    """
+    filename = ToDoList.add_task.__code__.co_filename
+    ranges = _line_ranges()
+    result = dict.fromkeys(CODE_PATHS, 0)
+    # Allocations sharing a traceback are grouped first; there are far fewer
+    # distinct tracebacks than allocations
+    for statistic in snapshot.statistics('traceback'):
+        for frame in reversed(statistic.traceback):
+            if frame.filename != filename:
+                continue
+            path = next((path for path, lines in ranges if frame.lineno in lines), None)
+            if path is not None:
+                result[path] += statistic.size
+                break
+    return result
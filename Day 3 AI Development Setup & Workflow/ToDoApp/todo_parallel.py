@@ -0,0 +1,137 @@
+"""
+Parallel Statistics for the Refactored ToDo Application
+
+This module computes status x priority (x time bucket) counts over a
+columnar snapshot (see todo_shared) with a process pool: the rows are split
+into chunks, each worker attaches to the snapshot and counts its chunks, and
+the partial counts are summed.  Workers never receive tasks, only a snapshot
+name and row ranges.
+
+A live ToDoList already keeps its status x priority counts up to date, so
+``get_statistics()`` on it is instant; this engine is for lists that are
+only available as a snapshot (a file written by ``write_snapshot_file`` or
+a shared memory generation), and for time-bucketed counts, which need a
+pass over every row.
+"""
+
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple, Union
+import os
+
+from todo_refactored import CrossTab, TaskStatus, ToDoList, _TIME_BUCKETS, _statistics_from_cells
+from todo_shared import (STATUS_CODES, ColumnarSnapshot, SnapshotPublisher, attach_snapshot,
+                         open_snapshot_file)
+
+
+# Cell counts keyed by (status, priority, time bucket or None)
+Cells = Dict[Tuple[TaskStatus, int, object], int]
+
+
+def _open(source: Tuple[str, str]) -> ColumnarSnapshot:
+    """Open a snapshot described as ('file', path) or ('shm', block name)."""
+    kind, name = source
+    return open_snapshot_file(name) if kind == 'file' else attach_snapshot(name)
+
+
+def _count_chunk(source: Tuple[str, str], start: int, stop: int,
+                 time_bucket: Optional[str]) -> Cells:
+    """Count the rows [start, stop) of a snapshot; runs in a worker process."""
+    snapshot = _open(source)
+    try:
+        if time_bucket is None:
+            return {(status, priority, None): n
+                    for (status, priority), n in snapshot.cell_counts(start, stop).items()}
+        bucket_of = _TIME_BUCKETS[time_bucket]
+        # Buckets change on whole local minutes at most, so the bucket is
+        # computed once per minute of creation times rather than once per row
+        buckets = {}
+        cells: Cells = {}
+        statuses, priorities, created = snapshot.status, snapshot.priority, snapshot.created
+        for row in range(start, stop):
+            minute = int(created[row] // 60)
+            bucket = buckets.get(minute)
+            if bucket is None:
+                bucket = buckets[minute] = bucket_of(datetime.fromtimestamp(created[row]))
+            cell = (STATUS_CODES[statuses[row]], priorities[row], bucket)
+            cells[cell] = cells.get(cell, 0) + 1
+        return cells
+    finally:
+        snapshot.close()
+
+
+def _chunks(count: int, workers: int, chunk_size: Optional[int]) -> List[Tuple[int, int]]:
+    """Split count rows into [start, stop) ranges, about four per worker by default."""
+    if chunk_size is None:
+        chunk_size = max(1, -(-count // (workers * 4)))
+    return [(start, min(start + chunk_size, count)) for start in range(0, count, chunk_size)]
+
+
+def parallel_cross_tab(source: Union[ToDoList, str], time_bucket: Optional[str] = None,
+                       workers: Optional[int] = None,
+                       chunk_size: Optional[int] = None) -> CrossTab:
+    """
+    Count tasks by status and priority (and time bucket) with a process pool.
+
+    Args:
+        source: A ToDoList (published to shared memory for the run) or the
+            path of a file written by todo_shared.write_snapshot_file()
+        time_bucket: 'day', 'week' or 'month' to also split the counts by
+            created_at, as in ToDoList.cross_tab()
+        workers: Number of worker processes (os.cpu_count() if None); with
+            1 the chunks are counted in this process
+        chunk_size: Rows per chunk (about four chunks per worker if None)
+
+    Returns:
+        A CrossTab equal to ``source.cross_tab(time_bucket)``
+
+    Raises:
+        ValueError: If time_bucket is not a known bucket size
+    """
+    if time_bucket is not None and time_bucket not in _TIME_BUCKETS:
+        raise ValueError(f"Unknown time bucket: {time_bucket!r}")
+    workers = workers or os.cpu_count() or 1
+    publisher = None
+    if isinstance(source, ToDoList):
+        publisher = SnapshotPublisher(source)
+        location = ('shm', publisher.block_name)
+    else:
+        location = ('file', source)
+    try:
+        snapshot = _open(location)
+        count = len(snapshot)
+        snapshot.close()
+        chunks = _chunks(count, workers, chunk_size)
+        if workers == 1:
+            partials = [_count_chunk(location, start, stop, time_bucket) for start, stop in chunks]
+        else:
+            with ProcessPoolExecutor(workers) as pool:
+                futures = [pool.submit(_count_chunk, location, start, stop, time_bucket)
+                           for start, stop in chunks]
+                partials = [future.result() for future in futures]
+    finally:
+        if publisher is not None:
+            publisher.close()
+    cells: Cells = {}
+    for partial in partials:
+        for cell, n in partial.items():
+            cells[cell] = cells.get(cell, 0) + n
+    return CrossTab(cells)
+
+
+def parallel_statistics(source: Union[ToDoList, str], workers: Optional[int] = None,
+                        chunk_size: Optional[int] = None) -> dict:
+    """
+    Compute ToDoList.get_statistics() for a list or snapshot file with a process pool.
+
+    Args:
+        source: A ToDoList or snapshot file path (see parallel_cross_tab())
+        workers: Number of worker processes (os.cpu_count() if None)
+        chunk_size: Rows per chunk (about four chunks per worker if None)
+
+    Returns:
+        The same dictionary as get_statistics()
+    """
+    cross_tab = parallel_cross_tab(source, workers=workers, chunk_size=chunk_size)
+    return _statistics_from_cells(cross_tab.rollup('status', 'priority'))
@@ -0,0 +1,164 @@
+"""
+Query-Result Cache for the Refactored ToDo Application
+
+This module caches the answers to a ToDoList's read queries.  Every change
+to a list (add, remove, update, reorder, import) increases its ``version``;
+a cached answer is only returned while the list is still at the version it
+was computed for, so repeated identical reads between writes skip the scan
+over the tasks.  Answers are immutable views (tuples and read-only
+mappings) so callers cannot alter what other callers will be given.
+
+The cache is bounded by an estimate of the memory its answers take (the
+containers only; the tasks are owned by the list).  The least recently
+used answers are evicted first, and the first query after the list changed
+drops all answers, because they can never be returned again.
+"""
+
+from __future__ import annotations
+from collections import OrderedDict
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Callable, Hashable, Mapping, Tuple
+import sys
+
+from todo_refactored import Task, TaskStatus, ToDoList
+
+
+@dataclass(frozen=True)
+class QueryCacheInfo:
+    """
+    Counters of a QueryCache.
+
+    Attributes:
+        hits: Queries answered from the cache
+        misses: Queries computed from the list
+        evictions: Answers dropped to stay within the memory budget
+        invalidations: Times the cache was emptied because the list changed
+        entries: Answers currently cached
+        size: Estimated bytes held by the cached answers
+        max_size: The memory budget in bytes
+    """
+    hits: int
+    misses: int
+    evictions: int
+    invalidations: int
+    entries: int
+    size: int
+    max_size: int
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of queries that were hits (0 before any query)."""
+        queries = self.hits + self.misses
+        return self.hits / queries if queries else 0.0
+
+
+class QueryCache:
+    """
+    Versioned cache of a ToDoList's filter and statistics answers.
+
+    Use ToDoList.query_cache() to get the cache of a list; once it exists
+    the list's own find_tasks_by_status() and get_tasks_by_priority() use it
+    too, returning fresh lists built from the cached tuples.
+    """
+
+    def __init__(self, todo_list: ToDoList, max_size: int = 8 * 2**20):
+        """
+        Start with an empty cache for a list.
+
+        Args:
+            todo_list: The list whose queries are cached
+            max_size: Memory budget for the cached answers, in bytes
+        """
+        self.todo_list = todo_list
+        self.max_size = max_size
+        self._entries: OrderedDict[Hashable, Tuple[object, int]] = OrderedDict()
+        self._version = todo_list.version
+        self._size = 0
+        self._hits = self._misses = self._evictions = self._invalidations = 0
+
+    def _answer(self, key: Hashable, compute: Callable[[], Tuple[object, int]]) -> object:
+        """Return the cached answer for a query, computing and caching it on a miss."""
+        version = self.todo_list.version
+        if version != self._version:
+            if self._entries:
+                self._invalidations += 1
+                self.clear()
+            self._version = version
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[0]
+        self._misses += 1
+        answer, size = compute()
+        if size <= self.max_size:
+            self._entries[key] = (answer, size)
+            self._size += size
+            while self._size > self.max_size:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._size -= evicted_size
+                self._evictions += 1
+        return answer
+
+    def _tasks(self, key: Hashable, keep: Callable[[Task], bool]) -> Tuple[Task, ...]:
+        """Return (and cache) the list's tasks for which keep() is true."""
+        def compute():
+            tasks = tuple(filter(keep, self.todo_list))
+            return tasks, sys.getsizeof(tasks)
+        return self._answer(key, compute)
+
+    def find_tasks_by_status(self, status: TaskStatus) -> Tuple[Task, ...]:
+        """
+        Find all tasks with a specific status.
+
+        Args:
+            status: The status to filter by
+
+        Returns:
+            The tasks with that status, in list order
+        """
+        return self._tasks(('status', status), lambda task: task.status is status)
+
+    def get_tasks_by_priority(self, priority: int) -> Tuple[Task, ...]:
+        """
+        Get all tasks with a specific priority.
+
+        Args:
+            priority: The priority level (1-5)
+
+        Returns:
+            The tasks with that priority, in list order
+        """
+        return self._tasks(('priority', priority), lambda task: task.priority == priority)
+
+    def get_statistics(self) -> Mapping[str, object]:
+        """
+        Get the list's statistics as a read-only mapping.
+
+        Returns:
+            The ToDoList.get_statistics() dictionary, with it and its
+            priority distribution wrapped in MappingProxyType
+        """
+        def compute():
+            statistics = self.todo_list.get_statistics()
+            distribution = statistics['priority_distribution']
+            statistics['priority_distribution'] = MappingProxyType(distribution)
+            return (MappingProxyType(statistics),
+                    sys.getsizeof(statistics) + sys.getsizeof(distribution))
+        return self._answer('statistics', compute)
+
+    def cache_info(self) -> QueryCacheInfo:
+        """
+        Report how well the cache is working.
+
+        Returns:
+            A QueryCacheInfo with the hit, miss, eviction and size counters
+        """
+        return QueryCacheInfo(self._hits, self._misses, self._evictions, self._invalidations,
+                              len(self._entries), self._size, self.max_size)
+
+    def clear(self) -> None:
+        """Drop every cached answer."""
+        self._entries.clear()
+        self._size = 0
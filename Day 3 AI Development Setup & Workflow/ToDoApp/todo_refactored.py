@@ -6,15 +6,19 @@ with improved error handling, type hints, and better separation of concerns.
 """
 
 from __future__ import annotations
-from typing import List, Optional, Iterator, Union
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Iterator, Set, Tuple, Union
 from enum import Enum
-from dataclasses import dataclass
-from datetime import datetime
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from operator import itemgetter
+import gc
 import logging
 
+from todo_events import ChangeEvent, ChangeKind, Listener, Subscription
+
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
@@ -26,6 +30,16 @@ class TaskStatus(Enum):
     CANCELLED = "cancelled"
 
 
+_STATUS_BY_VALUE = {status.value: status for status in TaskStatus}
+
+# Shared by every untagged task (each frozenset() call builds a new object)
+_NO_TAGS: FrozenSet[str] = frozenset()
+
+# Task fields shown by str() or written by export_to_list()
+_CONTENT_FIELDS = frozenset({'name', 'status', 'created_at', 'updated_at', 'priority',
+                             'due_at', 'tags'})
+
+
 @dataclass
 class Task:
     """
@@ -37,28 +51,87 @@ class Task:
         created_at: Timestamp when the task was created
         updated_at: Timestamp when the task was last modified
         priority: Priority level (1-5, where 5 is highest)
+        task_id: Stable identifier assigned by the owning ToDoList
+        due_at: Optional deadline for the task
+        tags: Lowercase labels attached to the task
     """
     name: str
     status: TaskStatus = TaskStatus.PENDING
     created_at: datetime = None
     updated_at: datetime = None
     priority: int = 3
+    task_id: Optional[int] = field(default=None, compare=False)
+    due_at: Optional[datetime] = None
+    tags: FrozenSet[str] = _NO_TAGS
+    _owner: Optional[ToDoList] = field(default=None, init=False, repr=False, compare=False)
+    _slot: int = field(default=-1, init=False, repr=False, compare=False)
+    _text: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _record: Optional[dict] = field(default=None, init=False, repr=False, compare=False)
     
-    def __post_init__(self):
-        """Initialize timestamps and validate data after object creation."""
-        now = datetime.now()
-        if self.created_at is None:
-            self.created_at = now
-        if self.updated_at is None:
-            self.updated_at = now
+    def __init__(self, name: str, status: TaskStatus = TaskStatus.PENDING,
+                 created_at: Optional[datetime] = None, updated_at: Optional[datetime] = None,
+                 priority: int = 3, task_id: Optional[int] = None,
+                 due_at: Optional[datetime] = None, tags: Iterable[str] = _NO_TAGS):
+        """
+        Initialize the task, filling in missing timestamps and validating data.
+        
+        The fields are stored in the instance dict directly: going through
+        __setattr__ for each of them would make every task slower to build.
+        """
+        if created_at is None or updated_at is None:
+            now = datetime.now()
+            if created_at is None:
+                created_at = now
+            if updated_at is None:
+                updated_at = now
         
         # Validate priority
-        if not 1 <= self.priority <= 5:
+        if not 1 <= priority <= 5:
             raise ValueError("Priority must be between 1 and 5")
+        
+        attrs = self.__dict__
+        attrs['name'] = name
+        attrs['status'] = status
+        attrs['created_at'] = created_at
+        attrs['updated_at'] = updated_at
+        attrs['priority'] = priority
+        attrs['task_id'] = task_id
+        attrs['due_at'] = due_at
+        attrs['tags'] = _normalize_tags(tags) if tags else _NO_TAGS
+        attrs['_owner'] = None
+        attrs['_slot'] = -1
+        attrs['_text'] = attrs['_record'] = None
+    
+    def __setattr__(self, attr: str, value) -> None:
+        """
+        Set an attribute.
+        
+        Assigning a new value to a displayed or exported field drops the
+        cached forms and reports the change to the owning list, exactly as
+        the setter methods do (but without touching updated_at).
+        """
+        if attr not in _CONTENT_FIELDS:
+            object.__setattr__(self, attr, value)
+            return
+        attrs = self.__dict__
+        old = attrs[attr]
+        if old == value:
+            attrs[attr] = value
+            return
+        owner = attrs['_owner']
+        if owner is not None:
+            owner._task_changing(self)
+        attrs[attr] = value
+        attrs['_text'] = attrs['_record'] = None
+        if owner is not None:
+            owner._task_changed(self, {attr: (old, value)})
     
     def __str__(self) -> str:
-        """String representation of the task."""
-        return f"[{self.status.value.upper()}] {self.name} (Priority: {self.priority})"
+        """String representation of the task (cached until the task changes)."""
+        text = self._text
+        if text is None:
+            text = self._text = f"[{self.status.value.upper()}] {self.name} (Priority: {self.priority})"
+        return text
     
     def __repr__(self) -> str:
         """Developer representation of the task."""
@@ -80,19 +153,80 @@ class Task:
         """Mark the task as cancelled."""
         self._update_status(TaskStatus.CANCELLED)
     
+    def _uncache(self) -> None:
+        """Drop the cached display string and export record after a change."""
+        attrs = self.__dict__
+        attrs['_text'] = attrs['_record'] = None
+    
+    def _changing(self) -> None:
+        """Tell the owning list that one of the task's fields is about to change."""
+        if self._owner is not None:
+            self._owner._task_changing(self)
+    
+    def _change(self, attr: str, value) -> None:
+        """
+        Set a field on behalf of a setter method.
+        
+        Touches updated_at, drops the cached forms and reports the change
+        (if the value differs) to the owning list.
+        """
+        self._changing()
+        attrs = self.__dict__
+        old = attrs[attr]
+        attrs[attr] = value
+        attrs['updated_at'] = datetime.now()
+        attrs['_text'] = attrs['_record'] = None
+        if self._owner is not None and old != value:
+            self._owner._task_changed(self, {attr: (old, value)})
+    
     def _update_status(self, new_status: TaskStatus) -> None:
         """Update the task status and timestamp."""
         if self.status != new_status:
-            self.status = new_status
-            self.updated_at = datetime.now()
+            self._change('status', new_status)
             logger.info(f"Task '{self.name}' status changed to {new_status.value}")
     
     def set_priority(self, priority: int) -> None:
         """Set the task priority."""
         if not 1 <= priority <= 5:
             raise ValueError("Priority must be between 1 and 5")
-        self.priority = priority
-        self.updated_at = datetime.now()
+        if self.priority != priority:
+            self._change('priority', priority)
+    
+    def set_due_at(self, due_at: Optional[datetime]) -> None:
+        """Set or clear (with None) the task deadline."""
+        if self.due_at != due_at:
+            self._change('due_at', due_at)
+    
+    def rename(self, name: str) -> None:
+        """Rename the task (surrounding whitespace is stripped)."""
+        if not name or not name.strip():
+            raise ValueError("Task name cannot be empty")
+        if self.name != name.strip():
+            self._change('name', name.strip())
+    
+    def set_tags(self, tags: Iterable[str]) -> None:
+        """Replace the task's tags (stored stripped and lowercase)."""
+        new_tags = _normalize_tags(tags)
+        if self.tags != new_tags:
+            self._change('tags', new_tags)
+    
+    def add_tag(self, tag: str) -> None:
+        """Attach a tag to the task."""
+        self.set_tags(self.tags | _normalize_tags(tag))
+    
+    def remove_tag(self, tag: str) -> None:
+        """Detach a tag from the task, if present."""
+        self.set_tags(self.tags - _normalize_tags(tag))
+    
+    def has_tag(self, tag: str) -> bool:
+        """Check if the task carries a tag."""
+        return tag.strip().lower() in self.tags
+    
+    def is_overdue(self, now: Optional[datetime] = None) -> bool:
+        """Check if the task is still open after its deadline."""
+        return (self.due_at is not None
+                and self.status in (TaskStatus.PENDING, TaskStatus.IN_PROGRESS)
+                and self.due_at <= (now or datetime.now()))
     
     def is_completed(self) -> bool:
         """Check if the task is completed."""
@@ -103,36 +237,520 @@ class Task:
         return self.status == TaskStatus.PENDING
 
 
+def _normalize_tags(tags: Union[str, Iterable[str]]) -> FrozenSet[str]:
+    """Return tags stripped and lowercased; a single string is one tag."""
+    if isinstance(tags, str):
+        tags = (tags,)
+    normalized = frozenset(tag.strip().lower() for tag in tags)
+    if '' in normalized:
+        raise ValueError("Tag cannot be empty")
+    return normalized or _NO_TAGS
+
+
+class _SlotRank:
+    """
+    Fenwick tree counting live slots, used to map list positions to slots.
+    
+    Position ``i`` of the list is the slot holding the ``(i + 1)``-th live
+    task; both lookups and updates take O(log n).
+    """
+    
+    def __init__(self, slots: List[Optional[Task]]):
+        """Build the tree for the given slots in O(n)."""
+        size = len(slots)
+        tree = [0] * (size + 1)
+        for i, task in enumerate(slots, 1):
+            if task is not None:
+                tree[i] += 1
+            parent = i + (i & -i)
+            if parent <= size:
+                tree[parent] += tree[i]
+        self._tree = tree
+    
+    def append(self) -> None:
+        """Account for a live task appended after the last slot."""
+        tree = self._tree
+        i = len(tree)
+        total = 1
+        j = i - 1
+        stop = i - (i & -i)
+        while j > stop:
+            total += tree[j]
+            j -= j & -j
+        tree.append(total)
+    
+    def pop(self) -> None:
+        """Forget the last slot (no other node covers it)."""
+        self._tree.pop()
+    
+    def clear(self, slot: int) -> None:
+        """Mark a slot as tombstoned."""
+        tree = self._tree
+        i = slot + 1
+        while i < len(tree):
+            tree[i] -= 1
+            i += i & -i
+    
+    def find(self, index: int) -> int:
+        """Return the slot holding the live task at list position ``index``."""
+        tree = self._tree
+        size = len(tree) - 1
+        slot = 0
+        remaining = index + 1
+        step = 1 << size.bit_length()
+        while step:
+            candidate = slot + step
+            if candidate <= size and tree[candidate] < remaining:
+                slot = candidate
+                remaining -= tree[candidate]
+            step >>= 1
+        return slot
+
+
+# Functions mapping created_at to the start of its time bucket, by bucket name
+_TIME_BUCKETS: Dict[str, Callable[[datetime], date]] = {
+    'day': lambda moment: moment.date(),
+    'week': lambda moment: moment.date() - timedelta(days=moment.weekday()),
+    'month': lambda moment: moment.date().replace(day=1),
+}
+
+_DIMENSIONS = ('status', 'priority', 'bucket')
+
+
+@dataclass(frozen=True)
+class CrossTab:
+    """
+    Task counts by status and priority, optionally split by creation time.
+    
+    Attributes:
+        cells: Maps (status, priority, bucket) to the number of such tasks;
+            bucket is the first day of the created_at bucket, or None when
+            no time buckets were requested.  Empty cells are omitted.
+    """
+    cells: Dict[Tuple[TaskStatus, int, Optional[date]], int]
+    
+    @property
+    def total(self) -> int:
+        """Total number of tasks counted."""
+        return sum(self.cells.values())
+    
+    def count(self, status: Optional[Union[TaskStatus, str]] = None,
+              priority: Optional[int] = None, bucket: Optional[date] = None) -> int:
+        """
+        Count tasks matching every given coordinate.
+        
+        Args:
+            status: Only count tasks with this status
+            priority: Only count tasks with this priority
+            bucket: Only count tasks created in this bucket
+            
+        Returns:
+            Number of matching tasks
+        """
+        if isinstance(status, str):
+            status = _STATUS_BY_VALUE.get(status.lower())
+            if status is None:
+                return 0
+        return sum(
+            n for (cell_status, cell_priority, cell_bucket), n in self.cells.items()
+            if (status is None or cell_status is status)
+            and (priority is None or cell_priority == priority)
+            and (bucket is None or cell_bucket == bucket)
+        )
+    
+    def rollup(self, *dimensions: str) -> Dict[tuple, int]:
+        """
+        Sum the cells over every dimension not listed.
+        
+        Args:
+            *dimensions: Any of 'status', 'priority' and 'bucket', in the
+                order wanted in the result keys
+                
+        Returns:
+            Dictionary mapping tuples of the listed dimensions to counts
+            
+        Raises:
+            ValueError: If a dimension name is unknown
+        """
+        positions = []
+        for dimension in dimensions:
+            if dimension not in _DIMENSIONS:
+                raise ValueError(f"Unknown dimension: {dimension!r}")
+            positions.append(_DIMENSIONS.index(dimension))
+        totals: Dict[tuple, int] = {}
+        for cell, n in self.cells.items():
+            key = tuple(cell[i] for i in positions)
+            totals[key] = totals.get(key, 0) + n
+        return totals
+    
+    def matrix(self) -> Dict[TaskStatus, Dict[int, int]]:
+        """
+        Return the status x priority matrix, including empty cells.
+        
+        Returns:
+            Dictionary mapping each status to a {priority: count} row
+        """
+        rows = {status: dict.fromkeys(range(1, 6), 0) for status in TaskStatus}
+        for (status, priority, _), n in self.cells.items():
+            row = rows[status]
+            row[priority] = row.get(priority, 0) + n
+        return rows
+    
+    def completion_rate(self, priority: Optional[int] = None,
+                        bucket: Optional[date] = None) -> float:
+        """
+        Get the percentage of completed tasks, as in ToDoList.get_statistics().
+        
+        Args:
+            priority: Only consider tasks with this priority
+            bucket: Only consider tasks created in this bucket
+            
+        Returns:
+            Completed tasks as a percentage of all matching tasks (0 if none)
+        """
+        total = self.count(priority=priority, bucket=bucket)
+        completed = self.count(TaskStatus.COMPLETED, priority, bucket)
+        return (completed / total * 100) if total > 0 else 0
+
+
 class ToDoList:
     """
     A class to manage a collection of tasks with advanced functionality.
+    
+    Removing a task leaves a tombstone (``None``) in its slot instead of
+    shifting every later task.  Iteration, counting and index-based methods
+    skip tombstones, and the slots are compacted once tombstones make up
+    ``compaction_ratio`` of them.
     """
     
-    def __init__(self, name: str = "My ToDo List"):
+    def __init__(self, name: str = "My ToDo List", compaction_ratio: float = 0.5):
         """
         Initialize a new todo list.
         
         Args:
             name: Name of the todo list
+            compaction_ratio: Fraction of tombstoned slots (0 < ratio <= 1)
+                at which the slots are compacted
         """
+        if not 0 < compaction_ratio <= 1:
+            raise ValueError("compaction_ratio must be in (0, 1]")
         self.name = name
-        self._tasks: List[Task] = []
+        self.compaction_ratio = compaction_ratio
+        self._slots: List[Optional[Task]] = []
+        self._tombstones = 0
+        self._rank: Optional[_SlotRank] = None
         self._task_id_counter = 0
+        self._by_id: Dict[int, Task] = {}
+        self._listeners: List[Listener] = []
+        self._merkle = None
+        self._dependencies = None
+        self._tag_index = None
+        self._archive = None
+        self._query_cache = None
+        self._batch: Optional[_Batch] = None
+        self._version = 0
+        self._cells: Dict[Tuple[TaskStatus, int], int] = {}
     
     def __len__(self) -> int:
         """Return the number of tasks in the list."""
-        return len(self._tasks)
+        return len(self._slots) - self._tombstones
     
     def __iter__(self) -> Iterator[Task]:
         """Allow iteration over tasks."""
-        return iter(self._tasks)
+        return self._live()
     
     def __str__(self) -> str:
         """String representation of the todo list."""
-        return f"{self.name} ({len(self._tasks)} tasks)"
+        return f"{self.name} ({len(self)} tasks)"
+    
+    @property
+    def version(self) -> int:
+        """Change counter, increased by every add, remove, update and reorder."""
+        return self._version
+    
+    @property
+    def _tasks(self) -> List[Task]:
+        """The tasks as a dense list (compacting the slots first)."""
+        self.compact()
+        return self._slots
+    
+    def _live(self) -> Iterator[Task]:
+        """Iterate over live tasks, skipping tombstones."""
+        if self._tombstones:
+            return filter(None, self._slots)
+        return iter(self._slots)
+    
+    def compact(self) -> None:
+        """Drop all tombstones from the slots."""
+        if self._tombstones:
+            if self._batch is not None:
+                self._batch.journal.append((_SLOTS, self._slots))
+            self._slots = [task for task in self._slots if task is not None]
+            self._tombstones = 0
+            self._rank = None
+            self._renumber()
+    
+    def _renumber(self) -> None:
+        """Record each task's slot after the slots were rebuilt or reordered."""
+        for slot, task in enumerate(self._slots):
+            if task is not None:
+                task._slot = slot
+    
+    def _slot_of(self, index: int) -> int:
+        """Map a (non-negative, in range) list position to its slot."""
+        if not self._tombstones:
+            return index
+        if self._rank is None:
+            self._rank = _SlotRank(self._slots)
+        return self._rank.find(index)
+    
+    def _append_slot(self, task: Task) -> None:
+        """Store a task in a new slot after the last one."""
+        task._slot = len(self._slots)
+        self._slots.append(task)
+        if self._rank is not None:
+            self._rank.append()
+        if self._batch is not None:
+            self._batch.journal.append((_APPEND, task))
+    
+    def _remove_slot(self, slot: int) -> Task:
+        """Remove the task in a slot, announce it and compact if needed."""
+        slots = self._slots
+        task = slots[slot]
+        if slot == len(slots) - 1:
+            slots.pop()
+            if self._rank is not None:
+                self._rank.pop()
+            if self._batch is not None:
+                self._batch.journal.append((_POP, task))
+        else:
+            slots[slot] = None
+            self._tombstones += 1
+            if self._rank is not None:
+                self._rank.clear(slot)
+            if self._batch is not None:
+                self._batch.journal.append((_CLEAR, slot, task))
+        self._detach(task)
+        self._maybe_compact()
+        return task
+    
+    def _maybe_compact(self) -> None:
+        """Compact once tombstones reach the configured share of slots (after any batch)."""
+        if (self._batch is None and self._tombstones
+                and self._tombstones >= self.compaction_ratio * len(self._slots)):
+            self.compact()
+    
+    def add_listener(self, listener: Listener) -> None:
+        """
+        Register a callback invoked synchronously for every change.
+        
+        Args:
+            listener: Callable receiving a ChangeEvent
+        """
+        if self._batch is not None:
+            self._batch.joined.setdefault(listener, len(self._batch.events))
+        self._listeners.append(listener)
+    
+    def remove_listener(self, listener: Listener) -> None:
+        """Unregister a callback previously passed to add_listener."""
+        try:
+            self._listeners.remove(listener)
+        except ValueError:
+            pass
+    
+    def subscribe(self, maxsize: int = 1024, coalesce_window: float = 0.0) -> Subscription:
+        """
+        Subscribe to add, remove, update and reorder events.
+        
+        Args:
+            maxsize: Maximum number of undelivered events kept for this subscriber
+            coalesce_window: Seconds within which repeated updates to the same
+                task are merged into one event
+            
+        Returns:
+            A Subscription that can be consumed with get() or ``async for``
+        """
+        subscription = Subscription(self, maxsize, coalesce_window)
+        self.add_listener(subscription._publish)
+        return subscription
+    
+    def merkle_tree(self):
+        """
+        Return the list's Merkle tree, building it on first use.
+        
+        From then on the tree is updated on every change; it is used to diff
+        and sync replicas of the list (see todo_sync).
+        
+        Returns:
+            The list's todo_sync.MerkleTree
+        """
+        if self._merkle is None:
+            from todo_sync import MerkleTree
+            self._merkle = MerkleTree(self)
+        return self._merkle
+    
+    def dependency_graph(self):
+        """
+        Return the list's task dependency graph, creating it on first use.
+        
+        Returns:
+            The list's todo_dependencies.DependencyGraph
+        """
+        if self._dependencies is None:
+            from todo_dependencies import DependencyGraph
+            self._dependencies = DependencyGraph(self)
+        return self._dependencies
+    
+    def tag_index(self):
+        """
+        Return the list's tag bitmap index, building it on first use.
+        
+        Returns:
+            The list's todo_tags.TagIndex
+        """
+        if self._tag_index is None:
+            from todo_tags import TagIndex
+            self._tag_index = TagIndex(self)
+        return self._tag_index
+    
+    @contextmanager
+    def batch(self, pause_gc: bool = False) -> Iterator[ToDoList]:
+        """
+        Apply several changes as one transaction.
+        
+        Inside the block the list changes as usual, and reads see the
+        changes made so far, but listeners (indexes, subscriptions,
+        autosave) are not told until the block ends.  They then receive
+        at most one event per task, with repeated updates merged, a task
+        both added and removed in the block left out, and all reorders
+        folded into one REORDER at the end.  Slots are compacted once, at
+        the end.  If the block raises, every change is undone, no event is
+        delivered and the exception propagates.
+        
+        A batch opened inside another one is a savepoint of it: if the
+        inner block raises, only its own changes (and their events) are
+        undone, and the outer batch carries on if it catches the
+        exception.  Its changes are delivered when the outermost batch
+        ends.
+        
+        If a listener raises while the events are delivered, the remaining
+        listeners still get every event, and the first exception is
+        raised afterwards; the changes themselves stay applied.
+        
+        Args:
+            pause_gc: Pause the cyclic garbage collector (for the whole
+                process) until the batch ends.  The undo journal and the
+                deferred events grow with every change and each full
+                collection rescans them, so this speeds up batches of
+                many thousands of changes.  Ignored for a nested batch.
+        
+        Yields:
+            The list itself
+        """
+        batch = self._batch
+        if batch is not None:
+            batch.savepoint()
+            try:
+                yield self
+            except BaseException:
+                batch.rollback()
+                raise
+            batch.release()
+            return
+        batch = self._batch = _Batch(self)
+        with _gc_paused() if pause_gc else nullcontext():
+            try:
+                yield self
+            except BaseException:
+                self._batch = None
+                batch.rollback()
+                raise
+            self._batch = None
+            batch.commit()
+    
+    def query_cache(self):
+        """
+        Return the list's query-result cache, creating it on first use.
+        
+        From then on find_tasks_by_status() and get_tasks_by_priority() are
+        answered from the cache until the list changes.
+        
+        Returns:
+            The list's todo_query.QueryCache
+        """
+        if self._query_cache is None:
+            from todo_query import QueryCache
+            self._query_cache = QueryCache(self)
+        return self._query_cache
+    
+    def _emit(self, kind: ChangeKind, task: Optional[Task] = None,
+              changes: Optional[dict] = None) -> None:
+        """Count a change and deliver it to all registered listeners (at commit in a batch)."""
+        self._version += 1
+        if self._listeners:
+            if self._batch is not None:
+                self._batch.events.append((kind, task, changes))
+                return
+            event = ChangeEvent(kind, task, changes or {})
+            for listener in list(self._listeners):
+                listener(event)
+    
+    def _assign_id(self, task: Task) -> None:
+        """Keep a task's requested ID if it is free, otherwise issue a new one."""
+        task_id = task.task_id
+        if (task_id is None or task_id in self._by_id
+                or (self._archive is not None and task_id in self._archive)):
+            self._task_id_counter += 1
+            task_id = task.task_id = self._task_id_counter
+            task._record = None
+        elif task_id > self._task_id_counter:
+            self._task_id_counter = task_id
+        self._by_id[task_id] = task
+    
+    def _attach(self, task: Task) -> None:
+        """Take ownership of a newly stored task and announce it."""
+        task._owner = self
+        self._assign_id(task)
+        if self._batch is not None:
+            self._batch.attached(task)
+        cell = (task.status, task.priority)
+        self._cells[cell] = self._cells.get(cell, 0) + 1
+        self._emit(ChangeKind.ADD, task)
+    
+    def _detach(self, task: Task) -> None:
+        """Release a task that has left the list and announce it."""
+        task._owner = None
+        del self._by_id[task.task_id]
+        if self._batch is not None:
+            self._batch.journal.append((_DETACH, task))
+        self._uncount((task.status, task.priority))
+        self._emit(ChangeKind.REMOVE, task)
+    
+    def _uncount(self, cell: Tuple[TaskStatus, int]) -> None:
+        """Decrement a status x priority cell, dropping it when it empties."""
+        n = self._cells[cell] - 1
+        if n:
+            self._cells[cell] = n
+        else:
+            del self._cells[cell]
+    
+    def _task_changing(self, task: Task) -> None:
+        """Called by an owned task just before one of its fields changes."""
+        if self._batch is not None:
+            self._batch.save(task)
+    
+    def _task_changed(self, task: Task, changes: dict) -> None:
+        """Called by an owned task after one of its fields changed."""
+        if 'status' in changes or 'priority' in changes:
+            self._uncount((changes['status'][0] if 'status' in changes else task.status,
+                           changes['priority'][0] if 'priority' in changes else task.priority))
+            cell = (task.status, task.priority)
+            self._cells[cell] = self._cells.get(cell, 0) + 1
+        self._emit(ChangeKind.UPDATE, task, changes)
     
     def add_task(self, name: str, status: Union[TaskStatus, str] = TaskStatus.PENDING, 
-                 priority: int = 3) -> Task:
+                 priority: int = 3, due_at: Optional[datetime] = None,
+                 tags: Iterable[str] = ()) -> Task:
         """
         Add a new task to the list.
         
@@ -140,12 +758,14 @@ class ToDoList:
             name: The name/description of the task
             status: The status of the task
             priority: Priority level (1-5)
+            due_at: Optional deadline for the task
+            tags: Tags to attach to the task
             
         Returns:
             The created Task object
             
         Raises:
-            ValueError: If name is empty or priority is invalid
+            ValueError: If name or a tag is empty, or priority is invalid
         """
         if not name or not name.strip():
             raise ValueError("Task name cannot be empty")
@@ -157,8 +777,9 @@ class ToDoList:
             except ValueError:
                 raise ValueError(f"Invalid status: {status}. Must be one of {[s.value for s in TaskStatus]}")
         
-        task = Task(name.strip(), status, priority=priority)
-        self._tasks.append(task)
+        task = Task(name.strip(), status, priority=priority, due_at=due_at, tags=tags)
+        self._append_slot(task)
+        self._attach(task)
         logger.info(f"Added task: {task.name}")
         return task
     
@@ -172,9 +793,10 @@ class ToDoList:
         Returns:
             True if task was found and removed, False otherwise
         """
-        for i, task in enumerate(self._tasks):
-            if task.name.lower() == name.lower():
-                removed_task = self._tasks.pop(i)
+        name = name.lower()
+        for slot, task in enumerate(self._slots):
+            if task is not None and task.name.lower() == name:
+                removed_task = self._remove_slot(slot)
                 logger.info(f"Removed task: {removed_task.name}")
                 return True
         logger.warning(f"Task not found: {name}")
@@ -190,13 +812,14 @@ class ToDoList:
         Returns:
             The removed Task object, or None if index is invalid
         """
-        try:
-            removed_task = self._tasks.pop(index)
-            logger.info(f"Removed task by index {index}: {removed_task.name}")
-            return removed_task
-        except IndexError:
+        count = len(self)
+        position = index + count if index < 0 else index
+        if not 0 <= position < count:
             logger.warning(f"Invalid task index: {index}")
             return None
+        removed_task = self._remove_slot(self._slot_of(position))
+        logger.info(f"Removed task by index {index}: {removed_task.name}")
+        return removed_task
     
     def find_task(self, name: str) -> Optional[Task]:
         """
@@ -208,11 +831,94 @@ class ToDoList:
         Returns:
             The Task object if found, None otherwise
         """
-        for task in self._tasks:
-            if task.name.lower() == name.lower():
+        name = name.lower()
+        for task in self._live():
+            if task.name.lower() == name:
                 return task
         return None
     
+    def get_task_by_id(self, task_id: int, include_archived: bool = False) -> Optional[Task]:
+        """
+        Get a task by its stable ID in O(1).
+        
+        Args:
+            task_id: The ID assigned when the task was added or imported
+            include_archived: Also look the ID up in the list's archive (see
+                todo_archive); an archived task is returned as a detached copy
+            
+        Returns:
+            The Task object if found, None otherwise
+        """
+        task = self._by_id.get(task_id)
+        if task is None and include_archived and self._archive is not None:
+            task = self._archive.get(task_id)
+        return task
+    
+    def remove_task_by_id(self, task_id: int) -> Optional[Task]:
+        """
+        Remove a task by its stable ID in O(1).
+        
+        Args:
+            task_id: The ID of the task to remove
+            
+        Returns:
+            The removed Task object, or None if no task has that ID
+        """
+        task = self._by_id.get(task_id)
+        if task is None:
+            logger.warning(f"Task ID not found: {task_id}")
+            return None
+        self._remove_slot(task._slot)
+        logger.info(f"Removed task by ID {task_id}: {task.name}")
+        return task
+    
+    def mark_task_by_id(self, task_id: int, status: Union[TaskStatus, str]) -> bool:
+        """
+        Set the status of a task identified by its stable ID.
+        
+        Args:
+            task_id: The ID of the task to update
+            status: The new status
+            
+        Returns:
+            True if task was found and marked, False otherwise
+            
+        Raises:
+            ValueError: If status is not a valid TaskStatus
+        """
+        if isinstance(status, str):
+            try:
+                status = TaskStatus(status.lower())
+            except ValueError:
+                raise ValueError(f"Invalid status: {status}. Must be one of {[s.value for s in TaskStatus]}")
+        task = self._by_id.get(task_id)
+        if task is None:
+            logger.warning(f"Task ID not found for status change: {task_id}")
+            return False
+        task._update_status(status)
+        return True
+    
+    def set_priority_by_id(self, task_id: int, priority: int) -> bool:
+        """
+        Set the priority of a task identified by its stable ID.
+        
+        Args:
+            task_id: The ID of the task to update
+            priority: Priority level (1-5)
+            
+        Returns:
+            True if task was found and updated, False otherwise
+            
+        Raises:
+            ValueError: If priority is invalid
+        """
+        task = self._by_id.get(task_id)
+        if task is None:
+            logger.warning(f"Task ID not found for priority change: {task_id}")
+            return False
+        task.set_priority(priority)
+        return True
+    
     def find_tasks_by_status(self, status: Union[TaskStatus, str]) -> List[Task]:
         """
         Find all tasks with a specific status.
@@ -229,7 +935,9 @@ class ToDoList:
             except ValueError:
                 return []
         
-        return [task for task in self._tasks if task.status == status]
+        if self._query_cache is not None:
+            return list(self._query_cache.find_tasks_by_status(status))
+        return [task for task in self._live() if task.status == status]
     
     def mark_task_completed(self, name: str) -> bool:
         """
@@ -267,23 +975,27 @@ class ToDoList:
     
     def get_task_count(self) -> int:
         """Get the total number of tasks."""
-        return len(self._tasks)
+        return len(self)
+    
+    def _status_count(self, status: TaskStatus) -> int:
+        """Count tasks with a status from the status x priority cells."""
+        return sum(n for (cell_status, _), n in self._cells.items() if cell_status is status)
     
     def get_completed_count(self) -> int:
         """Get the number of completed tasks."""
-        return len(self.find_tasks_by_status(TaskStatus.COMPLETED))
+        return self._status_count(TaskStatus.COMPLETED)
     
     def get_pending_count(self) -> int:
         """Get the number of pending tasks."""
-        return len(self.find_tasks_by_status(TaskStatus.PENDING))
+        return self._status_count(TaskStatus.PENDING)
     
     def get_in_progress_count(self) -> int:
         """Get the number of in-progress tasks."""
-        return len(self.find_tasks_by_status(TaskStatus.IN_PROGRESS))
+        return self._status_count(TaskStatus.IN_PROGRESS)
     
     def get_cancelled_count(self) -> int:
         """Get the number of cancelled tasks."""
-        return len(self.find_tasks_by_status(TaskStatus.CANCELLED))
+        return self._status_count(TaskStatus.CANCELLED)
     
     def get_tasks_by_priority(self, priority: int) -> List[Task]:
         """
@@ -295,7 +1007,9 @@ class ToDoList:
         Returns:
             List of tasks with the specified priority
         """
-        return [task for task in self._tasks if task.priority == priority]
+        if self._query_cache is not None:
+            return list(self._query_cache.get_tasks_by_priority(priority))
+        return [task for task in self._live() if task.priority == priority]
     
     def sort_tasks_by_priority(self, reverse: bool = True) -> None:
         """
@@ -304,9 +1018,22 @@ class ToDoList:
         Args:
             reverse: If True, sort in descending order (highest priority first)
         """
-        self._tasks.sort(key=lambda task: task.priority, reverse=reverse)
+        self._sort(lambda task: task.priority, reverse)
         logger.info("Tasks sorted by priority")
     
+    def reorder_by_ids(self, task_ids: Iterable[int]) -> None:
+        """
+        Put the tasks in the order of the given IDs.
+        
+        Args:
+            task_ids: The ID of every task in the list, in the new order
+        
+        Raises:
+            KeyError: If a task's ID is missing from task_ids
+        """
+        position = {task_id: i for i, task_id in enumerate(task_ids)}
+        self._sort(lambda task: position[task.task_id])
+    
     def sort_tasks_by_name(self, reverse: bool = False) -> None:
         """
         Sort tasks by name alphabetically.
@@ -314,7 +1041,7 @@ class ToDoList:
         Args:
             reverse: If True, sort in reverse alphabetical order
         """
-        self._tasks.sort(key=lambda task: task.name.lower(), reverse=reverse)
+        self._sort(lambda task: task.name.lower(), reverse)
         logger.info("Tasks sorted by name")
     
     def sort_tasks_by_created_date(self, reverse: bool = False) -> None:
@@ -324,9 +1051,18 @@ class ToDoList:
         Args:
             reverse: If True, sort newest first
         """
-        self._tasks.sort(key=lambda task: task.created_at, reverse=reverse)
+        self._sort(lambda task: task.created_at, reverse)
         logger.info("Tasks sorted by creation date")
     
+    def _sort(self, key: Callable[[Task], object], reverse: bool = False) -> None:
+        """Sort the tasks in place (recording the old order in an open batch) and announce it."""
+        tasks = self._tasks
+        if self._batch is not None:
+            self._batch.journal.append((_ORDER, tasks[:]))
+        tasks.sort(key=key, reverse=reverse)
+        self._renumber()
+        self._emit(ChangeKind.REORDER)
+    
     def clear_completed_tasks(self) -> int:
         """
         Remove all completed tasks from the list.
@@ -334,36 +1070,92 @@ class ToDoList:
         Returns:
             Number of tasks removed
         """
-        initial_count = len(self._tasks)
-        self._tasks = [task for task in self._tasks if not task.is_completed()]
-        removed_count = initial_count - len(self._tasks)
+        removed_count = self._discard(
+            [task for task in self._live() if task.status is TaskStatus.COMPLETED])
         logger.info(f"Cleared {removed_count} completed tasks")
         return removed_count
     
-    def get_statistics(self) -> dict:
+    def _discard(self, tasks: List[Task]) -> int:
+        """Remove many owned tasks at once, leaving tombstones and compacting at the end."""
+        slots = self._slots
+        for task in tasks:
+            slots[task._slot] = None
+            if self._batch is not None:
+                self._batch.journal.append((_CLEAR, task._slot, task))
+            self._detach(task)
+        if tasks:
+            self._tombstones += len(tasks)
+            self._rank = None
+            self._maybe_compact()
+        return len(tasks)
+    
+    def get_statistics(self, include_archived: bool = False) -> dict:
         """
         Get comprehensive statistics about the todo list.
         
+        Args:
+            include_archived: Also count the tasks moved to the list's
+                archive (see todo_archive)
+        
         Returns:
             Dictionary containing various statistics
         """
-        total = len(self._tasks)
-        completed = self.get_completed_count()
-        pending = self.get_pending_count()
-        in_progress = self.get_in_progress_count()
-        cancelled = self.get_cancelled_count()
-        
-        return {
-            'total_tasks': total,
-            'completed': completed,
-            'pending': pending,
-            'in_progress': in_progress,
-            'cancelled': cancelled,
-            'completion_rate': (completed / total * 100) if total > 0 else 0,
-            'priority_distribution': {
-                str(i): len(self.get_tasks_by_priority(i)) for i in range(1, 6)
-            }
-        }
+        if include_archived and self._archive is not None:
+            cells = dict(self._cells)
+            for cell, n in self._archive.cells.items():
+                cells[cell] = cells.get(cell, 0) + n
+            return _statistics_from_cells(cells)
+        return _statistics_from_cells(self._cells)
+    
+    def cross_tab(self, time_bucket: Optional[str] = None,
+                  include_archived: bool = False) -> CrossTab:
+        """
+        Count tasks by status and priority, optionally split by creation time.
+        
+        Without time buckets the counts are read from cells kept up to date
+        on every change, so this takes constant time.  With time buckets the
+        tasks are counted in a single pass.
+        
+        Args:
+            time_bucket: 'day', 'week' (starting Monday) or 'month' to also
+                split the counts by created_at
+            include_archived: Also count the tasks moved to the list's
+                archive (see todo_archive)
+                
+        Returns:
+            A CrossTab of the counts
+            
+        Raises:
+            ValueError: If time_bucket is not a known bucket size
+        """
+        if time_bucket is None:
+            cells = {(status, priority, None): n for (status, priority), n in self._cells.items()}
+        else:
+            bucket_of = _TIME_BUCKETS.get(time_bucket)
+            if bucket_of is None:
+                raise ValueError(f"Unknown time bucket: {time_bucket!r}")
+            cells: Dict[Tuple[TaskStatus, int, Optional[date]], int] = {}
+            for task in self._live():
+                cell = (task.status, task.priority, bucket_of(task.created_at))
+                cells[cell] = cells.get(cell, 0) + 1
+        if include_archived and self._archive is not None:
+            for cell, n in self._archive.cross_tab(time_bucket).cells.items():
+                cells[cell] = cells.get(cell, 0) + n
+        return CrossTab(cells)
+    
+    def memory_report(self, traced: bool = False):
+        """
+        Estimate the memory held by the list, by component and per task.
+        
+        Args:
+            traced: Also attribute live allocations to the add, import and
+                export code paths (requires tracemalloc tracing, see todo_memory)
+                
+        Returns:
+            A todo_memory.MemoryReport
+        """
+        from todo_memory import memory_report
+        return memory_report(self, traced)
     
     def display_tasks(self, status_filter: Optional[Union[TaskStatus, str]] = None, 
                      show_statistics: bool = False) -> None:
@@ -383,7 +1175,7 @@ class ToDoList:
                 except ValueError:
                     print(f"Invalid status filter: {status_filter}")
                     return
-            tasks_to_show = [task for task in self._tasks if task.status == status_filter]
+            tasks_to_show = [task for task in self._live() if task.status == status_filter]
         
         if not tasks_to_show:
             print(f"No tasks found{' for the specified status' if status_filter else ''}!")
@@ -413,44 +1205,399 @@ class ToDoList:
         """
         Export tasks to a list of dictionaries for serialization.
         
+        Each task caches its record until it changes, so exporting a mostly
+        unchanged list again only copies the cached records.  The cyclic
+        garbage collector is paused while the records are built.
+        
         Returns:
             List of task dictionaries
         """
-        return [
-            {
-                'name': task.name,
-                'status': task.status.value,
-                'priority': task.priority,
-                'created_at': task.created_at.isoformat(),
-                'updated_at': task.updated_at.isoformat()
-            }
-            for task in self._tasks
-        ]
+        with _gc_paused():
+            return [_task_record(task) for task in self._live()]
     
-    def import_from_list(self, task_data: List[dict]) -> int:
+    def import_from_list(self, task_data: Iterable[dict], trusted: bool = False) -> int:
         """
         Import tasks from a list of dictionaries.
         
+        The ``created_at`` and ``updated_at`` fields written by export_to_list()
+        are restored.  A row whose two timestamps are the same string (every
+        task that was never modified) is parsed only once.
+        
         Args:
             task_data: List of task dictionaries
+            trusted: If True, the data is assumed to come from export_to_list()
+                and per-row validation is skipped; malformed rows raise instead
+                of being logged and skipped
             
         Returns:
             Number of tasks imported
         """
+        if trusted:
+            return self._import_trusted(task_data)
+        
         imported_count = 0
-        for data in task_data:
-            try:
-                status = TaskStatus(data.get('status', 'pending'))
-                priority = data.get('priority', 3)
-                task = Task(data['name'], status, priority=priority)
-                self._tasks.append(task)
-                imported_count += 1
-            except (KeyError, ValueError) as e:
-                logger.error(f"Failed to import task: {e}")
-                continue
+        with _gc_paused():
+            for data in task_data:
+                try:
+                    status = data.get('status', 'pending')
+                    if not isinstance(status, TaskStatus):
+                        status = _STATUS_BY_VALUE.get(status)
+                        if status is None:
+                            raise ValueError(f"{data['status']!r} is not a valid TaskStatus")
+                    priority = data.get('priority', 3)
+                    created = data.get('created_at')
+                    updated = data.get('updated_at')
+                    created_at = _parse_timestamp(created)
+                    updated_at = created_at if updated == created else _parse_timestamp(updated)
+                    task = Task(data['name'], status, created_at, updated_at, priority,
+                                data.get('id'), _parse_timestamp(data.get('due_at')),
+                                data.get('tags') or _NO_TAGS)
+                    self._append_slot(task)
+                    self._attach(task)
+                    imported_count += 1
+                except (KeyError, TypeError, ValueError) as e:
+                    logger.error(f"Failed to import task: {e}")
+                    continue
         
         logger.info(f"Imported {imported_count} tasks")
         return imported_count
+    
+    def _import_trusted(self, task_data: Iterable[dict]) -> int:
+        """
+        Import rows produced by export_to_list() without revalidating them.
+        
+        Tasks are built without running ``Task.__init__``: the instance dict
+        is filled directly, in field order so instances keep sharing keys.
+        """
+        new_task = object.__new__
+        statuses = _STATUS_BY_VALUE
+        parse = datetime.fromisoformat
+        # Current exports carry every key; older ones may lack the last three
+        record = itemgetter('name', 'status', 'created_at', 'updated_at', 'priority',
+                            'id', 'due_at', 'tags')
+        fields = itemgetter('name', 'status', 'created_at', 'updated_at', 'priority')
+        by_id = self._by_id
+        counter = self._task_id_counter
+        tasks: List[Task] = []
+        append = tasks.append
+        # Cells are counted by the raw (status, priority) pairs: hashing an
+        # enum member runs Python code, hashing its string value does not
+        raw_cells: List[Tuple[str, int]] = []
+        count = raw_cells.append
+        slot = len(self._slots)
+        with _gc_paused():
+            try:
+                for data in task_data:
+                    try:
+                        name, status, created, updated, priority, task_id, due_at, tags = record(data)
+                    except KeyError:
+                        name, status, created, updated, priority = fields(data)
+                        task_id, due_at, tags = data.get('id'), data.get('due_at'), data.get('tags')
+                    if task_id is None or task_id in by_id:
+                        counter += 1
+                        task_id = counter
+                    elif task_id > counter:
+                        counter = task_id
+                    task = new_task(Task)
+                    attrs = task.__dict__
+                    attrs['name'] = name
+                    attrs['status'] = statuses[status]
+                    attrs['created_at'] = created_at = parse(created)
+                    attrs['updated_at'] = created_at if updated == created else parse(updated)
+                    attrs['priority'] = priority
+                    count((status, priority))
+                    attrs['task_id'] = task_id
+                    attrs['due_at'] = parse(due_at) if due_at else None
+                    attrs['tags'] = frozenset(tags) if tags else _NO_TAGS
+                    attrs['_owner'] = self
+                    attrs['_slot'] = slot
+                    attrs['_text'] = attrs['_record'] = None
+                    by_id[task_id] = task
+                    slot += 1
+                    append(task)
+            except Exception:
+                for task in tasks:
+                    del by_id[task.task_id]
+                raise
+        self._task_id_counter = counter
+        self._slots.extend(tasks)
+        self._rank = None
+        if self._batch is not None and tasks:
+            self._batch.imported(tasks)
+        cells = self._cells
+        for (status, priority), n in Counter(raw_cells).items():
+            cell = (statuses[status], priority)
+            cells[cell] = cells.get(cell, 0) + n
+        self._version += 1
+        if self._listeners:
+            for task in tasks:
+                self._emit(ChangeKind.ADD, task)
+        logger.info(f"Imported {len(tasks)} tasks")
+        return len(tasks)
+
+
+# Kinds of entries in a batch's undo journal
+_FIELDS, _ATTACH, _DETACH, _APPEND, _POP, _CLEAR, _IMPORT, _SLOTS, _ORDER = range(9)
+# The task fields a batch saves before a change, and how it reads them
+_SAVED_FIELDS = tuple(sorted(_CONTENT_FIELDS))
+_saved_values = itemgetter(*_SAVED_FIELDS)
+
+
+class _Batch:
+    """
+    The undo journal and deferred events of an open ToDoList.batch().
+    
+    Every change made while the batch is open appends an entry holding
+    what it takes to undo it, so opening a batch costs nothing however
+    long the list is.  Each savepoint remembers where the journal and the
+    events stood, and the list's small scalar state, when it was set.
+    """
+    
+    def __init__(self, todo_list: ToDoList):
+        """Start the journal with the outermost savepoint."""
+        self.todo_list = todo_list
+        self.slots_object = todo_list._slots
+        self.journal: List[tuple] = []
+        self.savepoints: List[tuple] = []
+        # Tasks needing no saved fields in the innermost savepoint
+        self.saved: Set[int] = set()
+        self.events: List[Tuple[ChangeKind, Optional[Task], Optional[dict]]] = []
+        # Listeners added during the batch, and the first event they are owed
+        self.joined: Dict[Listener, int] = {}
+        self.savepoint()
+    
+    def savepoint(self) -> None:
+        """Start a nested level whose changes can be undone on their own."""
+        todo_list = self.todo_list
+        self.savepoints.append((len(self.journal), len(self.events), self.saved,
+                                todo_list._tombstones, todo_list._task_id_counter,
+                                dict(todo_list._cells)))
+        self.saved = set()
+    
+    def release(self) -> None:
+        """Fold the innermost savepoint into the one around it."""
+        saved = self.savepoints.pop()[2]
+        saved |= self.saved
+        self.saved = saved
+    
+    def save(self, task: Task) -> None:
+        """Keep a task's fields from before its first change since the savepoint."""
+        if id(task) not in self.saved:
+            self.saved.add(id(task))
+            self.journal.append((_FIELDS, task, _saved_values(task.__dict__)))
+    
+    def attached(self, task: Task) -> None:
+        """Record a task joining the list; undoing that detaches it again."""
+        self.saved.add(id(task))
+        self.journal.append((_ATTACH, task))
+    
+    def imported(self, tasks: List[Task]) -> None:
+        """Record tasks appended by a trusted import."""
+        self.saved.update(map(id, tasks))
+        self.journal.append((_IMPORT, tasks))
+    
+    def rollback(self) -> None:
+        """Undo every change since the innermost savepoint and drop its events."""
+        start, events, saved, tombstones, task_id_counter, cells = self.savepoints.pop()
+        todo_list = self.todo_list
+        by_id = todo_list._by_id
+        journal = self.journal
+        renumber = False
+        while len(journal) > start:
+            entry = journal.pop()
+            kind = entry[0]
+            if kind == _FIELDS:
+                attrs = entry[1].__dict__
+                attrs.update(zip(_SAVED_FIELDS, entry[2]))
+                attrs['_text'] = attrs['_record'] = None
+            elif kind == _ATTACH:
+                task = entry[1]
+                if by_id.get(task.task_id) is task:
+                    del by_id[task.task_id]
+                task._owner = None
+            elif kind == _DETACH:
+                task = entry[1]
+                task._owner = todo_list
+                by_id[task.task_id] = task
+            elif kind == _APPEND:
+                todo_list._slots.pop()
+            elif kind == _POP:
+                entry[1]._slot = len(todo_list._slots)
+                todo_list._slots.append(entry[1])
+            elif kind == _CLEAR:
+                _, slot, task = entry
+                todo_list._slots[slot] = task
+                task._slot = slot
+            elif kind == _IMPORT:
+                tasks = entry[1]
+                del todo_list._slots[-len(tasks):]
+                for task in tasks:
+                    del by_id[task.task_id]
+                    task._owner = None
+            elif kind == _SLOTS:
+                todo_list._slots = entry[1]
+                renumber = True
+            else:
+                todo_list._slots[:] = entry[1]
+                renumber = True
+        if renumber:
+            todo_list._renumber()
+        todo_list._tombstones = tombstones
+        todo_list._rank = None
+        todo_list._task_id_counter = task_id_counter
+        todo_list._cells = cells
+        del self.events[events:]
+        for listener, first in self.joined.items():
+            self.joined[listener] = min(first, events)
+        self.saved = saved
+        # Readers inside the batch may have cached results for its versions
+        todo_list._version += 1
+    
+    def commit(self) -> None:
+        """Deliver the merged events to every listener, then compact the slots if needed."""
+        todo_list = self.todo_list
+        # Slot-based indexes must rebuild if the slots were replaced (sorted or compacted)
+        reordered = todo_list._slots is not self.slots_object
+        starts: Dict[int, List[Listener]] = {}
+        for listener in todo_list._listeners:
+            starts.setdefault(self.joined.get(listener, 0), []).append(listener)
+        error = None
+        for start, listeners in sorted(starts.items()):
+            for event in _coalesce(self.events[start:], reordered):
+                for listener in listeners:
+                    try:
+                        listener(event)
+                    except Exception as e:
+                        if error is None:
+                            error = e
+        todo_list._maybe_compact()
+        if error is not None:
+            raise error
+
+
+def _coalesce(events: List[Tuple[ChangeKind, Optional[Task], Optional[dict]]],
+              reordered: bool = False) -> List[ChangeEvent]:
+    """Merge a batch's changes into at most one event per task, plus one final REORDER."""
+    merged: List[Optional[ChangeEvent]] = []
+    pending: Dict[int, int] = {}
+    for kind, task, changes in events:
+        if kind is ChangeKind.REORDER:
+            reordered = True
+            continue
+        index = pending.get(id(task))
+        if kind is ChangeKind.ADD:
+            pending[id(task)] = len(merged)
+            merged.append(ChangeEvent(kind, task))
+        elif kind is ChangeKind.UPDATE:
+            if index is None:
+                pending[id(task)] = len(merged)
+                merged.append(ChangeEvent(kind, task, dict(changes)))
+            elif merged[index].kind is ChangeKind.UPDATE:
+                fields = merged[index].changes
+                for name, (old, new) in changes.items():
+                    fields[name] = (fields[name][0] if name in fields else old, new)
+            # An update after the ADD is already reflected in the task
+        else:
+            pending.pop(id(task), None)
+            if index is not None and merged[index].kind is ChangeKind.ADD:
+                merged[index] = None
+            else:
+                merged.append(ChangeEvent(kind, task))
+    if reordered:
+        merged.append(ChangeEvent(ChangeKind.REORDER))
+    return [event for event in merged if event is not None]
+
+
+def _statistics_from_cells(cells: Dict[Tuple[TaskStatus, int], int]) -> dict:
+    """Build the ToDoList.get_statistics() dictionary from status x priority counts."""
+    statuses = dict.fromkeys(TaskStatus, 0)
+    priorities = dict.fromkeys(range(1, 6), 0)
+    for (status, priority), n in cells.items():
+        statuses[status] += n
+        priorities[priority] = priorities.get(priority, 0) + n
+    total = sum(statuses.values())
+    completed = statuses[TaskStatus.COMPLETED]
+    
+    return {
+        'total_tasks': total,
+        'completed': completed,
+        'pending': statuses[TaskStatus.PENDING],
+        'in_progress': statuses[TaskStatus.IN_PROGRESS],
+        'cancelled': statuses[TaskStatus.CANCELLED],
+        'completion_rate': (completed / total * 100) if total > 0 else 0,
+        'priority_distribution': {
+            str(i): priorities[i] for i in range(1, 6)
+        }
+    }
+
+
+def _parse_timestamp(value: Union[str, datetime, None]) -> Optional[datetime]:
+    """Parse an ISO-8601 timestamp; None and datetime objects pass through."""
+    if value is None or isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(value)
+
+
+def _task_record(task: Task) -> dict:
+    """Return a task in the format written by ToDoList.export_to_list()."""
+    record = task._record
+    if record is None:
+        record = task._record = {
+            'id': task.task_id,
+            'name': task.name,
+            'status': task.status.value,
+            'priority': task.priority,
+            'created_at': task.created_at.isoformat(),
+            'updated_at': task.updated_at.isoformat(),
+            'due_at': task.due_at.isoformat() if task.due_at else None,
+            'tags': sorted(task.tags)
+        }
+    # Callers may modify the record they get, so hand out a copy
+    copy = record.copy()
+    if task.tags:
+        copy['tags'] = list(record['tags'])
+    else:
+        copy['tags'] = []
+    return copy
+
+
+def _apply_record(todo_list: ToDoList, task: Task, row: dict) -> None:
+    """Overwrite an owned task's content with an exported record and report the change."""
+    todo_list._task_changing(task)
+    attrs = task.__dict__
+    changes = {}
+    for attr, value in (('name', row['name']),
+                        ('status', _STATUS_BY_VALUE[row['status']]),
+                        ('priority', row['priority']),
+                        ('created_at', _parse_timestamp(row['created_at'])),
+                        ('updated_at', _parse_timestamp(row['updated_at'])),
+                        ('due_at', _parse_timestamp(row.get('due_at'))),
+                        ('tags', _normalize_tags(row.get('tags') or ()))):
+        old = attrs[attr]
+        if old != value:
+            changes[attr] = (old, value)
+            attrs[attr] = value
+    if changes:
+        task._uncache()
+        todo_list._task_changed(task, changes)
+
+
+@contextmanager
+def _gc_paused():
+    """
+    Suspend the cyclic garbage collector while bulk-creating tasks.
+    
+    Allocating many objects triggers repeated collections that rescan
+    every task already built; none of them can be garbage yet.  Also used
+    by ToDoList.batch(pause_gc=True).
+    """
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
 
 
 def create_sample_todo_list() -> ToDoList:
@@ -478,6 +1625,10 @@ def main():
     """
     Main function to demonstrate the refactored ToDo application.
     """
+    # Configure logging here rather than at import, so library users and the
+    # command-line tool keep control of their own logging setup
+    logging.basicConfig(level=logging.INFO)
+    
     print("="*70)
     print("           REFACTORED TODO APPLICATION DEMONSTRATION")
     print("="*70)
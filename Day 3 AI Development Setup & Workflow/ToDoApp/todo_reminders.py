@@ -0,0 +1,401 @@
+"""
+Due-Date Reminders for the Refactored ToDo Application
+
+This module replaces scanning every task for overdue items with:
+
+- DeadlineIndex: the open tasks that have a deadline, ordered by due_at
+- TimerWheel: a hierarchical timer wheel firing callbacks at their deadline
+  in amortized O(1) per timer
+- Reminders: follows a ToDoList's changes and fires reminder and overdue
+  callbacks for its tasks, polled directly, from a background thread or
+  from an asyncio task
+
+Every component takes an injectable clock (seconds since the epoch), so
+tests can move time forward without waiting.
+"""
+
+from __future__ import annotations
+from typing import Callable, Dict, List, Optional, Tuple
+from bisect import bisect_right, insort
+from datetime import datetime, timedelta
+import math
+import threading
+import time
+
+from todo_events import ChangeEvent, ChangeKind
+from todo_refactored import Task, TaskStatus, ToDoList
+
+
+# Statuses of tasks that can still become overdue
+_OPEN = (TaskStatus.PENDING, TaskStatus.IN_PROGRESS)
+
+
+class DeadlineIndex:
+    """
+    The open tasks of a ToDoList that have a deadline, ordered by due_at.
+
+    Completed and cancelled tasks leave the index and return if reopened.
+    """
+
+    def __init__(self, todo_list: ToDoList):
+        """
+        Build the index for a list and start following its changes.
+
+        Args:
+            todo_list: The list to index
+        """
+        self.todo_list = todo_list
+        self._keys: List[Tuple[datetime, int]] = []
+        self._key_of: Dict[int, Tuple[datetime, int]] = {}
+        for task in todo_list:
+            self._add(task)
+        todo_list.add_listener(self._on_change)
+
+    def __len__(self) -> int:
+        """Return the number of indexed tasks."""
+        return len(self._keys)
+
+    def close(self) -> None:
+        """Stop following the list's changes."""
+        self.todo_list.remove_listener(self._on_change)
+
+    def _add(self, task: Task) -> None:
+        """Index a task if it is open and has a deadline."""
+        if task.due_at is not None and task.status in _OPEN:
+            key = self._key_of[task.task_id] = (task.due_at, task.task_id)
+            insort(self._keys, key)
+
+    def _remove(self, task: Task) -> None:
+        """Drop a task from the index."""
+        key = self._key_of.pop(task.task_id, None)
+        if key is not None:
+            del self._keys[bisect_right(self._keys, key) - 1]
+
+    def _on_change(self, event: ChangeEvent) -> None:
+        """Keep the index in step with the list."""
+        if event.kind is ChangeKind.ADD:
+            self._add(event.task)
+        elif event.kind is ChangeKind.REMOVE:
+            self._remove(event.task)
+        elif event.kind is ChangeKind.UPDATE and event.changes.keys() & {'due_at', 'status'}:
+            self._remove(event.task)
+            self._add(event.task)
+
+    def due_before(self, moment: datetime) -> List[Task]:
+        """
+        Get the open tasks due at or before a moment, earliest first.
+
+        Args:
+            moment: The cut-off time
+
+        Returns:
+            Matching tasks ordered by deadline
+        """
+        end = bisect_right(self._keys, (moment, math.inf))
+        get = self.todo_list.get_task_by_id
+        return [get(task_id) for _, task_id in self._keys[:end]]
+
+    def overdue(self, now: Optional[datetime] = None) -> List[Task]:
+        """Get the open tasks whose deadline has passed, earliest first."""
+        return self.due_before(now or datetime.now())
+
+    def next_due(self) -> Optional[Task]:
+        """Get the open task with the earliest deadline, or None."""
+        return self.todo_list.get_task_by_id(self._keys[0][1]) if self._keys else None
+
+
+class Timer:
+    """
+    A callback scheduled on a TimerWheel.
+
+    Attributes:
+        deadline: Clock time at or after which the callback fires
+        callback: Function called with no arguments when the timer fires
+        cancelled: True once cancel() was called
+    """
+
+    __slots__ = ('deadline', 'callback', 'cancelled', '_tick')
+
+    def __init__(self, deadline: float, callback: Callable[[], None], tick: int):
+        """Initialize a timer expiring at a wheel tick."""
+        self.deadline = deadline
+        self.callback = callback
+        self.cancelled = False
+        self._tick = tick
+
+    def cancel(self) -> None:
+        """Stop the timer from firing."""
+        self.cancelled = True
+
+
+class TimerWheel:
+    """
+    A hierarchical timer wheel.
+
+    Level 0 has ``slots`` slots of one tick each; every higher level has
+    ``slots`` slots each spanning a whole turn of the level below.  A timer
+    is placed on the lowest level whose range covers it and moves down one
+    level each time its slot comes round (a cascade), so scheduling and
+    firing cost O(1) per timer plus at most ``levels`` cascades.  Timers
+    beyond the top level's range wait in an overflow list.
+    """
+
+    def __init__(self, tick: float = 1.0, slots: int = 64, levels: int = 4,
+                 clock: Callable[[], float] = time.time):
+        """
+        Initialize an empty wheel at the current clock time.
+
+        Args:
+            tick: Resolution of the wheel in seconds
+            slots: Number of slots per level
+            levels: Number of levels
+            clock: Returns the current time in seconds (injectable for tests)
+
+        Raises:
+            ValueError: If tick is not positive, slots is below 2 or levels below 1
+        """
+        if tick <= 0 or slots < 2 or levels < 1:
+            raise ValueError("tick must be positive, slots at least 2 and levels at least 1")
+        self.tick = tick
+        self.slots = slots
+        self.levels = levels
+        self.clock = clock
+        self._wheels: List[List[List[Timer]]] = [[[] for _ in range(slots)] for _ in range(levels)]
+        self._overflow: List[Timer] = []
+        self._due: List[Timer] = []
+        self._current = math.floor(clock() / tick)
+        self._pending = 0
+
+    def __len__(self) -> int:
+        """Return the number of timers scheduled (including cancelled ones not yet dropped)."""
+        return self._pending
+
+    def schedule(self, deadline: float, callback: Callable[[], None]) -> Timer:
+        """
+        Schedule a callback.
+
+        Args:
+            deadline: Clock time at which to fire; deadlines in the current
+                tick or earlier fire on the next advance()
+            callback: Function called with no arguments
+
+        Returns:
+            A Timer that can be cancelled
+        """
+        timer = Timer(deadline, callback, math.ceil(deadline / self.tick))
+        if timer._tick <= self._current:
+            self._due.append(timer)
+        else:
+            self._place(timer)
+        self._pending += 1
+        return timer
+
+    def _place(self, timer: Timer) -> None:
+        """Put a timer on the lowest level whose range reaches its tick."""
+        delta = timer._tick - self._current
+        span = 1
+        for wheel in self._wheels:
+            if delta < span * self.slots:
+                wheel[(timer._tick // span) % self.slots].append(timer)
+                return
+            span *= self.slots
+        self._overflow.append(timer)
+
+    def advance(self) -> List[Timer]:
+        """
+        Move the wheel to the current clock time.
+
+        Returns:
+            The timers that expired, in deadline order within each tick; the
+            caller runs their callbacks (see run_due())
+        """
+        target = math.floor(self.clock() / self.tick)
+        expired: List[Timer] = []
+        if self._due:
+            due, self._due = self._due, []
+            due.sort(key=lambda timer: timer.deadline)
+            self._pending -= len(due)
+            expired.extend(timer for timer in due if not timer.cancelled)
+        while self._current < target:
+            if not self._pending:
+                self._current = target
+                break
+            self._current += 1
+            self._cascade()
+            slot = self._wheels[0][self._current % self.slots]
+            if slot:
+                self._wheels[0][self._current % self.slots] = []
+                slot.sort(key=lambda timer: timer.deadline)
+                self._pending -= len(slot)
+                expired.extend(timer for timer in slot if not timer.cancelled)
+        return expired
+
+    def _cascade(self) -> None:
+        """Move timers from higher levels down when their slot comes round."""
+        span = self.slots ** self.levels
+        if self._current % span == 0 and self._overflow:
+            overflow, self._overflow = self._overflow, []
+            for timer in overflow:
+                self._place(timer)
+        for level in range(self.levels - 1, 0, -1):
+            span = self.slots ** level
+            if self._current % span:
+                continue
+            index = (self._current // span) % self.slots
+            timers = self._wheels[level][index]
+            if timers:
+                self._wheels[level][index] = []
+                for timer in timers:
+                    if timer.cancelled:
+                        self._pending -= 1
+                    else:
+                        self._place(timer)
+
+    def run_due(self) -> int:
+        """
+        Advance to the current time and run the expired callbacks.
+
+        Returns:
+            Number of callbacks run
+        """
+        expired = self.advance()
+        for timer in expired:
+            timer.callback()
+        return len(expired)
+
+
+class Reminders:
+    """
+    Fires reminder and overdue callbacks for a ToDoList's deadlines.
+
+    Each open task with a deadline gets an overdue timer at due_at and,
+    if ``remind_before`` is set and the deadline is still ahead, a
+    reminder timer that much earlier.
+    Timers are rescheduled when the deadline or status changes and dropped
+    when the task is finished or removed, so nothing ever scans the list.
+    """
+
+    def __init__(self, todo_list: ToDoList, on_overdue: Callable[[Task], None],
+                 on_reminder: Optional[Callable[[Task], None]] = None,
+                 remind_before: Optional[timedelta] = None, tick: float = 1.0,
+                 clock: Callable[[], float] = time.time):
+        """
+        Start following a list's deadlines.
+
+        Args:
+            todo_list: The list to follow
+            on_overdue: Called with a task when its deadline passes while it
+                is still open
+            on_reminder: Called with a task remind_before ahead of its deadline
+            remind_before: How long before the deadline to remind
+            tick: Resolution of the timer wheel in seconds
+            clock: Returns the current time in seconds (injectable for tests)
+        """
+        self.todo_list = todo_list
+        self.on_overdue = on_overdue
+        self.on_reminder = on_reminder
+        self.remind_before = remind_before
+        self.index = DeadlineIndex(todo_list)
+        self.wheel = TimerWheel(tick=tick, clock=clock)
+        self._timers: Dict[int, List[Timer]] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        for task in todo_list:
+            self._schedule(task)
+        todo_list.add_listener(self._on_change)
+
+    def _schedule(self, task: Task) -> None:
+        """Schedule the timers for an open task with a deadline."""
+        if task.due_at is None or task.status not in _OPEN:
+            return
+        due = task.due_at.timestamp()
+        timers = [self.wheel.schedule(due, lambda: self._fire(task, self.on_overdue))]
+        if (self.on_reminder is not None and self.remind_before is not None
+                and due > self.wheel.clock()):
+            remind_at = due - self.remind_before.total_seconds()
+            timers.append(self.wheel.schedule(remind_at, lambda: self._fire(task, self.on_reminder)))
+        self._timers[task.task_id] = timers
+
+    def _cancel(self, task: Task) -> None:
+        """Cancel a task's timers."""
+        for timer in self._timers.pop(task.task_id, ()):
+            timer.cancel()
+
+    def _fire(self, task: Task, callback: Callable[[Task], None]) -> None:
+        """Run a callback for a task that is still open."""
+        if task.status in _OPEN:
+            callback(task)
+
+    def _on_change(self, event: ChangeEvent) -> None:
+        """Reschedule timers when deadlines or statuses change."""
+        with self._lock:
+            if event.kind is ChangeKind.ADD:
+                self._schedule(event.task)
+            elif event.kind is ChangeKind.REMOVE:
+                self._cancel(event.task)
+            elif event.kind is ChangeKind.UPDATE and event.changes.keys() & {'due_at', 'status'}:
+                self._cancel(event.task)
+                self._schedule(event.task)
+
+    def poll(self) -> int:
+        """
+        Fire every reminder and overdue callback that has come due.
+
+        Returns:
+            Number of callbacks run
+        """
+        with self._lock:
+            expired = self.wheel.advance()
+        for timer in expired:
+            timer.callback()
+        return len(expired)
+
+    def start(self, interval: Optional[float] = None) -> threading.Thread:
+        """
+        Poll from a daemon thread until stop() is called.
+
+        Args:
+            interval: Seconds between polls (the wheel's tick by default)
+
+        Returns:
+            The started thread
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return self._thread
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(interval or self.wheel.tick,),
+                                        name="todo-reminders", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def _run(self, interval: float) -> None:
+        """Body of the polling thread."""
+        while not self._stop.wait(interval):
+            self.poll()
+
+    def stop(self) -> None:
+        """Stop the polling thread, if any."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    async def run_async(self, interval: Optional[float] = None) -> None:
+        """
+        Poll from an asyncio task until it is cancelled.
+
+        Args:
+            interval: Seconds between polls (the wheel's tick by default)
+        """
+        import asyncio
+
+        while True:
+            self.poll()
+            await asyncio.sleep(interval or self.wheel.tick)
+
+    def close(self) -> None:
+        """Stop polling and stop following the list."""
+        self.stop()
+        self.todo_list.remove_listener(self._on_change)
+        self.index.close()
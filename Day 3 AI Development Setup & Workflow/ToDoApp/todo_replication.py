@@ -0,0 +1,534 @@
+"""
+Log-Shipping Replication for the Refactored ToDo Application
+
+This module streams a leader ToDoList's ordered change log to read-only
+follower replicas, usually running in other processes, so reads can be
+spread over several processes.
+
+Messages are tuples sent over ``multiprocessing`` connections (a Pipe or a
+``multiprocessing.connection`` Listener/Client pair):
+
+    ('snapshot', seq, time, name, rows)   full state as of seq
+    ('entry', seq, time, kind, payload)   one change, in log order
+    ('ack', seq)                          follower -> leader: applied up to seq
+
+A new follower is sent a snapshot followed by the live log.  A follower
+reattaching with the last sequence number it applied only gets the
+entries it missed, provided the leader's log still holds them.
+
+The leader never writes to a connection itself: each follower has a
+bounded outbox drained by its own sender thread, so a slow or stalled
+follower cannot block changes to the list.  A follower whose outbox fills
+up is detached, and can reattach to catch up from the log or a snapshot.
+"""
+
+from __future__ import annotations
+from typing import Any, Deque, Dict, List, Optional, Union
+from collections import deque
+from multiprocessing.connection import Connection, wait
+import threading
+import time
+
+from todo_events import ChangeEvent, ChangeKind
+from todo_refactored import Task, TaskStatus, ToDoList, _apply_record, _task_record
+
+
+# Follower methods that serve_reads() answers for remote clients
+READ_METHODS = frozenset({
+    'get_statistics', 'find_tasks_by_status', 'get_tasks_by_priority',
+    'get_task_by_id', 'get_task_count', 'list_tasks', 'export_to_list', 'lag',
+})
+
+
+class ReplicationError(Exception):
+    """Raised when a follower receives a log it cannot apply."""
+
+
+class _Outbox:
+    """
+    A follower's bounded queue of unsent messages, drained by a sender thread.
+
+    The thread owns the sending side of the connection and closes it when
+    the outbox is closed or a send fails.
+    """
+
+    def __init__(self, conn: Connection, maxsize: int):
+        """
+        Start the sender thread for a connection.
+
+        Args:
+            conn: The leader's end of a connection to the follower
+            maxsize: Maximum number of queued messages
+        """
+        self.conn = conn
+        self.maxsize = maxsize
+        self.closed = False
+        self._queue: Deque[tuple] = deque()
+        self._sending = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="todo-replication-sender",
+                                        daemon=True)
+        self._thread.start()
+
+    def put(self, message: tuple) -> bool:
+        """Queue a message; return False if the outbox is full or closed."""
+        with self._cond:
+            if self.closed or len(self._queue) >= self.maxsize:
+                return False
+            self._queue.append(message)
+            self._cond.notify()
+            return True
+
+    def close(self) -> None:
+        """Drop the unsent messages and let the sender thread close the connection."""
+        with self._cond:
+            self.closed = True
+            self._queue.clear()
+            self._cond.notify()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued message was sent; return False on timeout."""
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: self.closed or not (self._queue or self._sending), timeout)
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        """Wait for the sender thread to finish (it may be blocked on a stalled follower)."""
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        """Send queued messages in order until closed or the connection breaks."""
+        try:
+            while True:
+                with self._cond:
+                    self._sending = False
+                    self._cond.notify_all()
+                    self._cond.wait_for(lambda: self._queue or self.closed)
+                    if self.closed:
+                        return
+                    message = self._queue.popleft()
+                    self._sending = True
+                self.conn.send(message)
+        except (OSError, ValueError):
+            with self._cond:
+                self.closed = True
+                self._queue.clear()
+                self._cond.notify_all()
+        finally:
+            self.conn.close()
+
+
+class Leader:
+    """
+    Ships every change made to a ToDoList to its attached followers.
+
+    Each change becomes a numbered log entry.  The most recent ``log_size``
+    entries are kept so a follower that reconnects can catch up without a
+    new snapshot.
+
+    Attributes:
+        overflows: Number of followers detached because their outbox filled up
+    """
+
+    def __init__(self, todo_list: ToDoList, log_size: int = 10_000,
+                 max_pending: int = 10_000):
+        """
+        Start logging a list's changes.
+
+        Args:
+            todo_list: The list to replicate
+            log_size: Number of recent entries kept for catching up
+            max_pending: Number of messages a follower may fall behind
+                before it is detached
+        """
+        if max_pending < 1:
+            raise ValueError("max_pending must be at least 1")
+        self.todo_list = todo_list
+        self.seq = 0
+        self.max_pending = max_pending
+        self.overflows = 0
+        self._log: Deque[tuple] = deque(maxlen=log_size)
+        self._followers: Dict[int, _Outbox] = {}
+        self._acked: Dict[int, int] = {}
+        self._next_follower = 0
+        todo_list.add_listener(self._on_change)
+
+    def _on_change(self, event: ChangeEvent) -> None:
+        """Append a change to the log and ship it to every follower."""
+        if event.kind is ChangeKind.REMOVE:
+            payload = event.task.task_id
+        elif event.kind is ChangeKind.REORDER:
+            payload = [task.task_id for task in self.todo_list]
+        else:
+            payload = _task_record(event.task)
+        self.seq += 1
+        entry = ('entry', self.seq, time.time(), event.kind, payload)
+        self._log.append(entry)
+        for follower_id in list(self._followers):
+            self._send(follower_id, entry)
+
+    def _send(self, follower_id: int, message: tuple) -> None:
+        """Queue a message for a follower, detaching it if it fell behind or broke."""
+        outbox = self._followers[follower_id]
+        if not outbox.put(message):
+            if not outbox.closed:
+                self.overflows += 1
+            self.detach(follower_id)
+
+    def flush(self, timeout: Optional[float] = 5.0) -> bool:
+        """
+        Wait until every queued message has been handed to its connection.
+
+        Args:
+            timeout: Maximum number of seconds to wait per follower
+
+        Returns:
+            True if every outbox was drained in time
+        """
+        return all([outbox.flush(timeout) for outbox in list(self._followers.values())])
+
+    def snapshot(self) -> tuple:
+        """Return a snapshot message of the list as of the current sequence number."""
+        return ('snapshot', self.seq, time.time(), self.todo_list.name,
+                self.todo_list.export_to_list())
+
+    def attach(self, conn: Connection, since: Optional[int] = None) -> int:
+        """
+        Start shipping the log to a follower.
+
+        Args:
+            conn: The leader's end of a connection to the follower
+            since: The last sequence number the follower applied, if it is
+                reconnecting with an existing replica
+
+        Returns:
+            An ID for the follower, used by detach() and lag()
+        """
+        follower_id = self._next_follower
+        self._next_follower += 1
+        self._followers[follower_id] = _Outbox(conn, self.max_pending)
+        oldest = self._log[0][1] if self._log else self.seq + 1
+        if (since is not None and oldest - 1 <= since <= self.seq
+                and self.seq - since <= self.max_pending):
+            self._acked[follower_id] = since
+            for entry in self._log:
+                if entry[1] > since:
+                    self._send(follower_id, entry)
+        else:
+            self._acked[follower_id] = 0
+            self._send(follower_id, self.snapshot())
+        return follower_id
+
+    def detach(self, follower_id: int) -> None:
+        """Stop shipping the log to a follower; its sender thread closes the connection."""
+        outbox = self._followers.pop(follower_id, None)
+        self._acked.pop(follower_id, None)
+        if outbox is not None:
+            outbox.close()
+
+    def lag(self) -> Dict[int, int]:
+        """
+        Collect follower acknowledgements and report how far behind each is.
+
+        Returns:
+            Maps each follower ID to the number of entries it has not yet
+            acknowledged
+        """
+        for follower_id, outbox in list(self._followers.items()):
+            try:
+                while outbox.conn.poll():
+                    message = outbox.conn.recv()
+                    if message[0] == 'ack':
+                        self._acked[follower_id] = message[1]
+            except (EOFError, OSError):
+                self.detach(follower_id)
+        return {follower_id: self.seq - acked for follower_id, acked in self._acked.items()}
+
+    def close(self) -> None:
+        """Stop logging and disconnect every follower."""
+        self.todo_list.remove_listener(self._on_change)
+        outboxes = list(self._followers.values())
+        for follower_id in list(self._followers):
+            self.detach(follower_id)
+        for outbox in outboxes:
+            # A follower that stopped reading keeps its sender blocked; do not wait for it
+            outbox.join(timeout=1.0)
+
+
+class Follower:
+    """
+    A read-only replica of a leader's list, kept current by applying its log.
+
+    Read methods first apply whatever part of the log has arrived, so a
+    follower serving reads never needs a separate replication thread.
+
+    Attributes:
+        replica: The replicated ToDoList (None until the snapshot arrives)
+        applied_seq: Sequence number of the last applied change
+        replay_delay: Seconds between the leader logging the last applied
+            change and this follower applying it
+        connected: False once the leader has closed the connection
+    """
+
+    def __init__(self, conn: Connection):
+        """
+        Initialize a follower.
+
+        Args:
+            conn: The follower's end of a connection attached to a Leader
+        """
+        self.conn = conn
+        self.replica: Optional[ToDoList] = None
+        self.applied_seq = 0
+        self.replay_delay = 0.0
+        self.connected = True
+
+    def replicate(self, timeout: float = 0.0) -> int:
+        """
+        Apply every log message that has arrived and acknowledge it.
+
+        Once the leader closes the connection, replication stops and the
+        replica keeps serving its last applied state.
+
+        Args:
+            timeout: Seconds to wait for the first message
+
+        Returns:
+            Number of messages applied
+
+        Raises:
+            ReplicationError: If the log has a gap or arrives before a snapshot
+        """
+        applied = 0
+        if not self.connected:
+            return applied
+        try:
+            while self.conn.poll(timeout if applied == 0 else 0):
+                self._apply(self.conn.recv())
+                applied += 1
+            if applied:
+                self.conn.send(('ack', self.applied_seq))
+        except (EOFError, OSError):
+            self.connected = False
+        return applied
+
+    def reconnect(self, conn: Connection) -> None:
+        """
+        Switch to a new connection, e.g. after Leader.attach(conn, since=applied_seq).
+
+        Args:
+            conn: The follower's end of the new connection
+        """
+        self.conn = conn
+        self.connected = True
+
+    def wait_for(self, seq: int, timeout: float = 5.0) -> bool:
+        """
+        Replicate until a sequence number has been applied.
+
+        Args:
+            seq: The leader sequence number to wait for
+            timeout: Maximum number of seconds to wait
+
+        Returns:
+            True if the replica reached seq in time
+        """
+        deadline = time.monotonic() + timeout
+        while self.applied_seq < seq:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not self.connected:
+                return False
+            self.replicate(remaining)
+        return True
+
+    def _apply(self, message: tuple) -> None:
+        """Apply one snapshot or log entry to the replica."""
+        if message[0] == 'snapshot':
+            _, seq, logged_at, name, rows = message
+            self.replica = ToDoList(name)
+            self.replica.import_from_list(rows, trusted=True)
+        else:
+            _, seq, logged_at, kind, payload = message
+            if seq <= self.applied_seq:
+                return
+            if self.replica is None or seq != self.applied_seq + 1:
+                raise ReplicationError(f"Expected entry {self.applied_seq + 1}, got {seq}")
+            replica = self.replica
+            if kind is ChangeKind.ADD:
+                replica.import_from_list([payload], trusted=True)
+            elif kind is ChangeKind.REMOVE:
+                replica.remove_task_by_id(payload)
+            elif kind is ChangeKind.UPDATE:
+                _apply_record(replica, replica.get_task_by_id(payload['id']), payload)
+            else:
+                replica.reorder_by_ids(payload)
+        self.applied_seq = seq
+        self.replay_delay = max(0.0, time.time() - logged_at)
+
+    def lag(self) -> dict:
+        """
+        Report this follower's replication position.
+
+        Returns:
+            Dictionary with the last applied sequence number and the replay
+            delay of the last applied change in seconds
+        """
+        self.replicate()
+        return {'applied_seq': self.applied_seq, 'replay_delay': self.replay_delay}
+
+    def _read(self) -> ToDoList:
+        """Catch up with the log and return the replica for a read."""
+        self.replicate()
+        if self.replica is None:
+            raise ReplicationError("No snapshot received yet")
+        return self.replica
+
+    def get_statistics(self) -> dict:
+        """Get statistics about the replicated list."""
+        return self._read().get_statistics()
+
+    def get_task_count(self) -> int:
+        """Get the number of tasks in the replicated list."""
+        return self._read().get_task_count()
+
+    def get_task_by_id(self, task_id: int) -> Optional[Task]:
+        """Find a replicated task by its ID."""
+        return self._read().get_task_by_id(task_id)
+
+    def find_tasks_by_status(self, status: Union[TaskStatus, str]) -> List[Task]:
+        """Find all replicated tasks with a specific status."""
+        return self._read().find_tasks_by_status(status)
+
+    def get_tasks_by_priority(self, priority: int) -> List[Task]:
+        """Get all replicated tasks with a specific priority."""
+        return self._read().get_tasks_by_priority(priority)
+
+    def list_tasks(self, status: Optional[Union[TaskStatus, str]] = None,
+                   priority: Optional[int] = None) -> List[Task]:
+        """
+        List replicated tasks, optionally filtered by status and/or priority.
+
+        Args:
+            status: Only include tasks with this status
+            priority: Only include tasks with this priority
+
+        Returns:
+            Matching tasks in list order
+        """
+        tasks = self._read().find_tasks_by_status(status) if status else list(self._read())
+        if priority is not None:
+            tasks = [task for task in tasks if task.priority == priority]
+        return tasks
+
+    def export_to_list(self) -> List[dict]:
+        """Export the replicated tasks to a list of dictionaries."""
+        return self._read().export_to_list()
+
+
+def _plain(result: Any) -> Any:
+    """Convert tasks in a read result to exported records so they can be pickled."""
+    if isinstance(result, Task):
+        return _task_record(result)
+    if isinstance(result, list):
+        return [_task_record(item) if isinstance(item, Task) else item for item in result]
+    return result
+
+
+def serve_reads(follower: Follower, conn: Connection) -> None:
+    """
+    Apply the log and answer read requests until the client disconnects.
+
+    Requests are ``(method, args)`` tuples naming one of READ_METHODS;
+    replies are ``('ok', result)`` or ``('error', message)``.  Tasks in
+    results are sent as exported records.
+
+    Args:
+        follower: The follower to serve reads from
+        conn: A connection to a ReadClient
+    """
+    sources = [follower.conn, conn]
+    failure = None
+    while True:
+        ready = wait(sources)
+        if follower.conn in ready:
+            try:
+                follower.replicate()
+            except ReplicationError as e:
+                failure = _stop_replicating(follower, e)
+            if not follower.connected and follower.conn in sources:
+                sources.remove(follower.conn)
+        if conn not in ready:
+            continue
+        try:
+            method, args = conn.recv()
+        except EOFError:
+            return
+        try:
+            if failure is not None:
+                raise failure
+            if method not in READ_METHODS:
+                raise ValueError(f"Unknown read method: {method!r}")
+            reply = ('ok', _plain(getattr(follower, method)(*args)))
+        except ReplicationError as e:
+            if failure is None:
+                failure = _stop_replicating(follower, e)
+                if follower.conn in sources:
+                    sources.remove(follower.conn)
+            reply = ('error', str(failure))
+        except (KeyError, TypeError, ValueError) as e:
+            reply = ('error', str(e))
+        conn.send(reply)
+
+
+def _stop_replicating(follower: Follower, error: ReplicationError) -> ReplicationError:
+    """Disconnect a follower whose log could not be applied; reads then report the error."""
+    follower.connected = False
+    return ReplicationError(f"Replication stopped: {error}")
+
+
+def run_follower(log_conn: Connection, read_conn: Connection) -> None:
+    """
+    Entry point for a follower process.
+
+    Args:
+        log_conn: Connection attached to the leader with Leader.attach()
+        read_conn: Connection on which to answer a ReadClient
+    """
+    serve_reads(Follower(log_conn), read_conn)
+
+
+class ReadClient:
+    """Sends read requests to a follower process running serve_reads()."""
+
+    def __init__(self, conn: Connection):
+        """
+        Initialize a read client.
+
+        Args:
+            conn: A connection to the follower's read end
+        """
+        self.conn = conn
+
+    def call(self, method: str, *args) -> Any:
+        """
+        Run a read method on the follower.
+
+        Args:
+            method: One of READ_METHODS
+            *args: Arguments for the method
+
+        Returns:
+            The method's result, with tasks as exported records
+
+        Raises:
+            ValueError: If the follower reported an error
+        """
+        self.conn.send((method, args))
+        status, result = self.conn.recv()
+        if status == 'error':
+            raise ValueError(result)
+        return result
+
+    def close(self) -> None:
+        """Disconnect, which stops the follower's serve_reads() loop."""
+        self.conn.close()
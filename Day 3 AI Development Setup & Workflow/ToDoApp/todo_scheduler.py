@@ -0,0 +1,127 @@
+"""
+Next-Task Scheduler for the Refactored ToDo Application
+
+This module keeps a heap of a ToDoList's pending tasks so workers can pick
+the next task in O(log n) instead of filtering and sorting the whole list.
+
+Tasks are ordered by priority, highest first.  With aging, a task gains
+``aging_rate`` priority levels per hour it has existed.  Since every task
+ages at the same rate, comparing ``priority + rate * age`` between two tasks
+gives the same answer at any time as comparing ``priority - rate *
+created_at``, so heap keys never need to be recomputed as time passes.
+Ties go to the older task.
+"""
+
+from __future__ import annotations
+from typing import Dict, List, Optional
+from itertools import count
+import heapq
+
+from todo_events import ChangeEvent, ChangeKind
+from todo_refactored import Task, TaskStatus, ToDoList
+
+
+# Heap entry layout: [key, created timestamp, task ID, push number, task or
+# None if stale]; the push number keeps a stale and a fresh entry for the
+# same task from ever comparing their tasks
+_TASK = 4
+
+
+class Scheduler:
+    """
+    A priority queue of a ToDoList's pending tasks, kept up to date from its changes.
+
+    Entries for tasks that were removed, started or reprioritized elsewhere
+    are marked stale and skipped lazily when they reach the top of the heap.
+    """
+
+    def __init__(self, todo_list: ToDoList, aging_rate: float = 0.0):
+        """
+        Build the queue for a list and start following its changes.
+
+        Args:
+            todo_list: The list to schedule tasks from
+            aging_rate: Priority levels a task gains per hour since creation
+
+        Raises:
+            ValueError: If aging_rate is negative
+        """
+        if aging_rate < 0:
+            raise ValueError("aging_rate must not be negative")
+        self.todo_list = todo_list
+        self.aging_rate = aging_rate
+        self._heap: List[list] = []
+        self._entries: Dict[int, list] = {}
+        self._pushes = count()
+        for task in todo_list:
+            if task.status is TaskStatus.PENDING:
+                self._entries[task.task_id] = self._entry(task)
+        self._heap = list(self._entries.values())
+        heapq.heapify(self._heap)
+        todo_list.add_listener(self._on_change)
+
+    def __len__(self) -> int:
+        """Return the number of pending tasks in the queue."""
+        return len(self._entries)
+
+    def close(self) -> None:
+        """Stop following the list's changes."""
+        self.todo_list.remove_listener(self._on_change)
+
+    def _entry(self, task: Task) -> list:
+        """Build a heap entry for a task."""
+        created = task.created_at.timestamp()
+        return [self.aging_rate * created / 3600 - task.priority, created, task.task_id,
+                next(self._pushes), task]
+
+    def _push(self, task: Task) -> None:
+        """Queue a pending task."""
+        entry = self._entries[task.task_id] = self._entry(task)
+        heapq.heappush(self._heap, entry)
+
+    def _discard(self, task: Task) -> None:
+        """Mark a task's entry stale, rebuilding the heap if most entries are stale."""
+        entry = self._entries.pop(task.task_id, None)
+        if entry is None:
+            return
+        entry[_TASK] = None
+        if len(self._heap) > 2 * len(self._entries) + 16:
+            self._heap = list(self._entries.values())
+            heapq.heapify(self._heap)
+
+    def _on_change(self, event: ChangeEvent) -> None:
+        """Keep the queue in step with the list."""
+        task = event.task
+        if event.kind is ChangeKind.ADD:
+            if task.status is TaskStatus.PENDING:
+                self._push(task)
+        elif event.kind is ChangeKind.REMOVE:
+            self._discard(task)
+        elif event.kind is ChangeKind.UPDATE and event.changes.keys() & {'status', 'priority', 'created_at'}:
+            self._discard(task)
+            if task.status is TaskStatus.PENDING:
+                self._push(task)
+
+    def peek_next(self) -> Optional[Task]:
+        """
+        Return the pending task that should be worked on next.
+
+        Returns:
+            The highest-ranked pending task, or None if there is none
+        """
+        heap = self._heap
+        while heap and heap[0][_TASK] is None:
+            heapq.heappop(heap)
+        return heap[0][_TASK] if heap else None
+
+    def claim_next(self) -> Optional[Task]:
+        """
+        Take the next pending task and mark it in progress.
+
+        Returns:
+            The claimed task, or None if no task is pending
+        """
+        task = self.peek_next()
+        if task is not None:
+            task.mark_in_progress()
+        return task
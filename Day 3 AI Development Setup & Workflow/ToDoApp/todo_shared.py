@@ -0,0 +1,433 @@
+"""
+Shared-Memory Columnar Snapshots for the Refactored ToDo Application
+
+This module publishes read-only snapshots of a ToDoList into
+``multiprocessing.shared_memory`` so analytics workers in other processes
+can attach to them instead of each loading a copy of the list.
+
+A snapshot generation is one shared memory block laid out in columns:
+
+    header      magic, generation, task count, name bytes (4 x 8 bytes)
+    ids         int64 per task
+    created     float64 per task (POSIX timestamp)
+    updated     float64 per task
+    due         float64 per task (NaN if no deadline)
+    name_ends   uint64 per task: end offset of the task's name
+    status      uint8 per task (index into STATUS_CODES)
+    priority    uint8 per task
+    names       UTF-8 names, back to back
+
+Readers view the columns through ``memoryview.cast`` without copying.  A
+small control block names the current generation; the publisher writes each
+new generation completely before switching the control block to it (under a
+sequence counter, so readers never see a half-written name) and then
+unlinks the old one.  Readers still attached to an old generation keep their
+mapping until they close it.
+"""
+
+from __future__ import annotations
+from array import array
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, List, Optional, Tuple, Union
+import math
+import mmap
+import os
+import struct
+import time
+
+from todo_refactored import TaskStatus, ToDoList, _statistics_from_cells
+
+
+# Status codes stored in the status column
+STATUS_CODES = tuple(TaskStatus)
+
+_MAGIC = b"TODOCOL1"
+_HEADER = struct.Struct("<8sQQQ")
+# Control block: sequence counter (odd while being written), generation block name
+_CONTROL = struct.Struct("<Q64s")
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """
+    Attach to an existing block without registering it for cleanup.
+
+    Before Python 3.13 attaching registers the block with the resource
+    tracker, which unlinks it when the tracking process exits (or reports
+    it as leaked); only the publisher should do that.  Unregistering
+    afterwards is no better, since a worker may share its parent's tracker.
+    """
+    try:
+        return shared_memory.SharedMemory(name, track=False)
+    except TypeError:
+        pass
+    register = resource_tracker.register
+    resource_tracker.register = lambda *args: None
+    try:
+        return shared_memory.SharedMemory(name)
+    finally:
+        resource_tracker.register = register
+
+
+def _encode(todo_list: ToDoList, generation: int) -> List[memoryview]:
+    """Encode a list as the header and columns of a snapshot, as byte views."""
+    tasks = list(todo_list)
+    codes = {status: code for code, status in enumerate(STATUS_CODES)}
+    names = [task.name.encode("utf-8") for task in tasks]
+    name_ends = array("Q")
+    end = 0
+    for encoded in names:
+        end += len(encoded)
+        name_ends.append(end)
+    columns = (
+        _HEADER.pack(_MAGIC, generation, len(tasks), end),
+        array("q", [task.task_id for task in tasks]),
+        array("d", [task.created_at.timestamp() for task in tasks]),
+        array("d", [task.updated_at.timestamp() for task in tasks]),
+        array("d", [task.due_at.timestamp() if task.due_at else math.nan for task in tasks]),
+        name_ends,
+        array("B", [codes[task.status] for task in tasks]),
+        array("B", [task.priority for task in tasks]),
+        b"".join(names),
+    )
+    return [memoryview(column).cast("B") for column in columns]
+
+
+def _retire(block: shared_memory.SharedMemory) -> None:
+    """Detach from and unlink a block this process owns."""
+    block.close()
+    block.unlink()
+
+
+class SnapshotPublisher:
+    """
+    Publishes generations of a ToDoList's columnar snapshot to shared memory.
+
+    Workers attach with SnapshotReader(publisher.name).  The publisher owns
+    the blocks: close() unlinks them.
+    """
+
+    def __init__(self, todo_list: ToDoList, name: Optional[str] = None):
+        """
+        Create the control block and publish the first generation.
+
+        Args:
+            todo_list: The list to publish
+            name: Name of the control block (random if None)
+        """
+        self.todo_list = todo_list
+        self.generation = 0
+        self._control = shared_memory.SharedMemory(name, create=True, size=_CONTROL.size)
+        self._current: Optional[shared_memory.SharedMemory] = None
+        self.publish()
+
+    @property
+    def name(self) -> str:
+        """The control block's name, passed to readers."""
+        return self._control.name
+
+    @property
+    def block_name(self) -> str:
+        """The current generation's block name (see attach_snapshot())."""
+        return self._current.name
+
+    def publish(self) -> int:
+        """
+        Write a snapshot of the list as a new generation and switch readers to it.
+
+        Returns:
+            The new generation number
+        """
+        self.generation += 1
+        chunks = _encode(self.todo_list, self.generation)
+        block = shared_memory.SharedMemory(create=True, size=sum(map(len, chunks)))
+        offset = 0
+        for chunk in chunks:
+            block.buf[offset:offset + len(chunk)] = chunk
+            offset += len(chunk)
+        self._switch(block)
+        return self.generation
+
+    def _switch(self, block: shared_memory.SharedMemory) -> None:
+        """Point the control block at a new generation and retire the old one."""
+        buf = self._control.buf
+        sequence = _CONTROL.unpack_from(buf)[0]
+        struct.pack_into("<Q", buf, 0, sequence + 1)
+        _CONTROL.pack_into(buf, 0, sequence + 1, block.name.encode())
+        struct.pack_into("<Q", buf, 0, sequence + 2)
+        old, self._current = self._current, block
+        if old is not None:
+            _retire(old)
+
+    def close(self) -> None:
+        """Unlink the current generation and the control block."""
+        for block in (self._current, self._control):
+            if block is not None:
+                _retire(block)
+        self._current = None
+
+
+class ColumnarSnapshot:
+    """
+    A read-only view of one snapshot generation in shared memory.
+
+    Column attributes are memoryviews over the shared block; they are
+    released by close(), after which the snapshot must not be used.
+    """
+
+    def __init__(self, block: shared_memory.SharedMemory):
+        """
+        Map the columns of an attached generation block.
+
+        Args:
+            block: The attached block
+
+        Raises:
+            ValueError: If the block does not hold a snapshot
+        """
+        self._block = block
+        magic, self.generation, count, names_size = _HEADER.unpack_from(block.buf)
+        if magic != _MAGIC:
+            raise ValueError(f"Shared memory block {block.name!r} does not hold a task snapshot")
+        self._views: List[memoryview] = []
+        offset = _HEADER.size
+
+        def column(fmt: str, length: int) -> memoryview:
+            nonlocal offset
+            width = struct.calcsize(fmt)
+            raw = block.buf[offset:offset + width * length]
+            offset += width * length
+            view = raw.cast(fmt)
+            self._views.extend((view, raw))
+            return view
+
+        self.ids = column("q", count)
+        self.created = column("d", count)
+        self.updated = column("d", count)
+        self.due = column("d", count)
+        self.name_ends = column("Q", count)
+        self.status = column("B", count)
+        self.priority = column("B", count)
+        self.names = column("B", names_size)
+
+    def __len__(self) -> int:
+        """Return the number of tasks in the snapshot."""
+        return len(self.ids)
+
+    def close(self) -> None:
+        """Release the column views and detach from the block."""
+        for view in reversed(self._views):
+            view.release()
+        self._views.clear()
+        self._block.close()
+
+    def name(self, row: int) -> str:
+        """Return the name of the task in a row."""
+        start = self.name_ends[row - 1] if row else 0
+        return bytes(self.names[start:self.name_ends[row]]).decode("utf-8")
+
+    def get_statistics(self) -> dict:
+        """
+        Get the same statistics as ToDoList.get_statistics() for the snapshot.
+
+        Each count is a single C-level scan of a one-byte column.
+
+        Returns:
+            Dictionary containing various statistics
+        """
+        return _statistics_from_cells(self.cell_counts())
+
+    def cell_counts(self, start: int = 0, stop: Optional[int] = None) -> Dict[Tuple[TaskStatus, int], int]:
+        """
+        Count the tasks in a range of rows by status and priority.
+
+        The status and priority columns are combined into one byte per row
+        (``status * 8 + priority``, which never carries into the next
+        byte) with big-integer arithmetic, then each combination is counted
+        with bytes.count, so no Python code runs per row.
+
+        Args:
+            start: First row
+            stop: Row after the last (the end of the snapshot if None)
+
+        Returns:
+            Nonzero counts keyed by (status, priority)
+        """
+        statuses = self.status[start:stop].tobytes()
+        priorities = self.priority[start:stop].tobytes()
+        combined = ((int.from_bytes(statuses, "little") << 3)
+                    + int.from_bytes(priorities, "little")).to_bytes(len(statuses), "little")
+        cells = {}
+        for code, status in enumerate(STATUS_CODES):
+            for priority in range(1, 6):
+                n = combined.count(code << 3 | priority)
+                if n:
+                    cells[(status, priority)] = n
+        return cells
+
+    def rows(self, status: Optional[Union[TaskStatus, str]] = None,
+             priority: Optional[int] = None, created_after: Optional[float] = None,
+             overdue_at: Optional[float] = None) -> List[int]:
+        """
+        Find the rows of tasks matching all given filters.
+
+        Args:
+            status: Status a task must have
+            priority: Priority a task must have
+            created_after: POSIX time a task must have been created after
+            overdue_at: POSIX time at which a task must be open and past
+                its deadline
+
+        Returns:
+            Matching row numbers, in list order
+        """
+        if isinstance(status, str):
+            status = TaskStatus(status.lower())
+        rows = range(len(self))
+        if status is not None:
+            code = STATUS_CODES.index(status)
+            column = self.status
+            rows = [row for row in rows if column[row] == code]
+        if priority is not None:
+            column = self.priority
+            rows = [row for row in rows if column[row] == priority]
+        if created_after is not None:
+            column = self.created
+            rows = [row for row in rows if column[row] > created_after]
+        if overdue_at is not None:
+            open_codes = (STATUS_CODES.index(TaskStatus.PENDING),
+                          STATUS_CODES.index(TaskStatus.IN_PROGRESS))
+            due, statuses = self.due, self.status
+            # NaN (no deadline) compares False
+            rows = [row for row in rows if due[row] <= overdue_at and statuses[row] in open_codes]
+        return list(rows)
+
+    def task_ids(self, **filters) -> List[int]:
+        """Return the IDs of the tasks matching rows(**filters)."""
+        ids = self.ids
+        return [ids[row] for row in self.rows(**filters)]
+
+
+class SnapshotReader:
+    """Attaches to the current generation of a publisher's snapshots."""
+
+    def __init__(self, name: str):
+        """
+        Attach to a publisher's control block.
+
+        Args:
+            name: SnapshotPublisher.name
+        """
+        self._control = _attach(name)
+
+    def _current_name(self) -> str:
+        """Read the current generation's block name, retrying around a switch."""
+        buf = self._control.buf
+        while True:
+            before, name = _CONTROL.unpack_from(buf)
+            if before % 2 == 0 and struct.unpack_from("<Q", buf)[0] == before:
+                return name.rstrip(b"\0").decode()
+            time.sleep(0)
+
+    def snapshot(self) -> ColumnarSnapshot:
+        """
+        Attach to the newest generation.
+
+        Returns:
+            A ColumnarSnapshot; close it when done
+        """
+        while True:
+            try:
+                return ColumnarSnapshot(_attach(self._current_name()))
+            except FileNotFoundError:
+                # Retired between reading its name and attaching; read again
+                continue
+
+    def close(self) -> None:
+        """Detach from the control block."""
+        self._control.close()
+
+
+def read_statistics(name: str) -> Dict[str, object]:
+    """
+    Attach to a publisher's newest snapshot, compute its statistics and detach.
+
+    Suitable as a worker-process entry point.
+
+    Args:
+        name: SnapshotPublisher.name
+
+    Returns:
+        The snapshot's get_statistics() result
+    """
+    reader = SnapshotReader(name)
+    try:
+        snapshot = reader.snapshot()
+        try:
+            return snapshot.get_statistics()
+        finally:
+            snapshot.close()
+    finally:
+        reader.close()
+
+
+def attach_snapshot(block_name: str) -> ColumnarSnapshot:
+    """
+    Attach to one specific generation block.
+
+    Args:
+        block_name: SnapshotPublisher.block_name at the time of interest
+
+    Returns:
+        A ColumnarSnapshot; close it when done
+
+    Raises:
+        FileNotFoundError: If the generation has been retired
+    """
+    return ColumnarSnapshot(_attach(block_name))
+
+
+class _FileBlock:
+    """A snapshot file mapped read-only, shaped like a SharedMemory block."""
+
+    def __init__(self, path: str):
+        """Map a file."""
+        self.name = path
+        with open(path, "rb") as handle:
+            self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        self.buf = memoryview(self._map)
+
+    def close(self) -> None:
+        """Unmap the file."""
+        self.buf.release()
+        self._map.close()
+
+
+def write_snapshot_file(todo_list: ToDoList, path: str) -> None:
+    """
+    Write a list in the columnar snapshot layout to a file, atomically.
+
+    Args:
+        todo_list: The list to write
+        path: Destination file
+    """
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as handle:
+        for chunk in _encode(todo_list, 0):
+            handle.write(chunk)
+    os.replace(temp_path, path)
+
+
+def open_snapshot_file(path: str) -> ColumnarSnapshot:
+    """
+    Map a snapshot file written by write_snapshot_file() without reading it.
+
+    Args:
+        path: The snapshot file
+
+    Returns:
+        A ColumnarSnapshot; close it when done
+
+    Raises:
+        ValueError: If the file does not hold a snapshot
+    """
+    return ColumnarSnapshot(_FileBlock(path))
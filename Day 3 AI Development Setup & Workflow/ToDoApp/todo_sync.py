@@ -0,0 +1,304 @@
+"""
+Merkle-Tree Sync for the Refactored ToDo Application
+
+This module keeps a Merkle tree over a ToDoList's task content so that two
+replicas of a list can find and exchange only the tasks that differ.
+
+A replica is either a MerkleTree in the same process or a RemoteTree talking
+to serve() over a socket; both answer the same four requests (shape, node
+hashes, leaf digests and task records), so diff() and pull() work with
+either.  The socket protocol is one JSON object per line.
+"""
+
+from __future__ import annotations
+from typing import Dict, List, Sequence, Tuple
+from hashlib import blake2b
+import json
+import socket
+
+from todo_events import ChangeEvent, ChangeKind
+from todo_refactored import Task, ToDoList, _apply_record, _task_record
+
+
+def task_digest(task: Task) -> int:
+    """
+    Hash a task's content to a 64-bit integer.
+
+    Args:
+        task: The task to hash
+
+    Returns:
+        Digest of the task's ID, name, status, priority, timestamps, deadline and tags
+    """
+    content = "\x1f".join((
+        str(task.task_id), task.name, task.status.value, str(task.priority),
+        task.created_at.isoformat(), task.updated_at.isoformat(),
+        task.due_at.isoformat() if task.due_at else "",
+        "\x1e".join(sorted(task.tags)),
+    ))
+    return int.from_bytes(blake2b(content.encode(), digest_size=8).digest(), "little")
+
+
+class MerkleTree:
+    """
+    A Merkle tree over a ToDoList's tasks, kept up to date from its change events.
+
+    Tasks are placed in ``fanout ** depth`` leaf buckets by task ID.  Each
+    node holds the XOR of the task digests below it, so a node's hash does
+    not depend on list order and adding, removing or changing a task
+    updates exactly one node per level.
+    """
+
+    def __init__(self, todo_list: ToDoList, fanout: int = 16, depth: int = 3):
+        """
+        Build the tree for a list and start following its changes.
+
+        Args:
+            todo_list: The list to track
+            fanout: Number of children per node
+            depth: Number of levels below the root
+
+        Raises:
+            ValueError: If fanout is below 2 or depth below 1
+        """
+        if fanout < 2 or depth < 1:
+            raise ValueError("fanout must be at least 2 and depth at least 1")
+        self.todo_list = todo_list
+        self.fanout = fanout
+        self.depth = depth
+        self._width = fanout ** depth
+        self._levels: List[List[int]] = [[0] * fanout ** level for level in range(depth + 1)]
+        self._leaves: Dict[int, Dict[int, int]] = {}
+        for task in todo_list:
+            self._add(task)
+        todo_list.add_listener(self._on_change)
+
+    @property
+    def root(self) -> int:
+        """The root hash; equal roots mean the replicas hold the same tasks."""
+        return self._levels[0][0]
+
+    def close(self) -> None:
+        """Stop following the list's changes."""
+        self.todo_list.remove_listener(self._on_change)
+
+    def _on_change(self, event: ChangeEvent) -> None:
+        """Rehash the task named by a change event."""
+        if event.kind is ChangeKind.ADD:
+            self._add(event.task)
+        elif event.kind is ChangeKind.REMOVE:
+            self._remove(event.task)
+        elif event.kind is ChangeKind.UPDATE:
+            self._update(event.task)
+
+    def _toggle(self, bucket: int, delta: int) -> None:
+        """XOR a digest change into a leaf and every node above it."""
+        for level in reversed(self._levels):
+            level[bucket] ^= delta
+            bucket //= self.fanout
+
+    def _add(self, task: Task) -> None:
+        """Add a task's digest to the tree."""
+        bucket = task.task_id % self._width
+        digest = task_digest(task)
+        self._leaves.setdefault(bucket, {})[task.task_id] = digest
+        self._toggle(bucket, digest)
+
+    def _remove(self, task: Task) -> None:
+        """Remove a task's digest from the tree."""
+        bucket = task.task_id % self._width
+        leaf = self._leaves[bucket]
+        self._toggle(bucket, leaf.pop(task.task_id))
+        if not leaf:
+            del self._leaves[bucket]
+
+    def _update(self, task: Task) -> None:
+        """Replace a task's digest after its content changed."""
+        bucket = task.task_id % self._width
+        leaf = self._leaves[bucket]
+        digest = task_digest(task)
+        self._toggle(bucket, leaf[task.task_id] ^ digest)
+        leaf[task.task_id] = digest
+
+    def shape(self) -> Tuple[int, int]:
+        """Return (fanout, depth); only trees of the same shape can be compared."""
+        return self.fanout, self.depth
+
+    def node_hashes(self, level: int, indices: Sequence[int]) -> List[int]:
+        """Return the hashes of the given nodes on one level (0 is the root)."""
+        nodes = self._levels[level]
+        return [nodes[i] for i in indices]
+
+    def leaf_digests(self, buckets: Sequence[int]) -> List[Dict[int, int]]:
+        """Return a task ID -> digest mapping for each of the given leaf buckets."""
+        return [dict(self._leaves.get(bucket, {})) for bucket in buckets]
+
+    def records(self, task_ids: Sequence[int]) -> List[dict]:
+        """Return exported records for those of the given task IDs that exist."""
+        tasks = (self.todo_list.get_task_by_id(task_id) for task_id in task_ids)
+        return [_task_record(task) for task in tasks if task is not None]
+
+    def diff(self, other) -> List[int]:
+        """
+        Find the tasks whose content differs from another replica.
+
+        The trees are compared top down and only the children of differing
+        nodes are requested, so the work grows with the number of changed
+        tasks rather than with the size of the list.
+
+        Args:
+            other: A MerkleTree or RemoteTree of the same shape
+
+        Returns:
+            Sorted IDs of tasks that differ or exist on only one side
+
+        Raises:
+            ValueError: If the trees have different shapes
+        """
+        if tuple(other.shape()) != self.shape():
+            raise ValueError("Cannot compare Merkle trees of different shapes")
+        fanout = self.fanout
+        indices = [0]
+        for level, nodes in enumerate(self._levels):
+            theirs = other.node_hashes(level, indices)
+            indices = [i for i, digest in zip(indices, theirs) if nodes[i] != digest]
+            if not indices:
+                return []
+            if level < self.depth:
+                indices = [child for i in indices for child in range(i * fanout, (i + 1) * fanout)]
+
+        differing = set()
+        for bucket, their_leaf in zip(indices, other.leaf_digests(indices)):
+            leaf = self._leaves.get(bucket, {})
+            differing.update(task_id for task_id in leaf.keys() | their_leaf.keys()
+                             if leaf.get(task_id) != their_leaf.get(task_id))
+        return sorted(differing)
+
+    def pull(self, other) -> int:
+        """
+        Bring every differing task in this list in line with another replica.
+
+        Tasks the other replica lacks are removed, new tasks are imported
+        with their IDs, and changed tasks are updated in place (emitting
+        UPDATE events).
+
+        Args:
+            other: A MerkleTree or RemoteTree of the same shape
+
+        Returns:
+            Number of tasks added, updated or removed
+        """
+        task_ids = self.diff(other)
+        if not task_ids:
+            return 0
+        records = {row['id']: row for row in other.records(task_ids)}
+        todo_list = self.todo_list
+        new_rows = []
+        for task_id in task_ids:
+            row = records.get(task_id)
+            task = todo_list.get_task_by_id(task_id)
+            if row is None:
+                todo_list.remove_task_by_id(task_id)
+            elif task is None:
+                new_rows.append(row)
+            else:
+                _apply_record(todo_list, task, row)
+        if new_rows:
+            todo_list.import_from_list(new_rows)
+        return len(task_ids)
+
+
+class RemoteTree:
+    """
+    A replica's MerkleTree on the other end of a socket served by serve().
+
+    Attributes:
+        requests: Number of requests sent so far
+        bytes_received: Size of all replies received so far
+    """
+
+    def __init__(self, sock: socket.socket):
+        """
+        Initialize a remote tree.
+
+        Args:
+            sock: A connected socket whose peer runs serve()
+        """
+        self._reader = sock.makefile("r", encoding="utf-8")
+        self._writer = sock.makefile("w", encoding="utf-8")
+        self.requests = 0
+        self.bytes_received = 0
+
+    def _call(self, op: str, **args):
+        """Send one request and return the result of its reply."""
+        self._writer.write(json.dumps({'op': op, **args}) + "\n")
+        self._writer.flush()
+        line = self._reader.readline()
+        if not line:
+            raise ConnectionError("Peer closed the connection")
+        self.requests += 1
+        self.bytes_received += len(line)
+        reply = json.loads(line)
+        if 'error' in reply:
+            raise ValueError(reply['error'])
+        return reply['result']
+
+    def shape(self) -> Tuple[int, int]:
+        """Return the remote tree's (fanout, depth)."""
+        fanout, depth = self._call('shape')
+        return fanout, depth
+
+    def node_hashes(self, level: int, indices: Sequence[int]) -> List[int]:
+        """Return the hashes of the given remote nodes on one level."""
+        return self._call('nodes', level=level, indices=list(indices))
+
+    def leaf_digests(self, buckets: Sequence[int]) -> List[Dict[int, int]]:
+        """Return the remote task ID -> digest mapping for each leaf bucket."""
+        leaves = self._call('leaves', buckets=list(buckets))
+        return [{int(task_id): digest for task_id, digest in leaf.items()} for leaf in leaves]
+
+    def records(self, task_ids: Sequence[int]) -> List[dict]:
+        """Return the remote exported records for the given task IDs."""
+        return self._call('records', ids=list(task_ids))
+
+    def close(self) -> None:
+        """Tell the server to stop and close this end of the connection."""
+        try:
+            self._writer.write(json.dumps({'op': 'close'}) + "\n")
+            self._writer.flush()
+        except OSError:
+            pass
+        self._reader.close()
+        self._writer.close()
+
+
+def serve(tree: MerkleTree, sock: socket.socket) -> None:
+    """
+    Answer RemoteTree requests for a tree until the peer closes the connection.
+
+    Args:
+        tree: The local tree to expose
+        sock: A connected socket
+    """
+    handlers = {
+        'shape': lambda request: list(tree.shape()),
+        'nodes': lambda request: tree.node_hashes(request['level'], request['indices']),
+        'leaves': lambda request: tree.leaf_digests(request['buckets']),
+        'records': lambda request: tree.records(request['ids']),
+    }
+    with sock.makefile("r", encoding="utf-8") as reader, \
+            sock.makefile("w", encoding="utf-8") as writer:
+        for line in reader:
+            request = json.loads(line)
+            op = request.get('op')
+            if op == 'close':
+                break
+            handler = handlers.get(op)
+            try:
+                if handler is None:
+                    raise ValueError(f"Unknown request: {op!r}")
+                reply = {'result': handler(request)}
+            except (KeyError, IndexError, TypeError, ValueError) as e:
+                reply = {'error': str(e)}
+            writer.write(json.dumps(reply) + "\n")
+            writer.flush()
@@ -0,0 +1,191 @@
+"""
+Tag Bitmap Index for the Refactored ToDo Application
+
+This module keeps one bitmap per tag, status and priority over a ToDoList's
+slots: bit ``n`` is set when the task in slot ``n`` matches.  The bitmaps are
+bytearrays so a change flips single bits in place; queries turn them into
+Python ints and combine them with ``&``, ``|`` and ``~``, which works a
+machine word at a time.  Counting the matches never builds a task list.
+"""
+
+from __future__ import annotations
+from typing import Dict, Iterable, List, Optional, Union
+
+from todo_events import ChangeEvent, ChangeKind
+from todo_refactored import Task, TaskStatus, ToDoList, _normalize_tags
+
+
+def _set(bitmap: bytearray, slot: int) -> None:
+    """Set a slot's bit, growing the bitmap if needed."""
+    byte = slot >> 3
+    if byte >= len(bitmap):
+        bitmap.extend(bytes(byte + 1 - len(bitmap)))
+    bitmap[byte] |= 1 << (slot & 7)
+
+
+def _clear(bitmap: Optional[bytearray], slot: int) -> None:
+    """Clear a slot's bit."""
+    byte = slot >> 3
+    if bitmap is not None and byte < len(bitmap):
+        bitmap[byte] &= ~(1 << (slot & 7)) & 0xFF
+
+
+def _bits(bitmap: Optional[bytearray]) -> int:
+    """Return a bitmap as an int (bit n for slot n)."""
+    return int.from_bytes(bitmap, "little") if bitmap else 0
+
+
+class TagIndex:
+    """
+    Bitmaps of a ToDoList's slots by tag, status and priority.
+
+    The index follows the list's change events and rebuilds itself after
+    the list reorders or compacts its slots.
+    """
+
+    def __init__(self, todo_list: ToDoList):
+        """
+        Index a list and start following its changes.
+
+        Args:
+            todo_list: The list to index
+        """
+        self.todo_list = todo_list
+        self._rebuild()
+        todo_list.add_listener(self._on_change)
+
+    def close(self) -> None:
+        """Stop following the list's changes."""
+        self.todo_list.remove_listener(self._on_change)
+
+    def _rebuild(self) -> None:
+        """Recompute every bitmap from the list's current slots."""
+        self._slots = self.todo_list._slots
+        self._live = bytearray()
+        self._by_status: Dict[TaskStatus, bytearray] = {status: bytearray() for status in TaskStatus}
+        self._by_priority: Dict[int, bytearray] = {}
+        self._by_tag: Dict[str, bytearray] = {}
+        for task in self._slots:
+            if task is not None:
+                self._add(task, task.status, task.priority, task.tags)
+
+    def _current(self) -> None:
+        """Rebuild if the list compacted its slots into a new list since the last look."""
+        if self.todo_list._slots is not self._slots:
+            self._rebuild()
+
+    def _add(self, task: Task, status: TaskStatus, priority: int, tags: Iterable[str]) -> None:
+        """Set a task's bits for the given field values."""
+        slot = task._slot
+        _set(self._live, slot)
+        _set(self._by_status[status], slot)
+        _set(self._by_priority.setdefault(priority, bytearray()), slot)
+        for tag in tags:
+            _set(self._by_tag.setdefault(tag, bytearray()), slot)
+
+    def _remove(self, task: Task, status: TaskStatus, priority: int, tags: Iterable[str]) -> None:
+        """Clear a task's bits for the given field values."""
+        slot = task._slot
+        _clear(self._live, slot)
+        _clear(self._by_status[status], slot)
+        _clear(self._by_priority.get(priority), slot)
+        for tag in tags:
+            _clear(self._by_tag.get(tag), slot)
+
+    def _on_change(self, event: ChangeEvent) -> None:
+        """Keep the bitmaps in step with the list."""
+        task = event.task
+        if event.kind is ChangeKind.REORDER:
+            self._rebuild()
+            return
+        self._current()
+        if event.kind is ChangeKind.ADD:
+            self._add(task, task.status, task.priority, task.tags)
+        elif event.kind is ChangeKind.REMOVE:
+            self._remove(task, task.status, task.priority, task.tags)
+        elif event.kind is ChangeKind.UPDATE and event.changes.keys() & {'status', 'priority', 'tags'}:
+            changes = event.changes
+            self._remove(task, changes['status'][0] if 'status' in changes else task.status,
+                         changes['priority'][0] if 'priority' in changes else task.priority,
+                         changes['tags'][0] if 'tags' in changes else task.tags)
+            self._add(task, task.status, task.priority, task.tags)
+
+    def _tag_bits(self, tag: str) -> int:
+        """Return the bitmap of one tag as an int."""
+        return _bits(self._by_tag.get(tag.strip().lower()))
+
+    def _select(self, tags: Iterable[str] = (), any_tags: Iterable[str] = (),
+                exclude: Iterable[str] = (), status: Optional[Union[TaskStatus, str]] = None,
+                priority: Optional[int] = None) -> int:
+        """Return the bitmap of the slots matching a query."""
+        self._current()
+        selected = _bits(self._live)
+        for tag in _normalize_tags(tags):
+            selected &= self._tag_bits(tag)
+        any_tags = _normalize_tags(any_tags)
+        if any_tags:
+            either = 0
+            for tag in any_tags:
+                either |= self._tag_bits(tag)
+            selected &= either
+        for tag in _normalize_tags(exclude):
+            selected &= ~self._tag_bits(tag)
+        if status is not None:
+            if isinstance(status, str):
+                status = TaskStatus(status.lower())
+            selected &= _bits(self._by_status[status])
+        if priority is not None:
+            selected &= _bits(self._by_priority.get(priority))
+        return selected
+
+    def count(self, tags: Iterable[str] = (), any_tags: Iterable[str] = (),
+              exclude: Iterable[str] = (), status: Optional[Union[TaskStatus, str]] = None,
+              priority: Optional[int] = None) -> int:
+        """
+        Count the tasks matching a query without listing them.
+
+        Args:
+            tags: Tags a task must all carry
+            any_tags: Tags of which a task must carry at least one (ignored if empty)
+            exclude: Tags a task must not carry
+            status: Status a task must have
+            priority: Priority a task must have
+
+        Returns:
+            Number of matching tasks
+
+        Raises:
+            ValueError: If a tag is empty or status is not a valid TaskStatus
+        """
+        return self._select(tags, any_tags, exclude, status, priority).bit_count()
+
+    def find(self, tags: Iterable[str] = (), any_tags: Iterable[str] = (),
+             exclude: Iterable[str] = (), status: Optional[Union[TaskStatus, str]] = None,
+             priority: Optional[int] = None) -> List[Task]:
+        """
+        Find the tasks matching a query (see count() for the arguments).
+
+        Returns:
+            Matching tasks in list order
+        """
+        selected = self._select(tags, any_tags, exclude, status, priority)
+        slots = self._slots
+        # Bits as characters, lowest slot first; str.find skips runs of zeros
+        bits = bin(selected)[:1:-1]
+        result = []
+        slot = bits.find("1")
+        while slot >= 0:
+            result.append(slots[slot])
+            slot = bits.find("1", slot + 1)
+        return result
+
+    def tag_counts(self) -> Dict[str, int]:
+        """
+        Count the tasks carrying each tag.
+
+        Returns:
+            Dictionary mapping each tag in use to its number of tasks
+        """
+        self._current()
+        counts = {tag: _bits(bitmap).bit_count() for tag, bitmap in self._by_tag.items()}
+        return {tag: n for tag, n in sorted(counts.items()) if n}
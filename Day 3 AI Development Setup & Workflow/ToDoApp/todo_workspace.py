@@ -0,0 +1,261 @@
+"""
+Multi-List Workspace for the Refactored ToDo Application
+
+This module provides a Workspace that owns many ToDoLists.  It interns task
+names across all of its lists, keeps aggregate statistics up to date as the
+lists change, and answers cross-list queries from a shared status/priority
+index instead of looping over every list.
+"""
+
+from __future__ import annotations
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+from functools import partial
+
+from todo_events import ChangeEvent, ChangeKind
+from todo_refactored import Task, TaskStatus, ToDoList
+
+
+Cell = Tuple[TaskStatus, int]
+
+
+class Workspace:
+    """
+    A container owning many ToDoLists with shared indexes.
+
+    Every member list reports its changes to the workspace, which keeps:
+    interned task names, status and priority totals across all lists, and
+    one index cell per (status, priority) pair holding the matching tasks.
+    """
+
+    def __init__(self):
+        """Initialize an empty workspace."""
+        self._lists: Dict[str, ToDoList] = {}
+        self._listeners: Dict[str, partial] = {}
+        self._names: Dict[str, str] = {}
+        self._name_refs: Dict[str, int] = {}
+        self._cells: Dict[Cell, Dict[int, Tuple[ToDoList, Task]]] = {
+            (status, priority): {} for status in TaskStatus for priority in range(1, 6)
+        }
+        self._located: Dict[int, Tuple[Cell, str]] = {}
+        self._status_counts: Dict[TaskStatus, int] = {status: 0 for status in TaskStatus}
+        self._priority_counts: Dict[int, int] = {priority: 0 for priority in range(1, 6)}
+
+    def __len__(self) -> int:
+        """Return the number of lists in the workspace."""
+        return len(self._lists)
+
+    def __iter__(self) -> Iterator[ToDoList]:
+        """Allow iteration over the member lists."""
+        return iter(self._lists.values())
+
+    def __contains__(self, name: str) -> bool:
+        """Check whether a list with the given name is a member."""
+        return name in self._lists
+
+    def create_list(self, name: str) -> ToDoList:
+        """
+        Create a new, empty list in the workspace.
+
+        Args:
+            name: Name of the new list (unique within the workspace)
+
+        Returns:
+            The created ToDoList
+
+        Raises:
+            ValueError: If a list with that name already exists
+        """
+        return self.add_list(ToDoList(name))
+
+    def add_list(self, todo_list: ToDoList) -> ToDoList:
+        """
+        Add an existing list to the workspace and index its tasks.
+
+        Args:
+            todo_list: The list to add, keyed by its current name
+
+        Returns:
+            The added ToDoList
+
+        Raises:
+            ValueError: If a list with that name already exists
+        """
+        if todo_list.name in self._lists:
+            raise ValueError(f"List already exists: {todo_list.name}")
+        self._lists[todo_list.name] = todo_list
+        for task in todo_list:
+            self._index(todo_list, task)
+        listener = partial(self._on_change, todo_list)
+        self._listeners[todo_list.name] = listener
+        todo_list.add_listener(listener)
+        return todo_list
+
+    def remove_list(self, name: str) -> Optional[ToDoList]:
+        """
+        Detach a list from the workspace.
+
+        Args:
+            name: Name of the list to remove
+
+        Returns:
+            The removed ToDoList, or None if no list has that name
+        """
+        todo_list = self._lists.pop(name, None)
+        if todo_list is None:
+            return None
+        todo_list.remove_listener(self._listeners.pop(name))
+        for task in todo_list:
+            self._unindex(task)
+        return todo_list
+
+    def get_list(self, name: str) -> Optional[ToDoList]:
+        """Return the member list with the given name, or None."""
+        return self._lists.get(name)
+
+    def intern(self, name: str) -> str:
+        """
+        Return the workspace's canonical copy of a task name.
+
+        Args:
+            name: A task name
+
+        Returns:
+            An equal string shared by every task with that name
+        """
+        return self._names.setdefault(name, name)
+
+    def _on_change(self, todo_list: ToDoList, event: ChangeEvent) -> None:
+        """Keep the shared indexes in step with a member list."""
+        if event.kind is ChangeKind.ADD:
+            self._index(todo_list, event.task)
+        elif event.kind is ChangeKind.REMOVE:
+            self._unindex(event.task)
+        elif event.kind is ChangeKind.UPDATE:
+            if 'name' in event.changes:
+                self._rename(event.task)
+            self._move(event.task)
+
+    def _index(self, todo_list: ToDoList, task: Task) -> None:
+        """Intern a task's name and add it to the counters and index."""
+        name = task.name = self.intern(task.name)
+        self._name_refs[name] = self._name_refs.get(name, 0) + 1
+        cell = (task.status, task.priority)
+        self._cells[cell][id(task)] = (todo_list, task)
+        self._located[id(task)] = (cell, name)
+        self._status_counts[task.status] += 1
+        self._priority_counts[task.priority] += 1
+
+    def _unindex(self, task: Task) -> None:
+        """Remove a task from the counters and index."""
+        cell, name = self._located.pop(id(task))
+        del self._cells[cell][id(task)]
+        self._status_counts[cell[0]] -= 1
+        self._priority_counts[cell[1]] -= 1
+        self._release(name)
+
+    def _release(self, name: str) -> None:
+        """Drop one task's reference to an interned name, forgetting it when unused."""
+        refs = self._name_refs[name] - 1
+        if refs:
+            self._name_refs[name] = refs
+        else:
+            del self._name_refs[name]
+            del self._names[name]
+
+    def _rename(self, task: Task) -> None:
+        """Re-intern a renamed task's name and release its old one."""
+        cell, old_name = self._located[id(task)]
+        name = task.name = self.intern(task.name)
+        self._name_refs[name] = self._name_refs.get(name, 0) + 1
+        self._located[id(task)] = (cell, name)
+        self._release(old_name)
+
+    def _move(self, task: Task) -> None:
+        """Move a task to the cell matching its current status and priority."""
+        old_cell, name = self._located[id(task)]
+        new_cell = (task.status, task.priority)
+        if new_cell == old_cell:
+            return
+        self._cells[new_cell][id(task)] = self._cells[old_cell].pop(id(task))
+        self._located[id(task)] = (new_cell, name)
+        self._status_counts[old_cell[0]] -= 1
+        self._status_counts[task.status] += 1
+        self._priority_counts[old_cell[1]] -= 1
+        self._priority_counts[task.priority] += 1
+
+    def find_tasks(self, status: Optional[Union[TaskStatus, str]] = None,
+                   priority: Optional[int] = None) -> List[Tuple[str, Task]]:
+        """
+        Find tasks in any list by status and/or priority.
+
+        Only the index cells matching the query are visited, so the cost is
+        proportional to the number of results rather than to the workspace.
+
+        Args:
+            status: The status to match (any status if None)
+            priority: The priority to match (any priority if None)
+
+        Returns:
+            List of (list name, task) pairs
+        """
+        if isinstance(status, str):
+            try:
+                status = TaskStatus(status.lower())
+            except ValueError:
+                return []
+        statuses = list(TaskStatus) if status is None else [status]
+        priorities = range(1, 6) if priority is None else [priority]
+        return [
+            (todo_list.name, task)
+            for s in statuses for p in priorities
+            for todo_list, task in self._cells.get((s, p), {}).values()
+        ]
+
+    def count_tasks(self, status: Optional[Union[TaskStatus, str]] = None,
+                    priority: Optional[int] = None) -> int:
+        """
+        Count tasks in any list by status and/or priority without building a list.
+
+        Args:
+            status: The status to match (any status if None)
+            priority: The priority to match (any priority if None)
+
+        Returns:
+            Number of matching tasks
+        """
+        if isinstance(status, str):
+            try:
+                status = TaskStatus(status.lower())
+            except ValueError:
+                return 0
+        if priority is None:
+            if status is None:
+                return len(self._located)
+            return self._status_counts[status]
+        if status is None:
+            return self._priority_counts.get(priority, 0)
+        return len(self._cells.get((status, priority), {}))
+
+    def get_statistics(self) -> dict:
+        """
+        Get statistics across every list in the workspace.
+
+        Returns:
+            Dictionary with the same keys as ToDoList.get_statistics(),
+            plus the number of lists and distinct task names
+        """
+        total = len(self._located)
+        completed = self._status_counts[TaskStatus.COMPLETED]
+        return {
+            'lists': len(self._lists),
+            'distinct_names': len(self._names),
+            'total_tasks': total,
+            'completed': completed,
+            'pending': self._status_counts[TaskStatus.PENDING],
+            'in_progress': self._status_counts[TaskStatus.IN_PROGRESS],
+            'cancelled': self._status_counts[TaskStatus.CANCELLED],
+            'completion_rate': (completed / total * 100) if total > 0 else 0,
+            'priority_distribution': {
+                str(i): self._priority_counts[i] for i in range(1, 6)
+            }
+        }